@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the process-pool resume text extraction service.
+Extracts synthetic text PDFs concurrently and reports pages per second at 1, 2 and N workers.
+
+Usage: python bench_extraction.py [--docs 8] [--pages 20] [--workers 1,2,4]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from text_extraction import TextExtractionService
+
+WORDS = (
+    "python developer experience built scalable services react typescript postgresql docker "
+    "kubernetes aws led team shipped features improved latency reduced costs mentored engineers "
+    "university degree computer science projects open source contributor internship"
+).split()
+
+
+def write_pdf(path: str, pages: int, rng: random.Random, lines_per_page: int = 45):
+    """Minimal multi-page PDF with one Helvetica text stream per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for _ in range(pages):
+        lines = [' '.join(rng.choices(WORDS, k=12)) for _ in range(lines_per_page)]
+        text = "BT /F1 10 Tf 40 800 Td 14 TL " + ' '.join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(text)} >>\nstream\n{text}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    output += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+async def run(paths, workers: int, pages: int, repeat: int):
+    service = TextExtractionService(workers=workers, queue_depth=len(paths) * workers, max_pages=pages)
+    started = time.perf_counter()
+    await service.warm_up()
+    warm_up = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        texts = await asyncio.gather(*(service.extract(path) for path in paths))
+    elapsed = (time.perf_counter() - started) / repeat
+    service.shutdown()
+
+    assert all(texts), "extraction returned empty text"
+    total_pages = len(paths) * pages
+    print(f"  {workers} worker(s): {total_pages / elapsed:,.0f} pages per second "
+          f"({elapsed * 1000:.0f} ms per batch, warm-up {warm_up * 1000:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count() or 1}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    worker_counts = sorted({int(count) for count in args.workers.split(",") if count.strip()})
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"🔧 Writing {args.docs} synthetic PDFs of {args.pages} pages...")
+        paths = []
+        for i in range(args.docs):
+            path = os.path.join(directory, f"resume_{i}.pdf")
+            write_pdf(path, args.pages, rng)
+            paths.append(path)
+
+        print(f"📊 {args.docs} documents x {args.pages} pages, extracted concurrently ({os.cpu_count()} CPUs):")
+        for workers in worker_counts:
+            asyncio.run(run(paths, workers, args.pages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the vectorized job ranking engine.
+Measures scoring throughput for N jobs x 1 user and 1 job x N users on synthetic data.
+
+Usage: python bench_ranking.py [--jobs 10000] [--users 100000] [--repeat 20]
+"""
+
+import argparse
+import random
+import time
+
+from job_ranking import JobRankingIndex, profile_terms, top_k
+
+SKILLS = [
+    "python", "javascript", "typescript", "react", "vue", "angular", "node", "django", "flask", "fastapi",
+    "java", "spring", "golang", "rust", "ruby", "rails", "php", "laravel", "c#", ".net", "c++", "sql",
+    "postgresql", "mysql", "mongodb", "redis", "aws", "gcp", "azure", "docker", "kubernetes", "terraform",
+    "pandas", "numpy", "pytorch", "tensorflow", "spark", "kafka", "graphql", "rest", "git", "linux",
+]
+ROLES = ["backend", "frontend", "fullstack", "data", "ml", "devops", "mobile", "qa"]
+SENIORITY = ["Junior", "Intern", "Graduate", "Entry-Level", "Jr."]
+FILLER = (
+    "build ship maintain scalable services customers product features collaborate mentors learn "
+    "reviews testing deploy pipelines dashboards apis growth startup remote friendly"
+).split()
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Remote - Europe", "Toronto", "Anywhere"]
+
+
+def make_jobs(count: int, rng: random.Random):
+    jobs = []
+    for i in range(count):
+        stack = rng.sample(SKILLS, 4)
+        jobs.append({
+            "id": i,
+            "title": f"{rng.choice(SENIORITY)} {rng.choice(ROLES).title()} Engineer ({stack[0]})",
+            "tags": stack,
+            "location": rng.choice(LOCATIONS),
+            "description": " ".join(rng.choices(FILLER + SKILLS, k=80)),
+            "labels": {"role": [rng.choice(ROLES)]},
+        })
+    return jobs
+
+
+def make_profile(rng: random.Random):
+    return {
+        "skills": ", ".join(rng.sample(SKILLS, 6)),
+        "key_technologies": rng.sample(SKILLS, 3),
+        "preferred_roles": [rng.choice(ROLES)],
+        "work_mode": ["remote"],
+    }
+
+
+def throughput(label: str, items: int, seconds: float):
+    print(f"  {label}: {items / seconds:,.0f} per second ({seconds * 1000:.2f} ms per batch)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"🔧 Building index for {args.jobs:,} synthetic jobs...")
+    jobs = make_jobs(args.jobs, rng)
+    started = time.perf_counter()
+    index = JobRankingIndex(jobs)
+    print(f"  built in {time.perf_counter() - started:.2f}s, vocabulary {len(index.vocabulary):,} terms")
+
+    # N jobs x 1 user
+    profile = make_profile(rng)
+    terms = profile_terms(profile)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        top_k(index.score_jobs(terms, remote=True, locations=["berlin"]), 20)
+    elapsed = (time.perf_counter() - started) / args.repeat
+    print(f"📊 {args.jobs:,} jobs x 1 user (score + top-20):")
+    throughput("jobs scored", args.jobs, elapsed)
+
+    # 1 job x N users
+    print(f"🔧 Vectorizing {args.users:,} synthetic profiles...")
+    started = time.perf_counter()
+    profiles = index.profile_matrix([profile_terms(make_profile(rng)) for _ in range(args.users)])
+    print(f"  vectorized in {time.perf_counter() - started:.2f}s")
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        top_k(index.score_profiles(0, profiles), 20)
+    elapsed = (time.perf_counter() - started) / args.repeat
+    print(f"📊 1 job x {args.users:,} users (score + top-20):")
+    throughput("users scored", args.users, elapsed)
+
+    # Pure-Python reference for the same N jobs x 1 user product
+    vector = index.profile_vector(terms)
+    rows = [
+        list(zip(index.matrix.indices[start:end].tolist(), index.matrix.data[start:end].tolist()))
+        for start, end in zip(index.matrix.indptr[:-1], index.matrix.indptr[1:])
+    ]
+    weights = vector.tolist()
+    started = time.perf_counter()
+    scores = [sum(w * weights[i] for i, w in row) for row in rows]
+    sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:20]
+    elapsed = time.perf_counter() - started
+    print("📊 Pure-Python loop reference (jobs x 1 user):")
+    throughput("jobs scored", args.jobs, elapsed)
+
+
+if __name__ == "__main__":
+    main()
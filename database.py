@@ -1,359 +1,221 @@
-import aiosqlite
 import os
 import random
 import bcrypt
 import json
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Any, Callable, Set, Tuple
+from dotenv import load_dotenv
+
+from db_pool import ConnectionPool
+from db_records import UserRecord, encode_user_fields
+from db_migrations import migrate, LATEST_VERSION
+from ttl_cache import LRUCache
+from skills_index import SKILL_SOURCE_FIELDS, sync_user_skills, find_users_with_skills
+from search_index import full_text_search
+from executors import crypto_executor
+from job_dedup import VISIBLE_JOB_CONDITION, dedup_keys, index_job
+from job_classifier import job_classifier, label_filter_sql, sync_job_labels
+
+# Load environment variables
+load_dotenv()
 
 DATABASE_PATH = "swipingforjobs.db"
 RESUME_UPLOAD_DIR = "uploaded_resumes"
 
+# Connection pool configuration (reads fan out over DB_POOL_SIZE connections,
+# writes are serialized through a single writer connection)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(os.cpu_count() or 4)))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+# Storage profiles: PRAGMA settings applied to every pooled connection
+STORAGE_PROFILES = {
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,  # 256MB
+        "cache_size": -64000,  # ~64MB (negative = KiB)
+        "busy_timeout": 5000,  # ms
+    },
+    "rollback": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+DB_STORAGE_PROFILE = os.getenv("DB_STORAGE_PROFILE", "wal")
+
+# Profile cache configuration
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "1024"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_BYTES = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Child tables folded into the profile row by get_user_profile: key -> (table, columns, order);
+# keys must match db_records.PROFILE_CHILD_FIELDS so the record decodes them
+PROFILE_CHILD_TABLES = {
+    'education': (
+        'user_education',
+        ['id', 'user_id', 'degree', 'field_of_study', 'institution', 'start_year', 'end_year',
+         'gpa', 'achievements', 'is_current', 'created_at'],
+        'end_year DESC'
+    ),
+    'certifications': (
+        'user_certifications',
+        ['id', 'user_id', 'certification_name', 'issuer', 'year_achieved', 'credential_id',
+         'credential_url', 'expires_at', 'created_at'],
+        'year_achieved DESC'
+    ),
+    'work_experience': (
+        'user_work_experience',
+        ['id', 'user_id', 'position_title', 'company_name', 'start_date', 'end_date', 'is_current',
+         'location', 'work_mode', 'technologies_used', 'responsibilities', 'achievements',
+         'employment_type', 'created_at'],
+        'start_date DESC'
+    ),
+    'internships': (
+        'user_internships',
+        ['id', 'user_id', 'position_title', 'company_name', 'start_date', 'end_date', 'location',
+         'work_mode', 'technologies_used', 'responsibilities', 'achievements', 'internship_type',
+         'stipend_amount', 'stipend_currency', 'certificate_url', 'created_at'],
+        'start_date DESC'
+    ),
+}
+
+# Child columns holding JSON text; invalid JSON decodes to [] like the old per-row parsing
+PROFILE_CHILD_JSON_COLUMNS = {'technologies_used'}
+
+def _build_profile_query() -> str:
+    """Build the single statement that hydrates a user row and all child tables"""
+    subqueries = []
+    for key, (table, columns, order_by) in PROFILE_CHILD_TABLES.items():
+        fields = []
+        for column in columns:
+            if column in PROFILE_CHILD_JSON_COLUMNS:
+                value = (f"CASE WHEN json_valid(c.{column}) THEN json(c.{column}) "
+                         f"WHEN c.{column} IS NULL OR c.{column} = '' THEN c.{column} "
+                         f"ELSE json('[]') END")
+            else:
+                value = f"c.{column}"
+            fields.append(f"'{column}', {value}")
+        subqueries.append(
+            f"(SELECT json_group_array(json_object({', '.join(fields)})) "
+            f"FROM (SELECT * FROM {table} WHERE user_id = u.id ORDER BY {order_by}) c) AS {key}"
+        )
+    return f"SELECT u.*, {', '.join(subqueries)} FROM users u WHERE u.id = ?"
+
+PROFILE_QUERY = _build_profile_query()
+
+# Display names of job sources, as returned by the /jobs endpoints
+JOB_SOURCE_LABELS = {
+    'remoteok': 'RemoteOK',
+    'gemini': 'Gemini AI',
+}
+
+# resume_jobs columns returned to callers, in _resume_job order
+RESUME_JOB_COLUMNS = (
+    "id, user_id, kind, resume_path, status, stage, attempts, result, error, "
+    "created_at, updated_at, finished_at"
+)
+
+def _resume_job(row) -> Dict[str, Any]:
+    return {
+        'id': row[0],
+        'user_id': row[1],
+        'kind': row[2],
+        'resume_path': row[3],
+        'status': row[4],
+        'stage': row[5],
+        'attempts': row[6],
+        'result': json.loads(row[7]) if row[7] else None,
+        'error': row[8],
+        'created_at': row[9],
+        'updated_at': row[10],
+        'finished_at': row[11]
+    }
+
 # Ensure upload directory exists
 os.makedirs(RESUME_UPLOAD_DIR, exist_ok=True)
 
 class DatabaseManager:
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, pool_size: int = DB_POOL_SIZE,
+                 pool_timeout: float = DB_POOL_TIMEOUT, storage_profile: str = DB_STORAGE_PROFILE,
+                 pragma_overrides: Optional[Dict[str, Any]] = None):
+        if storage_profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {storage_profile}")
+        
         self.db_path = db_path
+        self.storage_profile = storage_profile
+        self.pragmas = {**STORAGE_PROFILES[storage_profile], **(pragma_overrides or {})}
+        
+        self.write_pool = ConnectionPool(db_path, size=1, timeout=pool_timeout,
+                                         on_connect=self._configure_writer, name="write_pool")
+        self.read_pool = ConnectionPool(db_path, size=pool_size, timeout=pool_timeout,
+                                        on_connect=self._configure_reader, name="read_pool")
+        
+        # Hydrated profiles keyed by user id; every writer touching a profile invalidates it
+        self.profile_cache = LRUCache(max_entries=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL,
+                                      max_bytes=PROFILE_CACHE_MAX_BYTES,
+                                      sizeof=lambda profile: profile.approx_size(),
+                                      name="profile_cache")
+    
+    async def _apply_pragmas(self, db, skip=()):
+        for pragma, value in self.pragmas.items():
+            if pragma not in skip:
+                await db.execute(f"PRAGMA {pragma} = {value}")
+    
+    async def _configure_writer(self, db):
+        """Writer connection owns the (persistent) journal mode"""
+        await self._apply_pragmas(db)
+    
+    async def _configure_reader(self, db):
+        """Reader connections are read-only so stray writes fail loudly"""
+        await self._apply_pragmas(db, skip=("journal_mode",))
+        await db.execute("PRAGMA query_only = ON")
+    
+    async def open(self):
+        """Open the long-lived connection pools (called from the app lifespan)"""
+        # Writer first so the journal mode is in place before readers attach
+        await self.write_pool.open()
+        await self.read_pool.open()
+    
+    async def close(self):
+        """Close all pooled connections"""
+        await self.read_pool.close()
+        await self.write_pool.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get storage profile, connection pool and cache metrics"""
+        return {
+            "storage_profile": self.storage_profile,
+            "pragmas": self.pragmas,
+            "read_pool": self.read_pool.get_stats(),
+            "write_pool": self.write_pool.get_stats(),
+            "profile_cache": self.profile_cache.get_stats(),
+        }
     
     async def init_database(self):
-        """Initialize database with enhanced schema"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Create enhanced users table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    login_code TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    
-                    -- Basic Profile
-                    first_name TEXT,
-                    last_name TEXT,
-                    phone TEXT,
-                    phone_number TEXT, -- Legacy compatibility
-                    linkedin_url TEXT,
-                    github_url TEXT,
-                    portfolio_url TEXT,
-                    location TEXT,
-                    bio TEXT,
-                    profile_picture_url TEXT,
-                    
-                    -- GitHub OAuth Integration
-                    github_id TEXT UNIQUE,
-                    github_access_token TEXT, -- Encrypted
-                    github_username TEXT,
-                    github_oauth_linked_at TIMESTAMP,
-                    
-                    -- Job Type Preferences
-                    job_types TEXT, -- JSON array: ["full-time", "part-time", "internship", "contract", "freelance", "apprenticeship", "volunteer", "temporary"]
-                    job_functions TEXT, -- JSON array
-                    industries TEXT, -- JSON array
-                    preferred_roles TEXT, -- JSON array
-                    
-                    -- Work Mode
-                    work_mode TEXT, -- JSON array: ["onsite", "remote", "hybrid"]
-                    relocation_willingness BOOLEAN DEFAULT 0,
-                    preferred_locations TEXT, -- JSON array
-                    
-                    -- Experience
-                    total_years_experience INTEGER,
-                    years_in_relevant_field INTEGER,
-                    key_technologies TEXT, -- JSON array
-                    has_managerial_experience BOOLEAN DEFAULT 0,
-                    
-                    -- Compensation
-                    min_expected_salary DECIMAL,
-                    max_expected_salary DECIMAL,
-                    salary_currency TEXT DEFAULT 'USD',
-                    salary_negotiable BOOLEAN DEFAULT 1,
-                    compensation_type TEXT DEFAULT 'yearly', -- yearly, monthly, hourly, contract
-                    
-                    -- Availability
-                    notice_period TEXT, -- immediate, 2weeks, 1month, custom
-                    preferred_start_date DATE,
-                    work_authorization_status TEXT,
-                    
-                    -- Education (primary/latest)
-                    highest_degree TEXT,
-                    field_of_study TEXT,
-                    institution TEXT,
-                    graduation_year INTEGER,
-                    
-                    -- Technical Skills
-                    programming_languages TEXT, -- JSON with proficiency levels
-                    frameworks_libraries TEXT, -- JSON with proficiency levels
-                    tools_platforms TEXT, -- JSON with proficiency levels
-                    
-                    -- Soft Skills
-                    soft_skills TEXT, -- JSON array
-                    
-                    -- Languages
-                    languages TEXT, -- JSON with proficiency levels
-                    
-                    -- Job Search Preferences
-                    job_search_status TEXT DEFAULT 'actively_looking', -- actively_looking, open_to_offers, not_looking
-                    preferred_communication TEXT, -- JSON array: ["email", "phone", "linkedin"]
-                    resume_visibility TEXT DEFAULT 'recruiters_only', -- public, recruiters_only, private
-                    
-                    -- Cultural Fit
-                    company_size_preference TEXT, -- JSON array: ["startup", "mid_size", "enterprise"]
-                    team_dynamics TEXT, -- JSON array
-                    work_culture_keywords TEXT, -- JSON array
-                    
-                    -- Other
-                    willing_to_travel BOOLEAN DEFAULT 0,
-                    travel_percentage INTEGER DEFAULT 0,
-                    security_clearance TEXT,
-                    accessibility_needs TEXT,
-                    
-                    -- Resume Data Integration
-                    resume_parsed BOOLEAN DEFAULT 0,
-                    resume_filename TEXT,
-                    resume_upload_date TIMESTAMP,
-                    
-                    -- AI Extracted Data (from resume)
-                    ai_extracted_skills TEXT, -- JSON
-                    ai_extracted_experience TEXT, -- JSON
-                    ai_extracted_education TEXT, -- JSON
-                    ai_extracted_certifications TEXT, -- JSON
-                    ai_summary TEXT,
-                    
-                    -- Legacy fields for backward compatibility
-                    skills TEXT,
-                    preferences TEXT,
-                    resume_path TEXT,
-                    linkedin_data TEXT,
-                    github_data TEXT,
-                    resume_processed_data TEXT,
-                    profile_completed BOOLEAN DEFAULT FALSE,
-                    
-                    -- Additional legacy fields
-                    experience_level TEXT,
-                    salary_min INTEGER,
-                    salary_max INTEGER,
-                    currency TEXT DEFAULT 'USD'
-                )
-            ''')
-            
-            # Create education table for detailed education history
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_education (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    degree TEXT NOT NULL,
-                    field_of_study TEXT,
-                    institution TEXT NOT NULL,
-                    start_year INTEGER,
-                    end_year INTEGER,
-                    gpa DECIMAL,
-                    achievements TEXT,
-                    is_current BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create certifications table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_certifications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    certification_name TEXT NOT NULL,
-                    issuer TEXT NOT NULL,
-                    year_achieved INTEGER,
-                    credential_id TEXT,
-                    credential_url TEXT,
-                    expires_at DATE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create work experience table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_work_experience (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    position_title TEXT NOT NULL,
-                    company_name TEXT NOT NULL,
-                    start_date DATE,
-                    end_date DATE,
-                    is_current BOOLEAN DEFAULT 0,
-                    location TEXT,
-                    work_mode TEXT, -- onsite, remote, hybrid
-                    technologies_used TEXT, -- JSON array
-                    responsibilities TEXT,
-                    achievements TEXT,
-                    employment_type TEXT, -- full-time, part-time, contract, freelance
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create internships table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_internships (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    position_title TEXT NOT NULL,
-                    company_name TEXT NOT NULL,
-                    start_date DATE,
-                    end_date DATE,
-                    location TEXT,
-                    work_mode TEXT, -- onsite, remote, hybrid
-                    technologies_used TEXT, -- JSON array
-                    responsibilities TEXT,
-                    achievements TEXT,
-                    internship_type TEXT, -- full-time, part-time, virtual, industrial_training
-                    stipend_amount DECIMAL,
-                    stipend_currency TEXT,
-                    certificate_url TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create user sessions table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    session_token TEXT UNIQUE NOT NULL,
-                    expires_at TIMESTAMP NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create user projects table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    project_name TEXT NOT NULL,
-                    description TEXT,
-                    technologies TEXT, -- JSON array
-                    project_url TEXT,
-                    github_url TEXT,
-                    start_date DATE,
-                    end_date DATE,
-                    is_current BOOLEAN DEFAULT 0,
-                    featured BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-
-            # Create GitHub repositories table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS github_repos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    github_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    full_name TEXT NOT NULL,
-                    description TEXT,
-                    url TEXT NOT NULL,
-                    clone_url TEXT,
-                    language TEXT,
-                    stars INTEGER DEFAULT 0,
-                    forks INTEGER DEFAULT 0,
-                    is_fork BOOLEAN DEFAULT 0,
-                    is_private BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP,
-                    updated_at TIMESTAMP,
-                    last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    topics TEXT, -- JSON array
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    UNIQUE(user_id, github_id)
-                )
-            ''')
-
-            # Create GitHub repository languages table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS github_languages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    repo_id INTEGER NOT NULL,
-                    language TEXT NOT NULL,
-                    bytes INTEGER DEFAULT 0,
-                    percentage REAL DEFAULT 0.0,
-                    FOREIGN KEY (repo_id) REFERENCES github_repos (id) ON DELETE CASCADE
-                )
-            ''')
-
-            # Create GitHub repository README table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS github_readmes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    repo_id INTEGER NOT NULL,
-                    content TEXT,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (repo_id) REFERENCES github_repos (id) ON DELETE CASCADE
-                )
-            ''')
-
-            # Create job applications table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS job_applications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    user_email TEXT NOT NULL,
-                    job_title TEXT NOT NULL,
-                    company TEXT NOT NULL,
-                    job_source TEXT NOT NULL,
-                    job_url TEXT,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id)
-                )
-            ''')
-
-            # Create jobs cache table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS jobs_cache (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source TEXT NOT NULL,
-                    job_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL
-                )
-            ''')
-
-            # Create indexes for better performance
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_github_id ON users(github_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_token ON user_sessions(session_token)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON user_sessions(expires_at)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_education_user ON user_education(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_certifications_user ON user_certifications(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_work_experience_user ON user_work_experience(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_internships_user ON user_internships(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_projects_user ON user_projects(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_github_repos_user ON github_repos(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_github_repos_github_id ON github_repos(github_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_github_languages_repo ON github_languages(repo_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_github_readmes_repo ON github_readmes(repo_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_job_search_status ON users(job_search_status)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_work_mode ON users(work_mode)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_location ON users(location)")
-            
-            await db.commit()
-            print("✅ Database initialized with enhanced schema including GitHub OAuth tables")
+        """Bring the database schema up to date by applying pending migrations"""
+        async with self.write_pool.acquire() as db:
+            applied = await migrate(db)
+            if applied:
+                print(f"✅ Database migrated to schema version {LATEST_VERSION} (applied {applied})")
+            else:
+                print(f"✅ Database schema is up to date (version {LATEST_VERSION})")
 
     async def create_user(self, **kwargs):
         """Create a new user with enhanced profile data"""
-        async with aiosqlite.connect(self.db_path) as db:
+        # Hash password if provided, otherwise use empty string. bcrypt is deliberately
+        # slow, so it runs on the crypto executor before the writer connection is taken.
+        password = kwargs.get('password', '')
+        password_hash = (await crypto_executor.run(
+            bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt()
+        )).decode('utf-8')
+        
+        async with self.write_pool.acquire() as db:
             try:
                 # Generate login code
                 login_code = str(random.randint(1000, 9999))
                 
-                # Hash password if provided, otherwise use empty string
-                password = kwargs.get('password', '')
-                password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                
                 # Prepare user data with defaults
                 user_data = {
                     'name': kwargs.get('name', ''),
@@ -413,6 +275,7 @@ class DatabaseManager:
                     'preferences': json.dumps(kwargs.get('preferences', [])),
                     'resume_filename': kwargs.get('resume_filename', ''),
                     'resume_path': kwargs.get('resume_path', ''),
+                    'resume_hash': kwargs.get('resume_hash'),
                     'linkedin_data': kwargs.get('linkedin_data', ''),
                     'github_data': kwargs.get('github_data', ''),
                     'resume_processed_data': kwargs.get('resume_processed_data', ''),
@@ -431,6 +294,9 @@ class DatabaseManager:
                 cursor = await db.execute(query, list(user_data.values()))
                 user_id = cursor.lastrowid
                 
+                # Index normalized skills for candidate search
+                await sync_user_skills(db, user_id)
+                
                 await db.commit()
                 return {'user_id': user_id, 'login_code': login_code}
                 
@@ -440,146 +306,49 @@ class DatabaseManager:
 
     async def authenticate_user(self, name: str, login_code: str):
         """Authenticate user with name and login code"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute(
                 "SELECT * FROM users WHERE name = ? AND login_code = ?",
                 (name, login_code)
             )
-            user = await cursor.fetchone()
-            
-            if user:
-                # Convert to dict
-                columns = [description[0] for description in cursor.description]
-                user_dict = dict(zip(columns, user))
-                
-                # Parse JSON fields
-                json_fields = [
-                    'job_types', 'job_functions', 'industries', 'preferred_roles',
-                    'work_mode', 'preferred_locations', 'key_technologies',
-                    'programming_languages', 'frameworks_libraries', 'tools_platforms',
-                    'soft_skills', 'languages', 'preferred_communication',
-                    'company_size_preference', 'team_dynamics', 'work_culture_keywords',
-                    'ai_extracted_skills', 'ai_extracted_experience', 'ai_extracted_education',
-                    'ai_extracted_certifications', 'preferences'
-                ]
-                
-                for field in json_fields:
-                    if user_dict.get(field):
-                        try:
-                            user_dict[field] = json.loads(user_dict[field])
-                        except json.JSONDecodeError:
-                            user_dict[field] = []
-                    else:
-                        user_dict[field] = [] if field not in ['programming_languages', 'frameworks_libraries', 'tools_platforms', 'languages'] else {}
-                
-                return user_dict
-            
-            return None
+            cursor.row_factory = UserRecord.row_factory
+            return await cursor.fetchone()
 
     async def get_user_profile(self, user_id: int):
-        """Get complete user profile with related data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Get user data
-            cursor = await db.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-            user = await cursor.fetchone()
-            
-            if not user:
-                return None
-            
-            # Convert to dict
-            columns = [description[0] for description in cursor.description]
-            user_dict = dict(zip(columns, user))
-            
-            # Parse JSON fields
-            json_fields = [
-                'job_types', 'job_functions', 'industries', 'preferred_roles',
-                'work_mode', 'preferred_locations', 'key_technologies',
-                'programming_languages', 'frameworks_libraries', 'tools_platforms',
-                'soft_skills', 'languages', 'preferred_communication',
-                'company_size_preference', 'team_dynamics', 'work_culture_keywords',
-                'ai_extracted_skills', 'ai_extracted_experience', 'ai_extracted_education',
-                'ai_extracted_certifications', 'preferences'
-            ]
-            
-            for field in json_fields:
-                if user_dict.get(field):
-                    try:
-                        user_dict[field] = json.loads(user_dict[field])
-                    except json.JSONDecodeError:
-                        user_dict[field] = []
-                else:
-                    user_dict[field] = [] if field not in ['programming_languages', 'frameworks_libraries', 'tools_platforms', 'languages'] else {}
-            
-            # Get education data
-            cursor = await db.execute("SELECT * FROM user_education WHERE user_id = ? ORDER BY end_year DESC", (user_id,))
-            education = await cursor.fetchall()
-            user_dict['education'] = []
-            if education:
-                edu_columns = [description[0] for description in cursor.description]
-                user_dict['education'] = [dict(zip(edu_columns, row)) for row in education]
-            
-            # Get certifications
-            cursor = await db.execute("SELECT * FROM user_certifications WHERE user_id = ? ORDER BY year_achieved DESC", (user_id,))
-            certifications = await cursor.fetchall()
-            user_dict['certifications'] = []
-            if certifications:
-                cert_columns = [description[0] for description in cursor.description]
-                user_dict['certifications'] = [dict(zip(cert_columns, row)) for row in certifications]
-            
-            # Get work experience
-            cursor = await db.execute("SELECT * FROM user_work_experience WHERE user_id = ? ORDER BY start_date DESC", (user_id,))
-            work_exp = await cursor.fetchall()
-            user_dict['work_experience'] = []
-            if work_exp:
-                work_columns = [description[0] for description in cursor.description]
-                for row in work_exp:
-                    exp_dict = dict(zip(work_columns, row))
-                    # Parse JSON fields
-                    if exp_dict.get('technologies_used'):
-                        try:
-                            exp_dict['technologies_used'] = json.loads(exp_dict['technologies_used'])
-                        except json.JSONDecodeError:
-                            exp_dict['technologies_used'] = []
-                    user_dict['work_experience'].append(exp_dict)
-            
-            # Get internships
-            cursor = await db.execute("SELECT * FROM user_internships WHERE user_id = ? ORDER BY start_date DESC", (user_id,))
-            internships = await cursor.fetchall()
-            user_dict['internships'] = []
-            if internships:
-                int_columns = [description[0] for description in cursor.description]
-                for row in internships:
-                    int_dict = dict(zip(int_columns, row))
-                    # Parse JSON fields
-                    if int_dict.get('technologies_used'):
-                        try:
-                            int_dict['technologies_used'] = json.loads(int_dict['technologies_used'])
-                        except json.JSONDecodeError:
-                            int_dict['technologies_used'] = []
-                    user_dict['internships'].append(int_dict)
-            
-            return user_dict
+        """Get complete user profile with related data (read-through cached)"""
+        profile = self.profile_cache.get(user_id)
+        if profile is not None:
+            return profile.copy()
+        
+        generation = self.profile_cache.generation
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(PROFILE_QUERY, (user_id,))
+            # Education, certifications, work experience and internships arrive as
+            # JSON arrays and are decoded lazily by the record like the JSON columns
+            cursor.row_factory = UserRecord.row_factory
+            profile = await cursor.fetchone()
+        
+        if profile is None:
+            return None
+        
+        # Skipped if a writer invalidated any profile while this read was in flight
+        self.profile_cache.set(user_id, profile, generation=generation)
+        return profile.copy()
+
+    async def user_exists(self, user_id: int) -> bool:
+        """Cheap existence check for callers that only need a 404 check"""
+        if user_id in self.profile_cache:
+            return True
+        
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute("SELECT 1 FROM users WHERE id = ?", (user_id,))
+            return await cursor.fetchone() is not None
 
     async def update_user_profile(self, user_id: int, **kwargs):
         """Update user profile with new data"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             # Handle JSON fields
-            json_fields = [
-                'job_types', 'job_functions', 'industries', 'preferred_roles',
-                'work_mode', 'preferred_locations', 'key_technologies',
-                'programming_languages', 'frameworks_libraries', 'tools_platforms',
-                'soft_skills', 'languages', 'preferred_communication',
-                'company_size_preference', 'team_dynamics', 'work_culture_keywords',
-                'ai_extracted_skills', 'ai_extracted_experience', 'ai_extracted_education',
-                'ai_extracted_certifications', 'preferences'
-            ]
-            
-            update_data = {}
-            for key, value in kwargs.items():
-                if key in json_fields:
-                    update_data[key] = json.dumps(value) if value is not None else None
-                else:
-                    update_data[key] = value
+            update_data = encode_user_fields(kwargs)
             
             if update_data:
                 update_data['updated_at'] = datetime.now().isoformat()
@@ -589,20 +358,38 @@ class DatabaseManager:
                 query = f"UPDATE users SET {set_clause} WHERE id = ?"
                 
                 await db.execute(query, list(update_data.values()) + [user_id])
+                
+                # Keep the skills index in step with the skill columns
+                if any(field in kwargs for field in SKILL_SOURCE_FIELDS):
+                    await sync_user_skills(db, user_id)
+                
                 await db.commit()
+                self.profile_cache.invalidate(user_id)
                 return True
             
             return False
 
+    async def search_users_by_skills(self, skills: List[str], work_mode: Optional[str] = None,
+                                     limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Find users having all of the given skills, optionally filtered by work mode"""
+        async with self.read_pool.acquire() as db:
+            return await find_users_with_skills(db, skills, work_mode=work_mode, limit=limit, offset=offset)
+
+    async def full_text_search(self, text: str, scopes: List[str], limit: int = 20,
+                               prefix: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """BM25-ranked full-text search over the FTS5 indexes"""
+        async with self.read_pool.acquire() as db:
+            return await full_text_search(db, text, scopes, limit=limit, prefix=prefix)
+
     async def cleanup_expired_sessions(self):
         """Remove expired sessions"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("DELETE FROM user_sessions WHERE expires_at < ?", (datetime.now().isoformat(),))
             await db.commit()
 
     async def create_session(self, user_id: int, session_token: str, expires_at: datetime):
         """Create a new session for user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_sessions (user_id, session_token, expires_at)
                 VALUES (?, ?, ?)
@@ -613,51 +400,24 @@ class DatabaseManager:
 
     async def get_user_by_session(self, session_token: str):
         """Get user by session token"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute("""
                 SELECT u.* FROM users u
                 JOIN user_sessions s ON u.id = s.user_id
                 WHERE s.session_token = ? AND s.expires_at > ?
             """, (session_token, datetime.now().isoformat()))
-            
-            user = await cursor.fetchone()
-            
-            if user:
-                columns = [description[0] for description in cursor.description]
-                user_dict = dict(zip(columns, user))
-                
-                # Parse JSON fields
-                json_fields = [
-                    'job_types', 'job_functions', 'industries', 'preferred_roles',
-                    'work_mode', 'preferred_locations', 'key_technologies',
-                    'programming_languages', 'frameworks_libraries', 'tools_platforms',
-                    'soft_skills', 'languages', 'preferred_communication',
-                    'company_size_preference', 'team_dynamics', 'work_culture_keywords',
-                    'ai_extracted_skills', 'ai_extracted_experience', 'ai_extracted_education',
-                    'ai_extracted_certifications', 'preferences'
-                ]
-                
-                for field in json_fields:
-                    if user_dict.get(field):
-                        try:
-                            user_dict[field] = json.loads(user_dict[field])
-                        except json.JSONDecodeError:
-                            user_dict[field] = []
-                    else:
-                        user_dict[field] = [] if field not in ['programming_languages', 'frameworks_libraries', 'tools_platforms', 'languages'] else {}
-                
-                return user_dict
-            return None
+            cursor.row_factory = UserRecord.row_factory
+            return await cursor.fetchone()
 
     async def delete_session(self, session_token: str):
         """Delete a specific session"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("DELETE FROM user_sessions WHERE session_token = ?", (session_token,))
             await db.commit()
 
     async def add_education(self, user_id: int, **education_data):
         """Add education record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_education (user_id, degree, field_of_study, institution, 
                                           start_year, end_year, gpa, achievements, is_current)
@@ -675,11 +435,12 @@ class DatabaseManager:
             ))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def add_certification(self, user_id: int, **cert_data):
         """Add certification record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_certifications (user_id, certification_name, issuer, 
                                                year_achieved, credential_id, credential_url, expires_at)
@@ -695,11 +456,12 @@ class DatabaseManager:
             ))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def add_work_experience(self, user_id: int, **work_data):
         """Add work experience record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_work_experience (user_id, position_title, company_name, 
                                                 start_date, end_date, is_current, location,
@@ -722,11 +484,12 @@ class DatabaseManager:
             ))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def add_internship(self, user_id: int, **internship_data):
         """Add internship record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_internships (user_id, position_title, company_name, 
                                             start_date, end_date, location, work_mode,
@@ -752,11 +515,12 @@ class DatabaseManager:
             ))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def add_project(self, user_id: int, **project_data):
         """Add project record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 INSERT INTO user_projects (user_id, project_name, description, technologies,
                                          project_url, github_url, start_date, end_date,
@@ -776,11 +540,12 @@ class DatabaseManager:
             ))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def get_user_projects(self, user_id: int):
         """Get all projects for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute("""
                 SELECT id, project_name, description, technologies, project_url, github_url,
                        start_date, end_date, is_current, featured, created_at
@@ -810,7 +575,7 @@ class DatabaseManager:
 
     async def update_project(self, project_id: int, **project_data):
         """Update project record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 UPDATE user_projects 
                 SET project_name = ?, description = ?, technologies = ?, 
@@ -835,22 +600,23 @@ class DatabaseManager:
 
     async def delete_project(self, project_id: int):
         """Delete project record"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("DELETE FROM user_projects WHERE id = ?", (project_id,))
             await db.commit()
             return True
 
     async def clear_user_projects(self, user_id: int):
         """Clear all projects for a user (useful for resume re-processing)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("DELETE FROM user_projects WHERE user_id = ?", (user_id,))
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     # GitHub OAuth Methods
     async def link_github_account(self, user_id: int, github_id: str, github_access_token: str, github_username: str):
         """Link a GitHub account to a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             try:
                 # Check if GitHub account is already linked to another user
                 cursor = await db.execute("SELECT id FROM users WHERE github_id = ? AND id != ?", (github_id, user_id))
@@ -868,6 +634,7 @@ class DatabaseManager:
                 """, (github_id, github_access_token, github_username, user_id))
                 
                 await db.commit()
+                self.profile_cache.invalidate(user_id)
                 return True
                 
             except Exception as e:
@@ -876,7 +643,7 @@ class DatabaseManager:
 
     async def unlink_github_account(self, user_id: int):
         """Unlink GitHub account from a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 UPDATE users 
                 SET github_id = NULL, github_access_token = NULL, github_username = NULL,
@@ -887,11 +654,12 @@ class DatabaseManager:
             # Also clear associated GitHub data
             await db.execute("DELETE FROM github_repos WHERE user_id = ?", (user_id,))
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def get_user_github_info(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get GitHub information for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute("""
                 SELECT github_id, github_access_token, github_username, github_oauth_linked_at
                 FROM users WHERE id = ?
@@ -909,70 +677,123 @@ class DatabaseManager:
 
     async def get_user_by_github_id(self, github_id: str) -> Optional[Dict[str, Any]]:
         """Get user by GitHub ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute("SELECT * FROM users WHERE github_id = ?", (github_id,))
-            user = await cursor.fetchone()
-            
-            if user:
-                columns = [description[0] for description in cursor.description]
-                return dict(zip(columns, user))
-            return None
+            cursor.row_factory = UserRecord.row_factory
+            return await cursor.fetchone()
+
+    @staticmethod
+    def _content_hash(record: Dict[str, Any]) -> str:
+        """SHA-256 of a JSON-serializable record (repo, job listing) for change detection"""
+        payload = json.dumps(record, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-    async def store_github_repos(self, user_id: int, repos_data: List[Dict[str, Any]]):
-        """Store GitHub repositories for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def store_github_repos(self, user_id: int, repos_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert GitHub repositories for a user, writing only repos whose content changed"""
+        async with self.write_pool.acquire() as db:
             try:
-                # Clear existing repos for this user
-                await db.execute("DELETE FROM github_repos WHERE user_id = ?", (user_id,))
+                cursor = await db.execute(
+                    "SELECT github_id, id, content_hash FROM github_repos WHERE user_id = ?", (user_id,)
+                )
+                existing = {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
                 
+                stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+                changed = {}
                 for repo_data in repos_data:
-                    # Insert repository
-                    cursor = await db.execute("""
+                    content_hash = self._content_hash(repo_data)
+                    current = existing.get(repo_data['github_id'])
+                    if current is None:
+                        stats['inserted'] += 1
+                    elif current[1] != content_hash:
+                        stats['updated'] += 1
+                    else:
+                        stats['unchanged'] += 1
+                        continue
+                    changed[repo_data['github_id']] = (repo_data, content_hash)
+                
+                # Remove repos that no longer exist on GitHub (with their languages/README)
+                incoming_ids = {repo_data['github_id'] for repo_data in repos_data}
+                removed_repo_ids = [(repo_id,) for github_id, (repo_id, _) in existing.items()
+                                    if github_id not in incoming_ids]
+                stats['deleted'] = len(removed_repo_ids)
+                if removed_repo_ids:
+                    await db.executemany("DELETE FROM github_languages WHERE repo_id = ?", removed_repo_ids)
+                    await db.executemany("DELETE FROM github_readmes WHERE repo_id = ?", removed_repo_ids)
+                    await db.executemany("DELETE FROM github_repos WHERE id = ?", removed_repo_ids)
+                
+                if changed:
+                    # Upsert keeps repo ids stable for unchanged languages/README rows
+                    await db.executemany("""
                         INSERT INTO github_repos (
                             user_id, github_id, name, full_name, description, url, clone_url,
-                            language, stars, forks, is_fork, is_private, created_at, updated_at, topics
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        user_id,
-                        repo_data['github_id'],
-                        repo_data['name'],
-                        repo_data['full_name'],
-                        repo_data.get('description', ''),
-                        repo_data['url'],
-                        repo_data.get('clone_url', ''),
-                        repo_data.get('language', ''),
-                        repo_data.get('stars', 0),
-                        repo_data.get('forks', 0),
-                        repo_data.get('is_fork', False),
-                        repo_data.get('is_private', False),
-                        repo_data.get('created_at', ''),
-                        repo_data.get('updated_at', ''),
-                        json.dumps(repo_data.get('topics', []))
-                    ))
+                            language, stars, forks, is_fork, is_private, created_at, updated_at, topics,
+                            content_hash
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(user_id, github_id) DO UPDATE SET
+                            name = excluded.name, full_name = excluded.full_name,
+                            description = excluded.description, url = excluded.url,
+                            clone_url = excluded.clone_url, language = excluded.language,
+                            stars = excluded.stars, forks = excluded.forks, is_fork = excluded.is_fork,
+                            is_private = excluded.is_private, created_at = excluded.created_at,
+                            updated_at = excluded.updated_at, topics = excluded.topics,
+                            content_hash = excluded.content_hash, last_synced = CURRENT_TIMESTAMP
+                    """, [
+                        (
+                            user_id,
+                            repo_data['github_id'],
+                            repo_data['name'],
+                            repo_data['full_name'],
+                            repo_data.get('description', ''),
+                            repo_data['url'],
+                            repo_data.get('clone_url', ''),
+                            repo_data.get('language', ''),
+                            repo_data.get('stars', 0),
+                            repo_data.get('forks', 0),
+                            repo_data.get('is_fork', False),
+                            repo_data.get('is_private', False),
+                            repo_data.get('created_at', ''),
+                            repo_data.get('updated_at', ''),
+                            json.dumps(repo_data.get('topics', [])),
+                            content_hash
+                        )
+                        for repo_data, content_hash in changed.values()
+                    ])
+                    
+                    cursor = await db.execute("SELECT github_id, id FROM github_repos WHERE user_id = ?", (user_id,))
+                    repo_ids = {row[0]: row[1] for row in await cursor.fetchall()}
+                    changed_repo_ids = [(repo_ids[github_id],) for github_id in changed]
                     
-                    repo_id = cursor.lastrowid
+                    # Replace languages and README of changed repos only
+                    await db.executemany("DELETE FROM github_languages WHERE repo_id = ?", changed_repo_ids)
+                    await db.executemany("DELETE FROM github_readmes WHERE repo_id = ?", changed_repo_ids)
                     
-                    # Insert languages
-                    languages = repo_data.get('languages', {})
-                    if languages:
-                        total_bytes = sum(languages.values())
-                        for language, bytes_count in languages.items():
-                            percentage = (bytes_count / total_bytes) * 100 if total_bytes > 0 else 0
-                            await db.execute("""
-                                INSERT INTO github_languages (repo_id, language, bytes, percentage)
-                                VALUES (?, ?, ?, ?)
-                            """, (repo_id, language, bytes_count, percentage))
+                    language_rows = []
+                    readme_rows = []
+                    for github_id, (repo_data, _) in changed.items():
+                        repo_id = repo_ids[github_id]
+                        
+                        languages = repo_data.get('languages', {})
+                        if languages:
+                            total_bytes = sum(languages.values())
+                            for language, bytes_count in languages.items():
+                                percentage = (bytes_count / total_bytes) * 100 if total_bytes > 0 else 0
+                                language_rows.append((repo_id, language, bytes_count, percentage))
+                        
+                        readme_content = repo_data.get('readme')
+                        if readme_content:
+                            readme_rows.append((repo_id, readme_content))
                     
-                    # Insert README
-                    readme_content = repo_data.get('readme')
-                    if readme_content:
-                        await db.execute("""
-                            INSERT INTO github_readmes (repo_id, content)
-                            VALUES (?, ?)
-                        """, (repo_id, readme_content))
+                    await db.executemany("""
+                        INSERT INTO github_languages (repo_id, language, bytes, percentage)
+                        VALUES (?, ?, ?, ?)
+                    """, language_rows)
+                    await db.executemany("""
+                        INSERT INTO github_readmes (repo_id, content)
+                        VALUES (?, ?)
+                    """, readme_rows)
                 
                 await db.commit()
-                return True
+                return stats
                 
             except Exception as e:
                 await db.rollback()
@@ -980,7 +801,7 @@ class DatabaseManager:
 
     async def get_github_repos(self, user_id: int) -> List[Dict[str, Any]]:
         """Get GitHub repositories for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read_pool.acquire() as db:
             cursor = await db.execute("""
                 SELECT r.*, 
                        GROUP_CONCAT(l.language || ':' || l.bytes || ':' || l.percentage, '|') as languages,
@@ -1021,9 +842,495 @@ class DatabaseManager:
             
             return repos
 
+    async def get_user_github_languages(self, user_id: int) -> Dict[str, int]:
+        """Bytes of code per language across a user's GitHub repos"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute("""
+                SELECT l.language, SUM(l.bytes)
+                FROM github_repos r
+                JOIN github_languages l ON l.repo_id = r.id
+                WHERE r.user_id = ?
+                GROUP BY l.language
+            """, (user_id,))
+            return {row[0]: row[1] for row in await cursor.fetchall()}
+
+    async def get_jobs_cache(self, source: str) -> Optional[Dict[str, Any]]:
+        """Get the cached job feed for a source (expired entries included)"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(
+                "SELECT job_data, created_at, expires_at FROM jobs_cache WHERE source = ?", (source,)
+            )
+            row = await cursor.fetchone()
+            if not row:
+                return None
+            return {
+                'job_data': json.loads(row[0]),
+                'created_at': datetime.fromisoformat(row[1]),
+                'expires_at': datetime.fromisoformat(row[2])
+            }
+
+    async def store_jobs_cache(self, source: str, job_data: Any, fetched_at: datetime, expires_at: datetime):
+        """Replace the cached job feed for a source"""
+        async with self.write_pool.acquire() as db:
+            await db.execute("""
+                INSERT INTO jobs_cache (source, job_data, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    job_data = excluded.job_data, created_at = excluded.created_at,
+                    expires_at = excluded.expires_at
+            """, (source, json.dumps(job_data), fetched_at.isoformat(), expires_at.isoformat()))
+            await db.commit()
+
+    @staticmethod
+    def _job_key(source: str, job: Dict[str, Any]) -> str:
+        """Stable id of a listing: its apply URL, or title + company when there is none"""
+        identity = job.get('apply_url') or f"{job.get('title', '')}|{job.get('company', '')}"
+        payload = f"{source}\x1f{identity.strip().lower()}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    async def upsert_jobs(self, source: str, jobs: List[Dict[str, Any]], seen_at: datetime,
+                          expire_after: timedelta) -> Dict[str, int]:
+        """Merge one ingestion batch into the jobs table, rewriting only listings whose content changed"""
+        seen = seen_at.isoformat(timespec='seconds')
+        expires = (seen_at + expire_after).isoformat(timespec='seconds')
+        
+        batch = {}
+        for job in jobs:
+            if job.get('title'):
+                batch[self._job_key(source, job)] = (job, self._content_hash(job))
+        
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0}
+        if not batch:
+            return stats
+        
+        async with self.write_pool.acquire() as db:
+            try:
+                placeholders = ', '.join('?' for _ in batch)
+                cursor = await db.execute(
+                    f"SELECT job_key, content_hash FROM jobs WHERE job_key IN ({placeholders})", list(batch)
+                )
+                existing = {row[0]: row[1] for row in await cursor.fetchall()}
+                
+                changed = []
+                unchanged = []
+                for key, (job, content_hash) in batch.items():
+                    if key not in existing:
+                        stats['inserted'] += 1
+                    elif existing[key] != content_hash:
+                        stats['updated'] += 1
+                    else:
+                        stats['unchanged'] += 1
+                        unchanged.append((seen, expires, key))
+                        continue
+                    changed.append((
+                        key,
+                        source,
+                        job['title'],
+                        job.get('company', ''),
+                        job.get('location', ''),
+                        json.dumps(job.get('tags', [])),
+                        job.get('apply_url', ''),
+                        job.get('description', ''),
+                        str(job.get('salary') or ''),
+                        str(job.get('date') or ''),
+                        content_hash,
+                        seen,
+                        seen,
+                        expires
+                    ))
+                
+                # Unchanged listings only have their sighting refreshed (FTS triggers don't fire)
+                await db.executemany(
+                    "UPDATE jobs SET last_seen_at = ?, expires_at = ? WHERE job_key = ?", unchanged
+                )
+                await db.executemany("""
+                    INSERT INTO jobs (
+                        job_key, source, title, company, location, tags, apply_url, description,
+                        salary, posted_at, content_hash, first_seen_at, last_seen_at, expires_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        title = excluded.title, company = excluded.company, location = excluded.location,
+                        tags = excluded.tags, apply_url = excluded.apply_url,
+                        description = excluded.description, salary = excluded.salary,
+                        posted_at = excluded.posted_at, content_hash = excluded.content_hash,
+                        last_seen_at = excluded.last_seen_at, expires_at = excluded.expires_at
+                """, changed)
+                
+                if changed:
+                    # New listings are linked to an existing canonical job when they duplicate one;
+                    # every changed listing is (re)classified
+                    changed_keys = [row[0] for row in changed]
+                    placeholders = ', '.join('?' for _ in changed_keys)
+                    cursor = await db.execute(
+                        f"SELECT job_key, id FROM jobs WHERE job_key IN ({placeholders}) ORDER BY id", changed_keys
+                    )
+                    for key, job_id in await cursor.fetchall():
+                        is_new = key not in existing
+                        job = batch[key][0]
+                        canonical_id = await index_job(db, job_id, dedup_keys(job), assign_canonical=is_new, now=seen)
+                        await sync_job_labels(db, job_id, job_classifier.classify(job))
+                        if canonical_id is not None:
+                            stats['duplicates'] += 1
+                
+                await db.commit()
+                return stats
+                
+            except Exception as e:
+                await db.rollback()
+                raise e
+
+    async def get_jobs(self, source: Optional[str] = None, limit: int = 50, offset: int = 0,
+                       filters: Optional[Dict[str, List[str]]] = None,
+                       after: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+        """Get unexpired canonical jobs (duplicates folded into `sources`), newest first.
+
+        `filters` maps a classifier facet to accepted labels, e.g. {"seniority": ["intern", "junior"]}.
+        `after` is a (first_seen_at, id) keyset position: only jobs ordered after it are returned.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        query = f"""
+            SELECT j.id, j.title, j.company, j.tags, j.location, j.apply_url, j.description, j.salary,
+                   j.posted_at, j.source, j.first_seen_at, j.last_seen_at,
+                   (SELECT json_group_array(DISTINCT d.source) FROM jobs d
+                    WHERE d.canonical_id = j.id AND d.expires_at > ?) AS duplicate_sources,
+                   (SELECT json_group_array(json_array(l.facet, l.label)) FROM job_labels l
+                    WHERE l.job_id = j.id) AS labels,
+                   j.fingerprint
+            FROM jobs j
+            WHERE {VISIBLE_JOB_CONDITION}
+        """
+        params: List[Any] = [now, now, now]
+        if source:
+            query += " AND j.source = ?"
+            params.append(source)
+        label_condition, label_params = label_filter_sql(filters or {})
+        if label_condition:
+            query += f" AND {label_condition}"
+            params.extend(label_params)
+        if after:
+            query += " AND (j.first_seen_at, j.id) < (?, ?)"
+            params.extend(after)
+        query += " ORDER BY j.first_seen_at DESC, j.id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(query, params)
+            jobs = []
+            for row in await cursor.fetchall():
+                sources = list(dict.fromkeys([row[9], *json.loads(row[12] or '[]')]))
+                labels = {facet: [] for facet in job_classifier.taxonomy}
+                for facet, label in json.loads(row[13] or '[]'):
+                    labels.setdefault(facet, []).append(label)
+                jobs.append({
+                    'id': row[0],
+                    'title': row[1],
+                    'company': row[2],
+                    'tags': json.loads(row[3] or '[]'),
+                    'location': row[4],
+                    'apply_url': row[5],
+                    'description': row[6],
+                    'salary': row[7],
+                    'date': row[8],
+                    'source': JOB_SOURCE_LABELS.get(row[9], row[9]),
+                    'sources': [JOB_SOURCE_LABELS.get(name, name) for name in sources],
+                    'labels': labels,
+                    'fingerprint': row[14],
+                    'first_seen_at': row[10],
+                    'last_seen_at': row[11]
+                })
+            return jobs
+
+    async def count_jobs(self, source: Optional[str] = None, filters: Optional[Dict[str, List[str]]] = None) -> int:
+        """Count unexpired canonical jobs"""
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        query = f"SELECT COUNT(*) FROM jobs j WHERE {VISIBLE_JOB_CONDITION}"
+        params: List[Any] = [now, now]
+        if source:
+            query += " AND j.source = ?"
+            params.append(source)
+        label_condition, label_params = label_filter_sql(filters or {})
+        if label_condition:
+            query += f" AND {label_condition}"
+            params.extend(label_params)
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(query, params)
+            return (await cursor.fetchone())[0]
+
+    async def purge_expired_jobs(self, before: datetime) -> int:
+        """Delete jobs that expired before the given time"""
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute(
+                "DELETE FROM jobs WHERE expires_at < ?", (before.isoformat(timespec='seconds'),)
+            )
+            if cursor.rowcount:
+                await db.execute("DELETE FROM job_minhash_bands WHERE job_id NOT IN (SELECT id FROM jobs)")
+                await db.execute("DELETE FROM job_labels WHERE job_id NOT IN (SELECT id FROM jobs)")
+            await db.commit()
+            return cursor.rowcount
+
+    async def touch_jobs_cache(self, source: str, fetched_at: datetime, expires_at: datetime):
+        """Extend a cached job feed that upstream reported unchanged"""
+        async with self.write_pool.acquire() as db:
+            await db.execute(
+                "UPDATE jobs_cache SET created_at = ?, expires_at = ? WHERE source = ?",
+                (fetched_at.isoformat(), expires_at.isoformat(), source)
+            )
+            await db.commit()
+
+    async def touch_jobs(self, source: str, previous_seen_at: str, seen_at: datetime,
+                         expire_after: timedelta) -> int:
+        """Mark every job of the previous ingestion batch as seen again (feed unchanged upstream)"""
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute(
+                "UPDATE jobs SET last_seen_at = ?, expires_at = ? WHERE source = ? AND last_seen_at = ?",
+                (
+                    seen_at.isoformat(timespec='seconds'),
+                    (seen_at + expire_after).isoformat(timespec='seconds'),
+                    source,
+                    previous_seen_at
+                )
+            )
+            await db.commit()
+            return cursor.rowcount
+
+    async def record_job_application(self, user_id: int, user_email: str, job_title: str, company: str,
+                                     job_source: str, job_url: Optional[str] = None,
+                                     job_id: Optional[int] = None) -> int:
+        """Record that a user applied to a job"""
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute("""
+                INSERT INTO job_applications (user_id, user_email, job_title, company, job_source, job_url, job_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (user_id, user_email, job_title, company, job_source, job_url, job_id))
+            await db.commit()
+            return cursor.lastrowid
+
+    async def get_user_applications(self, user_id: int) -> List[Dict[str, Any]]:
+        """Get a user's job applications, most recent first"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute("""
+                SELECT job_title, company, job_source, job_url, applied_at
+                FROM job_applications
+                WHERE user_id = ?
+                ORDER BY applied_at DESC
+            """, (user_id,))
+            return [
+                {
+                    'job_title': row[0],
+                    'company': row[1],
+                    'job_source': row[2],
+                    'job_url': row[3],
+                    'applied_at': row[4]
+                }
+                for row in await cursor.fetchall()
+            ]
+
+    async def get_job_fingerprint(self, job_id: int) -> Optional[str]:
+        """Fingerprint of a job's canonical listing (the one feeds show)"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute("""
+                SELECT COALESCE(c.fingerprint, j.fingerprint)
+                FROM jobs j LEFT JOIN jobs c ON c.id = j.canonical_id
+                WHERE j.id = ?
+            """, (job_id,))
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def record_job_interaction(self, user_id: int, job_fingerprint: str, action: str,
+                                     job_id: Optional[int] = None):
+        """Exclude a job from a user's feeds; 'applied' wins over 'dismissed'"""
+        async with self.write_pool.acquire() as db:
+            await db.execute("""
+                INSERT INTO user_job_exclusions (user_id, job_fingerprint, action, job_id)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, job_fingerprint) DO UPDATE SET
+                    action = CASE WHEN excluded.action = 'applied' THEN 'applied' ELSE action END,
+                    job_id = COALESCE(excluded.job_id, job_id)
+            """, (user_id, job_fingerprint, action, job_id))
+            await db.commit()
+
+    async def get_user_job_fingerprints(self, user_id: int) -> List[str]:
+        """Fingerprints of every job a user applied to or dismissed"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(
+                "SELECT job_fingerprint FROM user_job_exclusions WHERE user_id = ?", (user_id,)
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def get_seen_job_fingerprints(self, user_id: int, fingerprints: List[str]) -> Set[str]:
+        """Which of the given fingerprints a user applied to or dismissed"""
+        placeholders = ', '.join('?' for _ in fingerprints)
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(f"""
+                SELECT job_fingerprint FROM user_job_exclusions
+                WHERE user_id = ? AND job_fingerprint IN ({placeholders})
+            """, (user_id, *fingerprints))
+            return {row[0] for row in await cursor.fetchall()}
+
+    async def enqueue_resume_job(self, user_id: int, kind: str, resume_path: str,
+                                 dedup_key: str) -> Tuple[Dict[str, Any], bool]:
+        """Queue a resume job unless one with the same dedup key is queued or running.
+
+        Returns (job, created); an in-flight duplicate is returned instead of a new job.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute(
+                f"SELECT {RESUME_JOB_COLUMNS} FROM resume_jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                (dedup_key,)
+            )
+            row = await cursor.fetchone()
+            if row:
+                return _resume_job(row), False
+
+            cursor = await db.execute(f"""
+                INSERT INTO resume_jobs (user_id, kind, resume_path, dedup_key, run_after, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                RETURNING {RESUME_JOB_COLUMNS}
+            """, (user_id, kind, resume_path, dedup_key, now, now, now))
+            row = await cursor.fetchone()
+            await db.commit()
+            return _resume_job(row), True
+
+    async def claim_resume_job(self, owner: str, lease: timedelta) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job: queued and due, or running with an expired lease (crashed worker)"""
+        now = datetime.now(timezone.utc)
+        now_text = now.isoformat(timespec='seconds')
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute(f"""
+                UPDATE resume_jobs
+                SET status = 'running', attempts = attempts + 1,
+                    stage = CASE WHEN status = 'running' THEN 'recovered' ELSE 'started' END,
+                    lease_owner = ?, lease_expires_at = ?, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM resume_jobs
+                    WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_expires_at < ?)
+                    ORDER BY id LIMIT 1
+                )
+                RETURNING {RESUME_JOB_COLUMNS}
+            """, (owner, (now + lease).isoformat(timespec='seconds'), now_text, now_text, now_text))
+            row = await cursor.fetchone()
+            await db.commit()
+            return _resume_job(row) if row else None
+
+    async def update_resume_job_stage(self, job_id: int, owner: str, stage: str, lease: timedelta) -> bool:
+        """Record progress and extend the lease; False when the lease was lost to another worker"""
+        now = datetime.now(timezone.utc)
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute("""
+                UPDATE resume_jobs SET stage = ?, lease_expires_at = ?, updated_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """, (stage, (now + lease).isoformat(timespec='seconds'), now.isoformat(timespec='seconds'), job_id, owner))
+            await db.commit()
+            return cursor.rowcount > 0
+
+    async def finish_resume_job(self, job_id: int, owner: str, status: str, result: Any = None,
+                                error: Optional[str] = None, retry_at: Optional[datetime] = None) -> bool:
+        """Complete, fail, or (with retry_at) requeue a leased job"""
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        async with self.write_pool.acquire() as db:
+            if retry_at is not None:
+                cursor = await db.execute("""
+                    UPDATE resume_jobs
+                    SET status = 'queued', stage = 'retrying', run_after = ?, error = ?,
+                        lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'running'
+                """, (retry_at.isoformat(timespec='seconds'), error, now, job_id, owner))
+            else:
+                cursor = await db.execute("""
+                    UPDATE resume_jobs
+                    SET status = ?, stage = ?, result = ?, error = ?,
+                        lease_owner = NULL, lease_expires_at = NULL, updated_at = ?, finished_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'running'
+                """, (status, status, json.dumps(result) if result is not None else None, error, now, now, job_id, owner))
+            await db.commit()
+            return cursor.rowcount > 0
+
+    async def get_resume_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a resume job by id"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(f"SELECT {RESUME_JOB_COLUMNS} FROM resume_jobs WHERE id = ?", (job_id,))
+            row = await cursor.fetchone()
+            return _resume_job(row) if row else None
+
+    async def acquire_resume_blob(self, content_hash: str, file_path: str, file_size: int) -> Dict[str, Any]:
+        """Take a reference on a stored resume file, registering it if new.
+
+        Returns {file_path, ref_count}; file_path is the existing copy when the content is already stored.
+        """
+        async with self.write_pool.acquire() as db:
+            cursor = await db.execute("""
+                INSERT INTO resume_blobs (content_hash, file_path, file_size, ref_count) VALUES (?, ?, ?, 1)
+                ON CONFLICT(content_hash) DO UPDATE SET ref_count = ref_count + 1
+                RETURNING file_path, ref_count
+            """, (content_hash, file_path, file_size))
+            row = await cursor.fetchone()
+            await db.commit()
+            return {'file_path': row[0], 'ref_count': row[1]}
+
+    async def release_resume_blob(self, content_hash: str, delete_file: Callable[[str], Any]) -> bool:
+        """Drop a reference; the last one removes the row, cached results and (through delete_file) the file.
+
+        The file is deleted before the commit, while this connection holds the write lock,
+        so a concurrent acquire of the same content never sees a file that is about to go.
+        """
+        async with self.write_pool.acquire() as db:
+            try:
+                cursor = await db.execute(
+                    "UPDATE resume_blobs SET ref_count = ref_count - 1 WHERE content_hash = ? RETURNING file_path, ref_count",
+                    (content_hash,)
+                )
+                row = await cursor.fetchone()
+                released = bool(row and row[1] <= 0)
+                if released:
+                    await db.execute("DELETE FROM resume_blobs WHERE content_hash = ?", (content_hash,))
+                    await db.execute("DELETE FROM resume_texts WHERE content_hash = ?", (content_hash,))
+                    await db.execute("DELETE FROM resume_analyses WHERE content_hash = ?", (content_hash,))
+                    delete_file(row[0])
+                await db.commit()
+                return released
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def get_resume_text(self, content_hash: str) -> Optional[str]:
+        """Cached extracted text of a resume file"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute(
+                "SELECT extracted_text FROM resume_texts WHERE content_hash = ?", (content_hash,)
+            )
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def store_resume_text(self, content_hash: str, extracted_text: str):
+        async with self.write_pool.acquire() as db:
+            await db.execute(
+                "INSERT OR REPLACE INTO resume_texts (content_hash, extracted_text) VALUES (?, ?)",
+                (content_hash, extracted_text)
+            )
+            await db.commit()
+
+    async def get_resume_analysis(self, content_hash: str, prompt_version: str, model: str) -> Optional[Dict[str, Any]]:
+        """Cached Gemini analysis of a resume file for a prompt version and model"""
+        async with self.read_pool.acquire() as db:
+            cursor = await db.execute("""
+                SELECT result FROM resume_analyses
+                WHERE content_hash = ? AND prompt_version = ? AND model = ?
+            """, (content_hash, prompt_version, model))
+            row = await cursor.fetchone()
+            return json.loads(row[0]) if row else None
+
+    async def store_resume_analysis(self, content_hash: str, prompt_version: str, model: str, result: Dict[str, Any]):
+        async with self.write_pool.acquire() as db:
+            await db.execute("""
+                INSERT OR REPLACE INTO resume_analyses (content_hash, prompt_version, model, result)
+                VALUES (?, ?, ?, ?)
+            """, (content_hash, prompt_version, model, json.dumps(result)))
+            await db.commit()
+
     async def update_github_token(self, user_id: int, new_token: str):
         """Update GitHub access token for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             await db.execute("""
                 UPDATE users 
                 SET github_access_token = ?
@@ -1031,11 +1338,12 @@ class DatabaseManager:
             """, (new_token, user_id))
             
             await db.commit()
+            self.profile_cache.invalidate(user_id)
             return True
 
     async def clear_invalid_github_tokens(self):
         """Clear invalid GitHub tokens (called when tokens are revoked)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.write_pool.acquire() as db:
             # This method can be called by a background job to clear invalid tokens
             # For now, we'll just provide the framework
             pass
@@ -0,0 +1,708 @@
+import hashlib
+import logging
+import os
+from typing import Awaitable, Callable, List, Union
+
+import aiosqlite
+
+from skills_index import backfill_user_skills
+from job_dedup import backfill_job_dedup, fingerprint
+from job_classifier import backfill_job_labels
+
+logger = logging.getLogger(__name__)
+
+# A step is either a SQL statement or an async callable taking the connection
+MigrationStep = Union[str, Callable[[aiosqlite.Connection], Awaitable[None]]]
+
+
+class Migration:
+    """One ordered, versioned schema change"""
+
+    def __init__(self, version: int, description: str, steps: List[MigrationStep]):
+        self.version = version
+        self.description = description
+        self.steps = steps
+
+    async def apply(self, db: aiosqlite.Connection):
+        for step in self.steps:
+            if isinstance(step, str):
+                await db.execute(step)
+            else:
+                await step(db)
+
+
+def add_column(table: str, column: str, definition: str) -> MigrationStep:
+    """Online-safe ADD COLUMN: a no-op when the column already exists.
+
+    SQLite only rewrites the table header for ADD COLUMN, so this is cheap
+    even on large tables. `definition` must not use a non-constant default.
+    """
+    async def step(db: aiosqlite.Connection):
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in await cursor.fetchall()]:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def create_index(name: str, table: str, columns: str, unique: bool = False) -> MigrationStep:
+    """Idempotent CREATE INDEX"""
+    return f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table}({columns})"
+
+
+async def backfill_job_exclusions(db: aiosqlite.Connection):
+    """Migration step: mark every job already applied to as applied, keyed by the current fingerprint"""
+    cursor = await db.execute("SELECT user_id, job_title, company, job_url, applied_at FROM job_applications")
+    await db.executemany("""
+        INSERT OR IGNORE INTO user_job_exclusions (user_id, job_fingerprint, action, created_at)
+        VALUES (?, ?, 'applied', ?)
+    """, [
+        (user_id, fingerprint({'title': title, 'company': company, 'apply_url': job_url}), applied_at)
+        for user_id, title, company, job_url, applied_at in await cursor.fetchall()
+    ])
+    # Exclusions of a known job follow its canonical listing's fingerprint
+    await db.execute("""
+        UPDATE OR REPLACE user_job_exclusions SET job_fingerprint = (
+            SELECT COALESCE(c.fingerprint, j.fingerprint)
+            FROM jobs j LEFT JOIN jobs c ON c.id = j.canonical_id
+            WHERE j.id = user_job_exclusions.job_id
+        )
+        WHERE job_id IN (SELECT id FROM jobs WHERE fingerprint IS NOT NULL)
+    """)
+
+
+async def backfill_resume_blobs(db: aiosqlite.Connection):
+    """Migration step: hash resume files already on disk and count their users"""
+    cursor = await db.execute("SELECT id, resume_path FROM users WHERE resume_path IS NOT NULL AND resume_path != ''")
+    for user_id, resume_path in await cursor.fetchall():
+        if not os.path.isfile(resume_path):
+            continue
+        digest = hashlib.sha256()
+        with open(resume_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+        await db.execute("""
+            INSERT INTO resume_blobs (content_hash, file_path, file_size, ref_count) VALUES (?, ?, ?, 1)
+            ON CONFLICT(content_hash) DO UPDATE SET ref_count = ref_count + 1
+        """, (content_hash, resume_path, os.path.getsize(resume_path)))
+        await db.execute("UPDATE users SET resume_hash = ? WHERE id = ?", (content_hash, user_id))
+
+
+# Ordered list of schema migrations. Never edit an applied migration;
+# append a new one with the next version number instead.
+MIGRATIONS = [
+    Migration(1, "Initial schema", [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            login_code TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            
+            -- Basic Profile
+            first_name TEXT,
+            last_name TEXT,
+            phone TEXT,
+            phone_number TEXT, -- Legacy compatibility
+            linkedin_url TEXT,
+            github_url TEXT,
+            portfolio_url TEXT,
+            location TEXT,
+            bio TEXT,
+            profile_picture_url TEXT,
+            
+            -- GitHub OAuth Integration
+            github_id TEXT UNIQUE,
+            github_access_token TEXT, -- Encrypted
+            github_username TEXT,
+            github_oauth_linked_at TIMESTAMP,
+            
+            -- Job Type Preferences
+            job_types TEXT, -- JSON array: ["full-time", "part-time", "internship", "contract", "freelance", "apprenticeship", "volunteer", "temporary"]
+            job_functions TEXT, -- JSON array
+            industries TEXT, -- JSON array
+            preferred_roles TEXT, -- JSON array
+            
+            -- Work Mode
+            work_mode TEXT, -- JSON array: ["onsite", "remote", "hybrid"]
+            relocation_willingness BOOLEAN DEFAULT 0,
+            preferred_locations TEXT, -- JSON array
+            
+            -- Experience
+            total_years_experience INTEGER,
+            years_in_relevant_field INTEGER,
+            key_technologies TEXT, -- JSON array
+            has_managerial_experience BOOLEAN DEFAULT 0,
+            
+            -- Compensation
+            min_expected_salary DECIMAL,
+            max_expected_salary DECIMAL,
+            salary_currency TEXT DEFAULT 'USD',
+            salary_negotiable BOOLEAN DEFAULT 1,
+            compensation_type TEXT DEFAULT 'yearly', -- yearly, monthly, hourly, contract
+            
+            -- Availability
+            notice_period TEXT, -- immediate, 2weeks, 1month, custom
+            preferred_start_date DATE,
+            work_authorization_status TEXT,
+            
+            -- Education (primary/latest)
+            highest_degree TEXT,
+            field_of_study TEXT,
+            institution TEXT,
+            graduation_year INTEGER,
+            
+            -- Technical Skills
+            programming_languages TEXT, -- JSON with proficiency levels
+            frameworks_libraries TEXT, -- JSON with proficiency levels
+            tools_platforms TEXT, -- JSON with proficiency levels
+            
+            -- Soft Skills
+            soft_skills TEXT, -- JSON array
+            
+            -- Languages
+            languages TEXT, -- JSON with proficiency levels
+            
+            -- Job Search Preferences
+            job_search_status TEXT DEFAULT 'actively_looking', -- actively_looking, open_to_offers, not_looking
+            preferred_communication TEXT, -- JSON array: ["email", "phone", "linkedin"]
+            resume_visibility TEXT DEFAULT 'recruiters_only', -- public, recruiters_only, private
+            
+            -- Cultural Fit
+            company_size_preference TEXT, -- JSON array: ["startup", "mid_size", "enterprise"]
+            team_dynamics TEXT, -- JSON array
+            work_culture_keywords TEXT, -- JSON array
+            
+            -- Other
+            willing_to_travel BOOLEAN DEFAULT 0,
+            travel_percentage INTEGER DEFAULT 0,
+            security_clearance TEXT,
+            accessibility_needs TEXT,
+            
+            -- Resume Data Integration
+            resume_parsed BOOLEAN DEFAULT 0,
+            resume_filename TEXT,
+            resume_upload_date TIMESTAMP,
+            
+            -- AI Extracted Data (from resume)
+            ai_extracted_skills TEXT, -- JSON
+            ai_extracted_experience TEXT, -- JSON
+            ai_extracted_education TEXT, -- JSON
+            ai_extracted_certifications TEXT, -- JSON
+            ai_summary TEXT,
+            
+            -- Legacy fields for backward compatibility
+            skills TEXT,
+            preferences TEXT,
+            resume_path TEXT,
+            linkedin_data TEXT,
+            github_data TEXT,
+            resume_processed_data TEXT,
+            profile_completed BOOLEAN DEFAULT FALSE,
+            
+            -- Additional legacy fields
+            experience_level TEXT,
+            salary_min INTEGER,
+            salary_max INTEGER,
+            currency TEXT DEFAULT 'USD'
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_education (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            degree TEXT NOT NULL,
+            field_of_study TEXT,
+            institution TEXT NOT NULL,
+            start_year INTEGER,
+            end_year INTEGER,
+            gpa DECIMAL,
+            achievements TEXT,
+            is_current BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_certifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            certification_name TEXT NOT NULL,
+            issuer TEXT NOT NULL,
+            year_achieved INTEGER,
+            credential_id TEXT,
+            credential_url TEXT,
+            expires_at DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_work_experience (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            position_title TEXT NOT NULL,
+            company_name TEXT NOT NULL,
+            start_date DATE,
+            end_date DATE,
+            is_current BOOLEAN DEFAULT 0,
+            location TEXT,
+            work_mode TEXT, -- onsite, remote, hybrid
+            technologies_used TEXT, -- JSON array
+            responsibilities TEXT,
+            achievements TEXT,
+            employment_type TEXT, -- full-time, part-time, contract, freelance
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_internships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            position_title TEXT NOT NULL,
+            company_name TEXT NOT NULL,
+            start_date DATE,
+            end_date DATE,
+            location TEXT,
+            work_mode TEXT, -- onsite, remote, hybrid
+            technologies_used TEXT, -- JSON array
+            responsibilities TEXT,
+            achievements TEXT,
+            internship_type TEXT, -- full-time, part-time, virtual, industrial_training
+            stipend_amount DECIMAL,
+            stipend_currency TEXT,
+            certificate_url TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            session_token TEXT UNIQUE NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            project_name TEXT NOT NULL,
+            description TEXT,
+            technologies TEXT, -- JSON array
+            project_url TEXT,
+            github_url TEXT,
+            start_date DATE,
+            end_date DATE,
+            is_current BOOLEAN DEFAULT 0,
+            featured BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS github_repos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            github_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            description TEXT,
+            url TEXT NOT NULL,
+            clone_url TEXT,
+            language TEXT,
+            stars INTEGER DEFAULT 0,
+            forks INTEGER DEFAULT 0,
+            is_fork BOOLEAN DEFAULT 0,
+            is_private BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP,
+            last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            topics TEXT, -- JSON array
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            UNIQUE(user_id, github_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS github_languages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            repo_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            bytes INTEGER DEFAULT 0,
+            percentage REAL DEFAULT 0.0,
+            FOREIGN KEY (repo_id) REFERENCES github_repos (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS github_readmes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            repo_id INTEGER NOT NULL,
+            content TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (repo_id) REFERENCES github_repos (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS job_applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            user_email TEXT NOT NULL,
+            job_title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            job_source TEXT NOT NULL,
+            job_url TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS jobs_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            job_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+        ''',
+
+        "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+        "CREATE INDEX IF NOT EXISTS idx_users_github_id ON users(github_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_token ON user_sessions(session_token)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON user_sessions(expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_education_user ON user_education(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_certifications_user ON user_certifications(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_work_experience_user ON user_work_experience(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_internships_user ON user_internships(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_user ON user_projects(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_github_repos_user ON github_repos(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_github_repos_github_id ON github_repos(github_id)",
+        "CREATE INDEX IF NOT EXISTS idx_github_languages_repo ON github_languages(repo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_github_readmes_repo ON github_readmes(repo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_users_job_search_status ON users(job_search_status)",
+        "CREATE INDEX IF NOT EXISTS idx_users_work_mode ON users(work_mode)",
+        "CREATE INDEX IF NOT EXISTS idx_users_location ON users(location)",
+    ]),
+    Migration(2, "Track GitHub repo content hash for diff-based sync", [
+        add_column("github_repos", "content_hash", "TEXT"),
+    ]),
+    Migration(3, "Normalized skills dictionary and user_skills inverted index", [
+        '''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL -- canonical lowercase name
+        )
+        ''',
+        # (skill_id, user_id) primary key doubles as the skill -> users posting list
+        '''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            skill_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (skill_id, user_id),
+            FOREIGN KEY (skill_id) REFERENCES skills (id),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        ''',
+        create_index("idx_user_skills_user", "user_skills", "user_id"),
+        backfill_user_skills,
+    ]),
+    Migration(4, "FTS5 full-text indexes over resumes and GitHub READMEs", [
+        # External-content FTS tables: only the inverted index is stored, rows live in users/github_readmes
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+            name, bio, skills, resume_processed_data,
+            content='users', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+            INSERT INTO resume_fts (rowid, name, bio, skills, resume_processed_data)
+            VALUES (new.id, new.name, new.bio, new.skills, new.resume_processed_data);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+            INSERT INTO resume_fts (resume_fts, rowid, name, bio, skills, resume_processed_data)
+            VALUES ('delete', old.id, old.name, old.bio, old.skills, old.resume_processed_data);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS users_fts_update
+        AFTER UPDATE OF name, bio, skills, resume_processed_data ON users BEGIN
+            INSERT INTO resume_fts (resume_fts, rowid, name, bio, skills, resume_processed_data)
+            VALUES ('delete', old.id, old.name, old.bio, old.skills, old.resume_processed_data);
+            INSERT INTO resume_fts (rowid, name, bio, skills, resume_processed_data)
+            VALUES (new.id, new.name, new.bio, new.skills, new.resume_processed_data);
+        END
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS readme_fts USING fts5(
+            content,
+            content='github_readmes', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS github_readmes_fts_insert AFTER INSERT ON github_readmes BEGIN
+            INSERT INTO readme_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS github_readmes_fts_delete AFTER DELETE ON github_readmes BEGIN
+            INSERT INTO readme_fts (readme_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS github_readmes_fts_update AFTER UPDATE OF content ON github_readmes BEGIN
+            INSERT INTO readme_fts (readme_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO readme_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        ''',
+        # Index rows that existed before the triggers
+        "INSERT INTO resume_fts (resume_fts) VALUES ('rebuild')",
+        "INSERT INTO readme_fts (readme_fts) VALUES ('rebuild')",
+    ]),
+    Migration(5, "One jobs_cache row per source", [
+        "DELETE FROM jobs_cache WHERE id NOT IN (SELECT MAX(id) FROM jobs_cache GROUP BY source)",
+        create_index("idx_jobs_cache_source", "jobs_cache", "source", unique=True),
+    ]),
+    Migration(6, "Normalized jobs table fed by background ingestion", [
+        '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_key TEXT UNIQUE NOT NULL, -- stable hash of source + listing identity
+            source TEXT NOT NULL, -- remoteok, gemini
+            title TEXT NOT NULL,
+            company TEXT,
+            location TEXT,
+            tags TEXT, -- JSON array
+            apply_url TEXT,
+            description TEXT,
+            salary TEXT,
+            posted_at TEXT, -- as reported by the source
+            content_hash TEXT,
+            first_seen_at TIMESTAMP NOT NULL,
+            last_seen_at TIMESTAMP NOT NULL,
+            expires_at TIMESTAMP NOT NULL -- pushed forward every time the listing is seen again
+        )
+        ''',
+        create_index("idx_jobs_source_expires", "jobs", "source, expires_at"),
+        create_index("idx_jobs_expires", "jobs", "expires_at"),
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+            title, company, tags, description,
+            content='jobs', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO job_fts (rowid, title, company, tags, description)
+            VALUES (new.id, new.title, new.company, new.tags, new.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO job_fts (job_fts, rowid, title, company, tags, description)
+            VALUES ('delete', old.id, old.title, old.company, old.tags, old.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF title, company, tags, description ON jobs BEGIN
+            INSERT INTO job_fts (job_fts, rowid, title, company, tags, description)
+            VALUES ('delete', old.id, old.title, old.company, old.tags, old.description);
+            INSERT INTO job_fts (rowid, title, company, tags, description)
+            VALUES (new.id, new.title, new.company, new.tags, new.description);
+        END
+        ''',
+    ]),
+    Migration(7, "Job fingerprints, MinHash band index and canonical links for deduplication", [
+        add_column("jobs", "fingerprint", "TEXT"),  # normalized title + company
+        add_column("jobs", "url_key", "TEXT"),  # normalized apply_url
+        add_column("jobs", "company_key", "TEXT"),
+        add_column("jobs", "minhash", "BLOB"),  # packed uint32 signature of description shingles
+        add_column("jobs", "canonical_id", "INTEGER"),  # NULL when the job is canonical itself
+        create_index("idx_jobs_fingerprint", "jobs", "fingerprint"),
+        create_index("idx_jobs_url_key", "jobs", "url_key"),
+        create_index("idx_jobs_canonical", "jobs", "canonical_id"),
+        # LSH buckets: (band_key, job_id) primary key is the bucket -> jobs posting list
+        '''
+        CREATE TABLE IF NOT EXISTS job_minhash_bands (
+            band_key TEXT NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (band_key, job_id),
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        ''',
+        create_index("idx_job_minhash_bands_job", "job_minhash_bands", "job_id"),
+        # Existing jobs are keyed and linked by migration 15 (needs its title_key column)
+    ]),
+    Migration(8, "Stored job classifier labels (seniority, role, stack)", [
+        # (facet, label, job_id) primary key doubles as the label -> jobs posting list
+        '''
+        CREATE TABLE IF NOT EXISTS job_labels (
+            facet TEXT NOT NULL,
+            label TEXT NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (facet, label, job_id),
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        ''',
+        create_index("idx_job_labels_job", "job_labels", "job_id"),
+        backfill_job_labels,
+    ]),
+    Migration(9, "Keyset index for the swipe feed", [
+        create_index("idx_jobs_feed_order", "jobs", "first_seen_at, id"),
+    ]),
+    Migration(10, "Per-user applied/dismissed jobs for feed filtering", [
+        # (user_id, job_fingerprint) primary key is the membership lookup
+        '''
+        CREATE TABLE IF NOT EXISTS user_job_exclusions (
+            user_id INTEGER NOT NULL,
+            job_fingerprint TEXT NOT NULL,
+            action TEXT NOT NULL,
+            job_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, job_fingerprint),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        ''',
+        add_column("job_applications", "job_id", "INTEGER"),
+        backfill_job_exclusions,
+    ]),
+    Migration(11, "Durable resume processing job queue", [
+        '''
+        CREATE TABLE IF NOT EXISTS resume_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            resume_path TEXT NOT NULL,
+            dedup_key TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_after TEXT NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            finished_at TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        # At most one queued/running job per resume; also the claim scan
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_resume_jobs_active
+        ON resume_jobs(dedup_key) WHERE status IN ('queued', 'running')
+        ''',
+        create_index("idx_resume_jobs_claim", "resume_jobs", "status, run_after"),
+        create_index("idx_resume_jobs_user", "resume_jobs", "user_id"),
+    ]),
+    Migration(12, "Content-addressed resume files and extraction cache", [
+        # One row per distinct resume file; ref_count counts the users pointing at it
+        '''
+        CREATE TABLE IF NOT EXISTS resume_blobs (
+            content_hash TEXT PRIMARY KEY,
+            file_path TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS resume_texts (
+            content_hash TEXT PRIMARY KEY,
+            extracted_text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS resume_analyses (
+            content_hash TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            model TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, prompt_version, model)
+        ) WITHOUT ROWID
+        ''',
+        add_column("users", "resume_hash", "TEXT"),
+        backfill_resume_blobs,
+    ]),
+    Migration(13, "Apply URL in job fingerprints; relink duplicates and exclusions", [
+        create_index("idx_jobs_company_key", "jobs", "company_key"),
+        # The relink ran here without resetting old links, which could make a canonical job point
+        # at itself; migration 15 redoes it from scratch
+    ]),
+    Migration(14, "Reclassify jobs with role-qualified associate/lead seniority patterns", [
+        backfill_job_labels,
+    ]),
+    Migration(15, "Indexed title key for same-role dedup; relink jobs from scratch", [
+        add_column("jobs", "title_key", "TEXT"),  # normalized title
+        "DROP INDEX IF EXISTS idx_jobs_company_key",
+        create_index("idx_jobs_company_title", "jobs", "company_key, title_key"),
+        backfill_job_dedup,
+        backfill_job_exclusions,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    """Return the version recorded in schema_version (0 for a fresh database)"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor = await db.execute("SELECT MAX(version) FROM schema_version")
+    row = await cursor.fetchone()
+    return row[0] or 0
+
+
+async def migrate(db: aiosqlite.Connection) -> List[int]:
+    """Apply pending migrations in order and return the versions applied.
+
+    Startup cost when the schema is current is a single version lookup.
+    Each migration runs in its own IMMEDIATE transaction and the version is
+    re-read inside it, so concurrently starting workers apply it only once.
+    """
+    if await get_schema_version(db) >= LATEST_VERSION:
+        return []
+
+    applied = []
+    for migration in MIGRATIONS:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            if await get_schema_version(db) >= migration.version:
+                await db.rollback()
+                continue
+
+            await migration.apply(db)
+            await db.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.error(f"Schema migration {migration.version} ({migration.description}) failed")
+            raise
+
+        applied.append(migration.version)
+        logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+
+    return applied
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection becomes free within the wait timeout"""
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived aiosqlite connections"""
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 5,
+        timeout: float = 10.0,
+        on_connect: Optional[Callable[[aiosqlite.Connection], Awaitable[None]]] = None,
+        name: str = "pool",
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.on_connect = on_connect
+        self.name = name
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._connections: List[aiosqlite.Connection] = []
+        self._open_lock = asyncio.Lock()
+        self._closed = True
+
+        # Checkout metrics
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.hold_time_total = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        if self.on_connect:
+            await self.on_connect(conn)
+        return conn
+
+    async def open(self):
+        """Open every connection in the pool"""
+        async with self._open_lock:
+            if not self._closed:
+                return
+
+            self._idle = asyncio.Queue(maxsize=self.size)
+            try:
+                for _ in range(self.size):
+                    conn = await self._connect()
+                    self._connections.append(conn)
+                    self._idle.put_nowait(conn)
+            except Exception:
+                for conn in self._connections:
+                    await conn.close()
+                self._connections = []
+                raise
+
+            self._closed = False
+            logger.info(f"Opened {self.name} with {self.size} connection(s) to {self.db_path}")
+
+    async def close(self):
+        """Close every connection; connections still checked out are closed on release"""
+        async with self._open_lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            while not self._idle.empty():
+                conn = self._idle.get_nowait()
+                await conn.close()
+                self._connections.remove(conn)
+
+            logger.info(f"Closed {self.name}")
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a connection, waiting at most `timeout` seconds for one to free up"""
+        if self._closed:
+            # Scripts and background jobs may use the manager outside the app lifespan
+            await self.open()
+
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            self.waits += 1
+            try:
+                conn = await asyncio.wait_for(self._idle.get(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise PoolTimeoutError(
+                    f"Timed out after {self.timeout}s waiting for a {self.name} connection"
+                )
+
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+        checked_out_at = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            self.hold_time_total += time.perf_counter() - checked_out_at
+            await self._release(conn)
+
+    async def _release(self, conn: aiosqlite.Connection):
+        # Never hand a connection with a half-finished transaction to the next caller
+        try:
+            if conn.in_transaction:
+                await conn.rollback()
+        except Exception as e:
+            logger.warning(f"Discarding broken {self.name} connection: {e}")
+            self._connections.remove(conn)
+            await self._safe_close(conn)
+            if self._closed:
+                return
+            try:
+                conn = await self._connect()
+            except Exception as e:
+                logger.error(f"Failed to replace {self.name} connection: {e}")
+                return
+            self._connections.append(conn)
+
+        if self._closed:
+            self._connections.remove(conn)
+            await self._safe_close(conn)
+        else:
+            self._idle.put_nowait(conn)
+
+    async def _safe_close(self, conn: aiosqlite.Connection):
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool size and checkout metrics"""
+        idle = self._idle.qsize() if self._idle and not self._closed else 0
+        return {
+            "name": self.name,
+            "open": not self._closed,
+            "size": self.size,
+            "idle": idle,
+            "in_use": self.size - idle if not self._closed else 0,
+            "wait_timeout": self.timeout,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "wait_time_avg_ms": (self.wait_time_total / self.checkouts * 1000) if self.checkouts else 0.0,
+            "wait_time_max_ms": self.wait_time_max * 1000,
+            "hold_time_avg_ms": (self.hold_time_total / self.checkouts * 1000) if self.checkouts else 0.0,
+        }
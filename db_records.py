@@ -0,0 +1,121 @@
+import json
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Tuple
+
+# Columns of the users table stored as JSON text
+USER_JSON_FIELDS = (
+    'job_types', 'job_functions', 'industries', 'preferred_roles',
+    'work_mode', 'preferred_locations', 'key_technologies',
+    'programming_languages', 'frameworks_libraries', 'tools_platforms',
+    'soft_skills', 'languages', 'preferred_communication',
+    'company_size_preference', 'team_dynamics', 'work_culture_keywords',
+    'ai_extracted_skills', 'ai_extracted_experience', 'ai_extracted_education',
+    'ai_extracted_certifications', 'preferences'
+)
+
+# JSON fields that hold objects (proficiency maps) rather than arrays
+USER_JSON_DICT_FIELDS = frozenset({'programming_languages', 'frameworks_libraries', 'tools_platforms', 'languages'})
+
+# Aggregated child rows added by the profile hydration query (always valid JSON arrays)
+PROFILE_CHILD_FIELDS = ('education', 'certifications', 'work_experience', 'internships')
+
+_JSON_FIELDS = frozenset(USER_JSON_FIELDS) | frozenset(PROFILE_CHILD_FIELDS)
+_DELETED = object()
+
+# Compiled column layouts, keyed by the column names of a result set
+_layouts: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+
+def decode_user_field(field: str, raw: Any) -> Any:
+    """Decode a JSON column the same way for every users query"""
+    if not raw:
+        return {} if field in USER_JSON_DICT_FIELDS else []
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+def encode_user_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize JSON columns of a users update/insert payload"""
+    return {
+        key: (json.dumps(value) if value is not None else None) if key in USER_JSON_FIELDS else value
+        for key, value in data.items()
+    }
+
+
+class UserRecord(MutableMapping):
+    """Dict-like users row that decodes JSON columns on first access and caches the result"""
+
+    __slots__ = ('_layout', '_row', '_data')
+
+    def __init__(self, layout: Dict[str, int], row: tuple):
+        self._layout = layout
+        self._row = row
+        self._data: Dict[str, Any] = {}
+
+    @classmethod
+    def row_factory(cls, cursor, row: tuple) -> 'UserRecord':
+        """sqlite3 row factory; register it on cursors that select from users"""
+        names = tuple(description[0] for description in cursor.description)
+        layout = _layouts.get(names)
+        if layout is None:
+            layout = _layouts[names] = {name: index for index, name in enumerate(names)}
+        return cls(layout, row)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data.get(key, _DELETED)
+        if value is not _DELETED:
+            return value
+        if key in self._data or key not in self._layout:
+            raise KeyError(key)
+
+        value = self._row[self._layout[key]]
+        if key in _JSON_FIELDS:
+            value = self._data[key] = decode_user_field(key, value)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self._data[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self._data[key] = _DELETED
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._data:
+            return self._data[key] is not _DELETED
+        return key in self._layout
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._layout:
+            if key in self:
+                yield key
+        for key, value in self._data.items():
+            if key not in self._layout and value is not _DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> 'UserRecord':
+        """Shallow copy sharing the raw row and already-decoded values"""
+        record = UserRecord(self._layout, self._row)
+        record._data = dict(self._data)
+        return record
+
+    def approx_size(self) -> int:
+        """Rough memory footprint in bytes, used for cache accounting"""
+        size = 64 + 16 * len(self._row)
+        for value in self._row:
+            if isinstance(value, (str, bytes)):
+                size += len(value)
+        return size
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decoded plain dict copy"""
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"UserRecord(id={self.get('id')!r}, email={self.get('email')!r})"
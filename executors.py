@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# CPU-bound crypto (bcrypt, Fernet) executor configuration
+CRYPTO_EXECUTOR_WORKERS = int(os.getenv("CRYPTO_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+CRYPTO_EXECUTOR_QUEUE_DEPTH = int(os.getenv("CRYPTO_EXECUTOR_QUEUE_DEPTH", "64"))
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a bounded executor's queue is full"""
+
+
+def _timed_call(func: Callable, args: tuple, kwargs: dict):
+    # Module-level so it can also be pickled into process pools
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return started, time.perf_counter(), result
+
+
+class BoundedExecutor:
+    """Runs blocking callables off the event loop with a bounded queue and timing metrics"""
+
+    def __init__(self, max_workers: int, queue_depth: int, name: str = "executor",
+                 executor: Optional[Executor] = None):
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.name = name
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._in_flight = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.compute_total = 0.0
+        self.compute_max = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) in the pool; raises ExecutorBusyError when the queue is full"""
+        if self._in_flight >= self.max_workers + self.queue_depth:
+            self.rejected += 1
+            raise ExecutorBusyError(f"{self.name} is saturated ({self._in_flight} tasks in flight)")
+
+        self._in_flight += 1
+        self.submitted += 1
+        submitted_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(_timed_call, func, args, kwargs)
+        except BaseException:
+            self._in_flight -= 1
+            raise
+        # The slot stays taken until the call really finishes, even if the caller stops waiting
+        future.add_done_callback(lambda _: self._release_from(loop))
+        try:
+            started, finished, result = await asyncio.wrap_future(future)
+        except Exception:
+            self.failed += 1
+            raise
+
+        queue_wait = started - submitted_at
+        compute = finished - started
+        self.completed += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.compute_total += compute
+        self.compute_max = max(self.compute_max, compute)
+        return result
+
+    def _release_from(self, loop: asyncio.AbstractEventLoop):
+        # Done callbacks run on a pool thread; the counter belongs to the loop
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _release(self):
+        self._in_flight -= 1
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait_avg_ms": (self.queue_wait_total / self.completed * 1000) if self.completed else 0.0,
+            "queue_wait_max_ms": self.queue_wait_max * 1000,
+            "compute_avg_ms": (self.compute_total / self.completed * 1000) if self.completed else 0.0,
+            "compute_max_ms": self.compute_max * 1000,
+        }
+
+
+# Shared executor for CPU-bound crypto
+crypto_executor = BoundedExecutor(CRYPTO_EXECUTOR_WORKERS, CRYPTO_EXECUTOR_QUEUE_DEPTH, name="crypto")
@@ -0,0 +1,50 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+async def gather_with_deadlines(
+    calls: Dict[str, Callable[[], Awaitable[Any]]],
+    deadlines: Optional[Dict[str, float]] = None,
+    global_deadline: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Run calls concurrently and report each one's outcome instead of raising.
+
+    A call is cancelled when it misses its own deadline (seconds) or the
+    global one, whichever comes first, so total latency is bounded by
+    `global_deadline`. Each outcome has `status` ("ok", "timeout" or
+    "error"), `result`, `error` and `elapsed_ms`.
+    """
+    deadlines = deadlines or {}
+    outcomes: Dict[str, Dict[str, Any]] = {}
+
+    async def run(name: str, call: Callable[[], Awaitable[Any]]):
+        started = time.perf_counter()
+        outcome = {"status": "ok", "result": None, "error": None, "elapsed_ms": 0.0}
+        outcomes[name] = outcome
+        try:
+            outcome["result"] = await asyncio.wait_for(call(), deadlines.get(name))
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            outcome["status"] = "timeout"
+            outcome["error"] = "Deadline exceeded"
+        except Exception as e:
+            outcome["status"] = "error"
+            outcome["error"] = getattr(e, "detail", None) or str(e)
+        finally:
+            outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    tasks = [asyncio.create_task(run(name, call)) for name, call in calls.items()]
+    if not tasks:
+        return outcomes
+
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=global_deadline)
+    finally:
+        # Also reached when the caller itself is cancelled; never leave calls running
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+    if pending:
+        # run() records the timeout itself once the cancellation lands
+        await asyncio.wait(pending)
+    return outcomes
@@ -0,0 +1,163 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from database import db_manager
+from job_membership import job_membership
+from ttl_cache import LRUCache
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Swipe feed configuration
+FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", "20"))
+FEED_MAX_PAGE_SIZE = int(os.getenv("FEED_MAX_PAGE_SIZE", "100"))
+FEED_PREFETCH_TTL = float(os.getenv("FEED_PREFETCH_TTL", "120"))
+FEED_PREFETCH_MAX_PAGES = int(os.getenv("FEED_PREFETCH_MAX_PAGES", "1024"))
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a feed cursor can't be decoded"""
+
+
+def encode_cursor(job: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just after `job` in feed order"""
+    payload = json.dumps([job['first_seen_at'], job['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        first_seen_at, job_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(first_seen_at, str) or not isinstance(job_id, int):
+            raise ValueError("bad cursor payload")
+        return first_seen_at, job_id
+    except Exception as e:
+        raise InvalidCursorError("Invalid feed cursor") from e
+
+
+class FeedService:
+    """Keyset-paginated job feed that loads the next page while the current one is swiped.
+
+    Pages are read with a (first_seen_at, id) seek on an index, so page N
+    costs the same as page 1. After serving a page the next one is loaded
+    in the background and parked in a small TTL cache for the follow-up
+    request; a request arriving while that load is in flight joins it.
+    Jobs the user already applied to or dismissed are skipped.
+    """
+
+    def __init__(self, prefetch_ttl: float = FEED_PREFETCH_TTL, max_pages: int = FEED_PREFETCH_MAX_PAGES):
+        self.prefetched = LRUCache(max_entries=max_pages, ttl=prefetch_ttl, name="feed_prefetch")
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+
+        self.pages_served = 0
+        self.prefetch_hits = 0
+        self.prefetch_joins = 0
+        self.prefetch_failures = 0
+        self.jobs_excluded = 0
+
+    @staticmethod
+    def _key(user_id: int, cursor: Optional[str], page_size: int, filters: Dict[str, List[str]]) -> tuple:
+        return (user_id, cursor, page_size, json.dumps(filters, sort_keys=True))
+
+    async def get_page(self, user_id: int, cursor: Optional[str] = None, page_size: int = FEED_PAGE_SIZE,
+                       filters: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """Return {"jobs", "next_cursor"}; next_cursor is None at the end of the feed"""
+        filters = filters or {}
+        page_size = min(max(page_size, 1), FEED_MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+        key = self._key(user_id, cursor, page_size, filters)
+
+        page = self.prefetched.get(key)
+        if page is not None:
+            self.prefetch_hits += 1
+            self.prefetched.invalidate(key)
+        elif key in self._inflight:
+            self.prefetch_joins += 1
+            page = await asyncio.shield(self._inflight[key])
+            self.prefetched.invalidate(key)
+        else:
+            page = None
+
+        if page is not None:
+            # Loaded ahead of the user's latest swipes; drop jobs swiped since
+            page = {**page, "jobs": await self._drop_seen(user_id, page["jobs"])}
+        else:
+            page = await self._load(user_id, page_size, filters, after)
+
+        self.pages_served += 1
+        if page["next_cursor"]:
+            self._start_prefetch(user_id, page["next_cursor"], page_size, filters)
+        return page
+
+    async def _load(self, user_id: int, page_size: int, filters: Dict[str, List[str]],
+                    after: Optional[Tuple[str, int]]) -> Dict[str, Any]:
+        # One extra row tells whether another page exists without a COUNT; batches
+        # repeat from the last row read until excluded jobs are made up for
+        jobs: List[Dict[str, Any]] = []
+        while len(jobs) <= page_size:
+            batch = await db_manager.get_jobs(limit=page_size + 1, filters=filters, after=after)
+            jobs.extend(await self._drop_seen(user_id, batch))
+            if len(batch) <= page_size:
+                break
+            after = (batch[-1]['first_seen_at'], batch[-1]['id'])
+
+        has_more = len(jobs) > page_size
+        jobs = jobs[:page_size]
+        return {"jobs": jobs, "next_cursor": encode_cursor(jobs[-1]) if has_more else None}
+
+    async def _drop_seen(self, user_id: int, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Jobs without the ones the user applied to or dismissed"""
+        seen = await job_membership.seen(user_id, [job['fingerprint'] for job in jobs])
+        if not seen:
+            return jobs
+        kept = [job for job in jobs if job['fingerprint'] not in seen]
+        self.jobs_excluded += len(jobs) - len(kept)
+        return kept
+
+    def _start_prefetch(self, user_id: int, cursor: str, page_size: int, filters: Dict[str, List[str]]):
+        key = self._key(user_id, cursor, page_size, filters)
+        if key in self.prefetched or key in self._inflight:
+            return
+
+        async def prefetch():
+            try:
+                page = await self._load(user_id, page_size, filters, decode_cursor(cursor))
+                self.prefetched.set(key, page)
+                return page
+            except Exception:
+                self.prefetch_failures += 1
+                raise
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(prefetch())
+        task.add_done_callback(self._log_prefetch_failure)
+        self._inflight[key] = task
+
+    def _log_prefetch_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Feed prefetch failed: {task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pages_served": self.pages_served,
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_joins": self.prefetch_joins,
+            "prefetch_failures": self.prefetch_failures,
+            "jobs_excluded": self.jobs_excluded,
+            "prefetch_in_flight": len(self._inflight),
+            "prefetched": self.prefetched.get_stats(),
+        }
+
+
+# Global feed service instance
+feed_service = FeedService()
@@ -1,12 +1,17 @@
 import os
 import uuid
 import shutil
+import asyncio
+import hashlib
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 from typing import Optional
 
+from database import db_manager
+
 RESUME_UPLOAD_DIR = "uploaded_resumes"
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes held in memory per upload while saving
 ALLOWED_EXTENSIONS = {".pdf", ".tex", ".txt", ".doc", ".docx"}
 
 class FileManager:
@@ -40,33 +45,85 @@ class FileManager:
                     detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
                 )
             
-            # Check file size
-            file_content = await file.read()
-            if len(file_content) > MAX_FILE_SIZE:
+            # Reject early when the client declared the size
+            if file.size is not None and file.size > MAX_FILE_SIZE:
                 raise HTTPException(
                     status_code=400, 
                     detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
                 )
             
-            # Generate unique filename
-            unique_filename = self.generate_unique_filename(file.filename)
-            file_path = os.path.join(self.upload_dir, unique_filename)
+            temp_path, content_hash, file_size = await self._stream_to_temp(file)
+            
+            # Store by content hash: identical uploads share one file. A last-reference release
+            # deletes the file before committing, so once we hold a reference an existing file stays
+            try:
+                blob = await db_manager.acquire_resume_blob(
+                    content_hash, os.path.join(self.upload_dir, f"{content_hash}{ext}"), file_size
+                )
+            except Exception:
+                self.delete_resume(temp_path)
+                raise
+            file_path = blob["file_path"]
             
-            # Save file
-            with open(file_path, "wb") as buffer:
-                buffer.write(file_content)
+            if os.path.exists(file_path):
+                self.delete_resume(temp_path)
+            else:
+                try:
+                    os.replace(temp_path, file_path)
+                except Exception:
+                    self.delete_resume(temp_path)
+                    await self.release_resume(content_hash)
+                    raise
             
             return {
                 "original_filename": file.filename,
-                "saved_filename": unique_filename,
+                "saved_filename": os.path.basename(file_path),
                 "file_path": file_path,
-                "file_size": len(file_content),
+                "file_size": file_size,
+                "content_hash": content_hash,
+                "deduplicated": blob["ref_count"] > 1,
                 "user_email": user_email
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
+    async def _stream_to_temp(self, file: UploadFile) -> tuple:
+        """Copy an upload to a temp file chunk by chunk, hashing as it goes.
+
+        Returns (temp_path, sha256, size). Raises a 400 as soon as the size limit
+        is passed; file writes run in a thread so the event loop never blocks on disk.
+        """
+        temp_path = os.path.join(self.upload_dir, f".upload_{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        buffer = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
+                    )
+                digest.update(chunk)
+                await asyncio.to_thread(buffer.write, chunk)
+            await asyncio.to_thread(buffer.close)
+        except BaseException:
+            buffer.close()
+            self.delete_resume(temp_path)
+            raise
+        return temp_path, digest.hexdigest(), size
+    
+    async def release_resume(self, content_hash: str) -> bool:
+        """Drop one reference to a stored resume; the file is deleted with its last reference"""
+        return await db_manager.release_resume_blob(content_hash, self.delete_resume)
+    
     def delete_resume(self, file_path: str) -> bool:
         """Delete resume file"""
         try:
@@ -179,17 +179,47 @@ const Profile = ({ userData, onBack, onUpdate }) => {
         return
       }
 
-      if (response.ok) {
-        const result = await response.json()
-        setResumeData(result.processed_data)
-        onUpdate(result.user) // Update parent component with new data
-        sessionManager.updateUser(result.user) // Update session storage
-        fetchProjects() // Refresh projects after processing
-        alert('Resume processed successfully! Check your profile for extracted information.')
-      } else {
+      if (!response.ok) {
         const error = await response.json()
         throw new Error(error.detail || 'Failed to process resume')
       }
+
+      // Processing runs in the background; poll the job until it finishes
+      const { job_id } = await response.json()
+      let job
+      do {
+        await new Promise(resolve => setTimeout(resolve, 2000))
+        const statusResponse = await fetch(`${API_BASE_URL}/jobs/status/${job_id}`, {
+          headers: sessionManager.getAuthHeaders()
+        })
+        if (!statusResponse.ok) {
+          throw new Error('Failed to check resume processing status')
+        }
+        job = await statusResponse.json()
+      } while (job.status === 'queued' || job.status === 'running')
+
+      if (job.status !== 'succeeded') {
+        throw new Error(job.error || 'Failed to process resume')
+      }
+
+      const profileResponse = await fetch(`${API_BASE_URL}/users/profile/${userData.id}`, {
+        headers: sessionManager.getAuthHeaders()
+      })
+      const { user } = await profileResponse.json()
+      // Superseded or deduplicated jobs finish without data: fall back to what the profile holds
+      if (job.result?.processed_data) {
+        setResumeData(job.result.processed_data)
+      } else if (user.resume_processed_data) {
+        try {
+          setResumeData(JSON.parse(user.resume_processed_data))
+        } catch (error) {
+          console.error('Error parsing resume data:', error)
+        }
+      }
+      onUpdate(user) // Update parent component with new data
+      sessionManager.updateUser(user) // Update session storage
+      fetchProjects() // Refresh projects after processing
+      alert('Resume processed successfully! Check your profile for extracted information.')
     } catch (error) {
       console.error('Error processing resume:', error)
       alert('Failed to process resume: ' + error.message)
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from google import genai
+from google.genai import errors
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+# Gateway limits: concurrent model calls, seconds per attempt, retry policy
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1"))
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "16"))
+
+# HTTP statuses worth another attempt (rate limit, transient server errors)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class GeminiUnavailableError(RuntimeError):
+    """Raised when no Gemini API key is configured"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS
+    return isinstance(error, (asyncio.TimeoutError, httpx.TransportError))
+
+
+def strip_code_fence(text: str) -> str:
+    """Model output without a surrounding ```json fence"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class GeminiGateway:
+    """Single entry point for Gemini calls from async code.
+
+    Uses the SDK's async client so a model call never blocks the event
+    loop. A semaphore caps concurrent calls, each attempt has a timeout,
+    and rate limits / transient errors are retried with exponential
+    backoff and full jitter.
+    """
+
+    def __init__(self, api_key: Optional[str] = GEMINI_API_KEY, max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+                 timeout: float = GEMINI_TIMEOUT, max_attempts: int = GEMINI_MAX_ATTEMPTS,
+                 backoff_base: float = GEMINI_BACKOFF_BASE, backoff_max: float = GEMINI_BACKOFF_MAX):
+        self.client = None
+        if not api_key or api_key == "your_gemini_api_key_here":
+            logger.warning("GEMINI_API_KEY not properly configured")
+        else:
+            try:
+                self.client = genai.Client(api_key=api_key)
+                logger.info("Gemini AI client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Gemini client: {e}")
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.errors_by_status: Dict[str, int] = {}
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def generate(self, prompt: str, model: str = GEMINI_MODEL, timeout: Optional[float] = None) -> str:
+        """Response text for a prompt ('' when the model returned nothing)"""
+        if self.client is None:
+            raise GeminiUnavailableError("Gemini API not configured")
+
+        self.calls += 1
+        for attempt in range(self.max_attempts):
+            try:
+                response = await self._attempt(prompt, model, timeout or self.timeout)
+                self.succeeded += 1
+                return response.text or ""
+            except Exception as e:
+                key = str(e.code) if isinstance(e, errors.APIError) else type(e).__name__
+                self.errors_by_status[key] = self.errors_by_status.get(key, 0) + 1
+                if not is_retryable(e) or attempt == self.max_attempts - 1:
+                    self.failed += 1
+                    raise
+                delay = self._backoff(attempt)
+                self.retries += 1
+                logger.warning(
+                    f"Gemini call failed ({key}), retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.max_attempts})"
+                )
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, prompt: str, model: str, timeout: float) -> Any:
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started = time.perf_counter()
+        queue_wait = started - queued_at
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self._in_flight += 1
+        self.attempts += 1
+        try:
+            return await asyncio.wait_for(
+                self.client.aio.models.generate_content(model=model, contents=prompt), timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors_by_status": dict(self.errors_by_status),
+            "avg_queue_wait_ms": round(self.queue_wait_total / self.attempts * 1000, 2) if self.attempts else 0.0,
+            "max_queue_wait_ms": round(self.queue_wait_max * 1000, 2),
+            "avg_latency_ms": round(self.latency_total / self.attempts * 1000, 2) if self.attempts else 0.0,
+            "max_latency_ms": round(self.latency_max * 1000, 2),
+        }
+
+
+# Global Gemini gateway instance
+gemini_gateway = GeminiGateway()
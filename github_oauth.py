@@ -10,6 +10,8 @@ from cryptography.fernet import Fernet
 from fastapi import HTTPException
 from dotenv import load_dotenv
 
+from executors import crypto_executor
+
 # Load environment variables
 load_dotenv()
 
@@ -193,13 +195,15 @@ class GitHubOAuthService:
             
             return response.json()
     
-    def encrypt_token(self, token: str) -> str:
+    async def encrypt_token(self, token: str) -> str:
         """Encrypt GitHub access token for storage"""
-        return self.cipher.encrypt(token.encode()).decode()
+        encrypted = await crypto_executor.run(self.cipher.encrypt, token.encode())
+        return encrypted.decode()
     
-    def decrypt_token(self, encrypted_token: str) -> str:
+    async def decrypt_token(self, encrypted_token: str) -> str:
         """Decrypt GitHub access token from storage"""
-        return self.cipher.decrypt(encrypted_token.encode()).decode()
+        decrypted = await crypto_executor.run(self.cipher.decrypt, encrypted_token.encode())
+        return decrypted.decode()
     
     async def validate_token(self, access_token: str) -> bool:
         """Validate if GitHub access token is still valid"""
@@ -251,12 +255,14 @@ class GitHubOAuthService:
                 
                 processed_repos.append(repo_data)
             
-            # Store in database
-            await db_manager.store_github_repos(user_id, processed_repos)
+            # Store in database (only repos whose content changed are written)
+            sync_stats = await db_manager.store_github_repos(user_id, processed_repos)
+            logger.info(f"Stored GitHub repos for user {user_id}: {sync_stats}")
             
             return {
                 'success': True,
                 'repos_count': len(processed_repos),
+                'sync_stats': sync_stats,
                 'processed_repos': processed_repos
             }
             
@@ -63,9 +63,8 @@ class GitHubSyncProcessor:
         logger.info(f"Starting GitHub sync for user {user_id}")
         
         try:
-            # Get user with GitHub info
-            user = await db_manager.get_user_profile(user_id)
-            if not user:
+            # Validate that user exists
+            if not await db_manager.user_exists(user_id):
                 raise ValueError(f"User {user_id} not found")
             
             github_info = await db_manager.get_user_github_info(user_id)
@@ -92,12 +91,7 @@ class GitHubSyncProcessor:
     
     async def _get_users_with_github(self) -> List[Dict[str, Any]]:
         """Get all users with linked GitHub accounts"""
-        # This would be implemented in the database manager
-        # For now, we'll create a simple implementation
-        
-        import aiosqlite
-        
-        async with aiosqlite.connect(db_manager.db_path) as db:
+        async with db_manager.read_pool.acquire() as db:
             cursor = await db.execute("""
                 SELECT id, github_id, github_access_token, github_username, github_oauth_linked_at
                 FROM users 
@@ -128,7 +122,7 @@ class GitHubSyncProcessor:
         try:
             # Decrypt access token
             encrypted_token = github_info['github_access_token']
-            access_token = github_oauth_service.decrypt_token(encrypted_token)
+            access_token = await github_oauth_service.decrypt_token(encrypted_token)
             
             # Validate token
             if not await github_oauth_service.validate_token(access_token):
@@ -147,6 +141,7 @@ class GitHubSyncProcessor:
                 'user_id': user_id,
                 'success': result['success'],
                 'repos_count': result.get('repos_count', 0),
+                'sync_stats': result.get('sync_stats'),
                 'error': result.get('error')
             }
             
@@ -170,7 +165,7 @@ class GitHubSyncProcessor:
                 try:
                     github_info = user['github_info']
                     encrypted_token = github_info['github_access_token']
-                    access_token = github_oauth_service.decrypt_token(encrypted_token)
+                    access_token = await github_oauth_service.decrypt_token(encrypted_token)
                     
                     # Check if token is valid
                     if not await github_oauth_service.validate_token(access_token):
@@ -247,6 +242,9 @@ async def run_background_tasks():
     except Exception as e:
         logger.error(f"Error in background tasks: {e}")
         raise
+    finally:
+        # Pooled connections keep worker threads alive; release them on exit
+        await db_manager.close()
 
 if __name__ == "__main__":
     # For testing purposes
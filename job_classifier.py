@@ -0,0 +1,163 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Optional JSON file overriding the taxonomy, same shape as DEFAULT_TAXONOMY
+JOB_TAXONOMY_PATH = os.getenv("JOB_TAXONOMY_PATH", "")
+
+# facet -> label -> patterns. Patterns are regex fragments matched case-insensitively
+# on whole words, so "intern" doesn't match "internal".
+DEFAULT_TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "seniority": {
+        "intern": [r"intern", r"interns", r"internship", r"internships", r"co-?op", r"trainee", r"werkstudent"],
+        # "associate" and "lead" only count next to a role noun ("Associate Director" isn't junior)
+        "junior": [r"junior", r"jr\.?", r"associate (?:software |data )?(?:engineer|developer|analyst)s?"],
+        "entry_level": [r"entry[- ]?level", r"graduate", r"new[- ]grad", r"grad", r"early[- ]career", r"apprentice(?:ship)?"],
+        "mid": [r"mid[- ]?level", r"intermediate"],
+        "senior": [r"senior", r"sr\.?", r"staff", r"principal", r"(?:tech|team) lead",
+                   r"lead (?:software |data )?(?:engineer|developer)s?"],
+    },
+    "role": {
+        "frontend": [r"front[- ]?end", r"ui engineer", r"web developer"],
+        "backend": [r"back[- ]?end", r"api engineer", r"server[- ]side"],
+        "fullstack": [r"full[- ]?stack"],
+        "mobile": [r"mobile", r"ios", r"android", r"flutter", r"react native"],
+        "data": [r"data (?:engineer|analyst|scientist)", r"analytics", r"data science"],
+        "ml": [r"machine learning", r"ml", r"ai", r"deep learning", r"nlp", r"computer vision"],
+        "devops": [r"devops", r"sre", r"site reliability", r"platform engineer", r"infrastructure", r"cloud engineer"],
+        "qa": [r"qa", r"quality assurance", r"test(?:ing)? engineer", r"sdet"],
+        "security": [r"security", r"appsec", r"infosec"],
+        "design": [r"designer", r"ux", r"product design"],
+    },
+    "stack": {
+        "python": [r"python", r"django", r"flask", r"fastapi"],
+        "javascript": [r"javascript", r"js", r"node(?:\.?js)?"],
+        "typescript": [r"typescript", r"ts"],
+        "react": [r"react(?:\.?js)?"],
+        "vue": [r"vue(?:\.?js)?"],
+        "angular": [r"angular"],
+        "java": [r"java", r"spring"],
+        "go": [r"golang"],
+        "rust": [r"rust"],
+        "ruby": [r"ruby", r"rails"],
+        "php": [r"php", r"laravel"],
+        "csharp": [r"c#", r"\.net", r"dotnet"],
+        "cpp": [r"c\+\+"],
+        "sql": [r"sql", r"postgres(?:ql)?", r"mysql"],
+        "aws": [r"aws", r"amazon web services"],
+        "kubernetes": [r"kubernetes", r"k8s", r"docker"],
+    },
+}
+
+# Seniority labels that count as intern/junior roles for the RemoteOK filter
+ENTRY_LEVEL_SENIORITY = {"intern", "junior", "entry_level"}
+
+# Which parts of a listing each facet is read from
+FACET_FIELDS = {
+    "seniority": ("title",),
+    "role": ("title", "tags"),
+    "stack": ("title", "tags", "description"),
+}
+
+# Word boundaries that also treat + # . as word characters (c++, c#, .net)
+_BEFORE = r"(?<![\w+#.])"
+_AFTER = r"(?![\w+#])"
+
+
+def load_taxonomy(path: str = JOB_TAXONOMY_PATH) -> Dict[str, Dict[str, List[str]]]:
+    """Default taxonomy, with facets from the JSON file at `path` replacing the defaults"""
+    taxonomy = {facet: dict(labels) for facet, labels in DEFAULT_TAXONOMY.items()}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            taxonomy.update(json.load(f))
+    return taxonomy
+
+
+class JobClassifier:
+    """Labels listings with one regex per facet compiled from the taxonomy.
+
+    Every pattern of a facet becomes a named alternative of a single
+    compiled regex, so a listing is classified in one scan per facet
+    instead of one substring check per term.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]]):
+        self.taxonomy = taxonomy
+        self._patterns: Dict[str, re.Pattern] = {}
+        self._group_labels: Dict[str, Dict[str, str]] = {}
+
+        for facet, labels in taxonomy.items():
+            alternatives = []
+            group_labels = {}
+            for label, patterns in labels.items():
+                group = f"g{len(group_labels)}"
+                group_labels[group] = label
+                alternatives.append(f"(?P<{group}>{'|'.join(f'(?:{p})' for p in patterns)})")
+            self._patterns[facet] = re.compile(f"{_BEFORE}(?:{'|'.join(alternatives)}){_AFTER}", re.IGNORECASE)
+            self._group_labels[facet] = group_labels
+
+    def classify_text(self, facet: str, text: str) -> List[str]:
+        """Labels of one facet found in text, in order of first appearance"""
+        labels = self._group_labels[facet]
+        return list(dict.fromkeys(labels[match.lastgroup] for match in self._patterns[facet].finditer(text or '')))
+
+    def classify(self, job: Dict[str, Any]) -> Dict[str, List[str]]:
+        """facet -> labels for a structured job"""
+        result = {}
+        for facet in self._patterns:
+            fields = FACET_FIELDS.get(facet, ("title", "tags", "description"))
+            text = ' \n '.join(_field_text(job.get(field)) for field in fields)
+            result[facet] = self.classify_text(facet, text)
+        return result
+
+    def is_entry_level(self, title: str) -> bool:
+        return bool(ENTRY_LEVEL_SENIORITY.intersection(self.classify_text("seniority", title)))
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, list):
+        return ' , '.join(str(item) for item in value)
+    return value if isinstance(value, str) else ''
+
+
+async def sync_job_labels(db: aiosqlite.Connection, job_id: int, labels: Dict[str, List[str]]):
+    """Replace the stored labels of a job (caller commits)"""
+    await db.execute("DELETE FROM job_labels WHERE job_id = ?", (job_id,))
+    await db.executemany(
+        "INSERT OR IGNORE INTO job_labels (facet, label, job_id) VALUES (?, ?, ?)",
+        [(facet, label, job_id) for facet, facet_labels in labels.items() for label in facet_labels]
+    )
+
+
+async def backfill_job_labels(db: aiosqlite.Connection):
+    """Migration step: classify every existing job"""
+    cursor = await db.execute("SELECT id, title, tags, description FROM jobs")
+    for job_id, title, tags, description in await cursor.fetchall():
+        job = {'title': title, 'tags': json.loads(tags or '[]'), 'description': description}
+        await sync_job_labels(db, job_id, job_classifier.classify(job))
+
+
+def label_filter_sql(filters: Dict[str, Optional[List[str]]]) -> tuple:
+    """SQL condition (alias j) and params requiring a label from every filtered facet"""
+    conditions = []
+    params: List[Any] = []
+    for facet, labels in filters.items():
+        if not labels:
+            continue
+        placeholders = ', '.join('?' for _ in labels)
+        conditions.append(
+            f"EXISTS (SELECT 1 FROM job_labels l WHERE l.facet = ? AND l.label IN ({placeholders}) AND l.job_id = j.id)"
+        )
+        params.extend([facet, *labels])
+    return ' AND '.join(conditions), params
+
+
+# Global classifier compiled from the configured taxonomy
+job_classifier = JobClassifier(load_taxonomy())
@@ -0,0 +1,241 @@
+import hashlib
+import re
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import aiosqlite
+
+# MinHash signature length and LSH banding (BANDS * ROWS == MINHASH_PERMUTATIONS).
+# With 16 bands of 4 rows, pairs above ~0.5 Jaccard similarity usually share a band.
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+
+# Estimated Jaccard similarity at which a same-company listing counts as a duplicate
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), 'big') % (_MERSENNE_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME,
+    )
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+# SQL condition (alias j, two `now` parameters) for jobs shown to users: unexpired,
+# and either canonical or a duplicate whose canonical has expired
+VISIBLE_JOB_CONDITION = (
+    "j.expires_at > ? AND (j.canonical_id IS NULL OR NOT EXISTS "
+    "(SELECT 1 FROM jobs c WHERE c.id = j.canonical_id AND c.expires_at > ?))"
+)
+
+# SQL condition (no alias; job_id, job_id, now parameters): another unexpired job not already linked to job_id
+_OTHER_JOB_CONDITION = "id != ? AND (canonical_id IS NULL OR canonical_id != ?) AND expires_at > ?"
+
+_NON_WORD = re.compile(r'[^\w+#]+', re.UNICODE)
+_COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'gmbh', 'corp', 'corporation', 'co', 'company', 'limited', 'plc'}
+_TRACKING_PARAMS = ('utm_', 'ref', 'source', 'gh_src')
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercase, punctuation-free, single-spaced form used for fingerprints and shingles"""
+    if not isinstance(text, str):
+        return ''
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def normalize_company(company: Any) -> str:
+    words = [word for word in normalize_text(company).split() if word not in _COMPANY_SUFFIXES]
+    return ' '.join(words)
+
+
+def normalize_url(url: Any) -> str:
+    """Host + path + non-tracking query, so the same posting linked twice compares equal"""
+    if not isinstance(url, str) or not url.strip():
+        return ''
+    parts = urlsplit(url.strip().lower())
+    if not parts.netloc:
+        return ''
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    query = '&'.join(
+        param for param in sorted(parts.query.split('&'))
+        if param and not param.startswith(_TRACKING_PARAMS)
+    )
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else '')
+
+
+def fingerprint(job: Dict[str, Any]) -> str:
+    """Exact-duplicate key: normalized title + company + apply URL (title + company when there's no URL)"""
+    payload = f"{normalize_text(job.get('title'))}\x1f{normalize_company(job.get('company'))}"
+    url_key = normalize_url(job.get('apply_url'))
+    if url_key:
+        payload += f"\x1f{url_key}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _shingle_hashes(job: Dict[str, Any]) -> List[int]:
+    # Titles are covered by the fingerprint; reworded duplicates mostly share description text
+    words = (normalize_text(job.get('description')) or normalize_text(job.get('title'))).split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = {' '.join(words)} if words else set()
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    ]
+
+
+def minhash_signature(job: Dict[str, Any]) -> Optional[Tuple[int, ...]]:
+    """MinHash of the description word shingles (None when there is no text)"""
+    hashes = _shingle_hashes(job)
+    if not hashes:
+        return None
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    return struct.pack(f'<{len(signature)}I', *signature)
+
+
+def unpack_signature(blob: bytes) -> Tuple[int, ...]:
+    return struct.unpack(f'<{len(blob) // 4}I', blob)
+
+
+def estimate_similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+def band_keys(signature: Sequence[int], company_key: str) -> List[str]:
+    """LSH bucket keys; the company is part of the key so only same-company listings collide"""
+    keys = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        payload = f"{company_key}\x1f{band}\x1f" + ','.join(map(str, rows))
+        keys.append(hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest())
+    return keys
+
+
+def dedup_keys(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values the jobs table stores for deduplication"""
+    signature = minhash_signature(job)
+    return {
+        'fingerprint': fingerprint(job),
+        'url_key': normalize_url(job.get('apply_url')),
+        'company_key': normalize_company(job.get('company')),
+        'minhash': pack_signature(signature) if signature else None,
+        'title_key': normalize_text(job.get('title')),
+    }
+
+
+async def find_canonical(db: aiosqlite.Connection, job_id: int, keys: Dict[str, Any], now: str) -> Optional[int]:
+    """Canonical job id an incoming job duplicates, if any.
+
+    Exact matches are single index probes on fingerprint/url_key. The same
+    title at the same company (one probe on company_key + title_key) only
+    counts when one side has no apply URL or the descriptions are near
+    duplicates, so distinct postings of one role (e.g. per location) stay
+    separate. Other near duplicates are found through the MinHash band
+    index and confirmed on the full signature, so the cost per job doesn't
+    grow with the table. Jobs already linked to `job_id` are never matched,
+    so the result is never `job_id` itself.
+    """
+    cursor = await db.execute(f"""
+        SELECT COALESCE(canonical_id, id) FROM jobs
+        WHERE fingerprint = ? AND {_OTHER_JOB_CONDITION}
+        ORDER BY id LIMIT 1
+    """, (keys['fingerprint'], job_id, job_id, now))
+    row = await cursor.fetchone()
+    if row is None and keys['url_key']:
+        cursor = await db.execute(f"""
+            SELECT COALESCE(canonical_id, id) FROM jobs
+            WHERE url_key = ? AND {_OTHER_JOB_CONDITION}
+            ORDER BY id LIMIT 1
+        """, (keys['url_key'], job_id, job_id, now))
+        row = await cursor.fetchone()
+    if row is not None:
+        return row[0]
+
+    if not keys['company_key']:
+        return None
+
+    signature = unpack_signature(keys['minhash']) if keys['minhash'] else None
+    cursor = await db.execute(f"""
+        SELECT COALESCE(canonical_id, id), url_key, minhash FROM jobs
+        WHERE company_key = ? AND title_key = ? AND {_OTHER_JOB_CONDITION}
+        ORDER BY id
+    """, (keys['company_key'], keys['title_key'], job_id, job_id, now))
+    for canonical_id, url_key, blob in await cursor.fetchall():
+        if not keys['url_key'] or not url_key:
+            return canonical_id
+        if signature and blob and estimate_similarity(signature, unpack_signature(blob)) >= NEAR_DUPLICATE_THRESHOLD:
+            return canonical_id
+
+    if signature is None:
+        return None
+
+    bands = band_keys(signature, keys['company_key'])
+    placeholders = ', '.join('?' for _ in bands)
+    cursor = await db.execute(f"""
+        SELECT j.id, COALESCE(j.canonical_id, j.id), j.minhash
+        FROM (SELECT DISTINCT job_id FROM job_minhash_bands WHERE band_key IN ({placeholders})) b
+        JOIN jobs j ON j.id = b.job_id
+        WHERE j.id != ? AND (j.canonical_id IS NULL OR j.canonical_id != ?) AND j.expires_at > ?
+        ORDER BY j.id
+    """, (*bands, job_id, job_id, now))
+    for _, canonical_id, blob in await cursor.fetchall():
+        if blob and estimate_similarity(signature, unpack_signature(blob)) >= NEAR_DUPLICATE_THRESHOLD:
+            return canonical_id
+    return None
+
+
+async def index_job(db: aiosqlite.Connection, job_id: int, keys: Dict[str, Any], assign_canonical: bool,
+                    now: str) -> Optional[int]:
+    """Store a job's dedup keys and band postings; new jobs are linked to their canonical (caller commits).
+
+    Returns the canonical id assigned, if any.
+    """
+    canonical_id = await find_canonical(db, job_id, keys, now) if assign_canonical else None
+    if assign_canonical:
+        await db.execute("""
+            UPDATE jobs SET fingerprint = ?, url_key = ?, company_key = ?, title_key = ?, minhash = ?, canonical_id = ?
+            WHERE id = ?
+        """, (keys['fingerprint'], keys['url_key'], keys['company_key'], keys['title_key'], keys['minhash'],
+              canonical_id, job_id))
+    else:
+        await db.execute("""
+            UPDATE jobs SET fingerprint = ?, url_key = ?, company_key = ?, title_key = ?, minhash = ?
+            WHERE id = ?
+        """, (keys['fingerprint'], keys['url_key'], keys['company_key'], keys['title_key'], keys['minhash'],
+              job_id))
+
+    await db.execute("DELETE FROM job_minhash_bands WHERE job_id = ?", (job_id,))
+    if keys['minhash'] and keys['company_key']:
+        await db.executemany(
+            "INSERT OR IGNORE INTO job_minhash_bands (band_key, job_id) VALUES (?, ?)",
+            [(band, job_id) for band in band_keys(unpack_signature(keys['minhash']), keys['company_key'])]
+        )
+    return canonical_id
+
+
+async def backfill_job_dedup(db: aiosqlite.Connection):
+    """Migration step: fingerprint and link every existing job from scratch, oldest first"""
+    # Stale keys and links would let a job match a later one (or one already linked to it)
+    await db.execute(
+        "UPDATE jobs SET fingerprint = NULL, url_key = NULL, company_key = NULL, title_key = NULL, "
+        "minhash = NULL, canonical_id = NULL"
+    )
+    await db.execute("DELETE FROM job_minhash_bands")
+    cursor = await db.execute("SELECT id, title, company, apply_url, description FROM jobs ORDER BY id")
+    for job_id, title, company, apply_url, description in await cursor.fetchall():
+        job = {'title': title, 'company': company, 'apply_url': apply_url, 'description': description}
+        await index_job(db, job_id, dedup_keys(job), assign_canonical=True, now='')
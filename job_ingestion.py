@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from database import db_manager
+from jobs_cache import Fetcher, jobs_cache
+from job_sources import FEED_VALIDATORS
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Set to false to serve only what is already in the jobs table (no upstream calls at all)
+JOB_INGESTION_ENABLED = os.getenv("JOB_INGESTION_ENABLED", "true").lower() == "true"
+
+# A listing expires this long after it was last seen upstream
+JOBS_EXPIRE_AFTER = timedelta(hours=float(os.getenv("JOBS_EXPIRE_AFTER_HOURS", "72")))
+
+# Expired listings are deleted after this long
+JOBS_RETENTION = timedelta(days=float(os.getenv("JOBS_RETENTION_DAYS", "30")))
+
+# Delay before retrying a source whose pull failed
+JOBS_INGEST_RETRY_DELAY = float(os.getenv("JOBS_INGEST_RETRY_DELAY", "300"))
+
+
+class JobIngestionService:
+    """Background scheduler that pulls every registered job source into the jobs table.
+
+    Each source is pulled whenever its jobs_cache entry expires, so the
+    per-source TTLs double as ingestion intervals and a restart with a
+    fresh snapshot doesn't call upstream again.
+    """
+
+    def __init__(self, expire_after: timedelta = JOBS_EXPIRE_AFTER, retention: timedelta = JOBS_RETENTION,
+                 retry_delay: float = JOBS_INGEST_RETRY_DELAY):
+        self.expire_after = expire_after
+        self.retention = retention
+        self.retry_delay = retry_delay
+
+        self.sources: Dict[str, Fetcher] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, source: str, fetch: Fetcher):
+        """Add a source; fetch returns a list of structured job dicts"""
+        self.sources[source] = fetch
+        self._status.setdefault(source, {
+            "runs": 0,
+            "failures": 0,
+            "last_ingested_at": None,
+            "last_error": None,
+            "last_stats": None,
+            "next_run_in": None,
+        })
+
+    def start(self):
+        for source in self.sources:
+            if source not in self._tasks or self._tasks[source].done():
+                self._tasks[source] = asyncio.create_task(self._run_source(source), name=f"ingest-{source}")
+        logger.info(f"Job ingestion started for: {', '.join(self.sources) or 'no sources'}")
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def ingest(self, source: str, force: bool = False) -> Dict[str, Any]:
+        """Pull one source (unless its snapshot is still fresh) and merge it into the jobs table"""
+        entry = None if force else await jobs_cache.peek(source)
+        if entry is None or time.time() >= entry["expires_at"]:
+            entry = await jobs_cache.refresh(source, self.sources[source])
+
+        seen_at = datetime.fromtimestamp(entry["fetched_at"], timezone.utc)
+        previous_seen_at = self._status[source]["last_ingested_at"]
+        if entry.get("revalidated") and previous_seen_at:
+            # Feed unchanged upstream: just extend the previous batch
+            stats = {"touched": await db_manager.touch_jobs(source, previous_seen_at, seen_at, self.expire_after)}
+        else:
+            stats = await db_manager.upsert_jobs(source, entry["data"], seen_at, self.expire_after)
+        stats["purged"] = await db_manager.purge_expired_jobs(datetime.now(timezone.utc) - self.retention)
+
+        status = self._status[source]
+        status["runs"] += 1
+        status["last_ingested_at"] = seen_at.isoformat(timespec='seconds')
+        status["last_error"] = None
+        status["last_stats"] = stats
+        logger.info(f"Ingested {source} jobs: {stats}")
+        return entry
+
+    async def _run_source(self, source: str):
+        while True:
+            try:
+                entry = await self.ingest(source)
+                delay = max(entry["expires_at"] - time.time(), 1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._status[source]["failures"] += 1
+                self._status[source]["last_error"] = str(e)
+                logger.error(f"Job ingestion for {source} failed: {e}")
+                delay = self.retry_delay
+
+            self._status[source]["next_run_in"] = round(delay, 1)
+            await asyncio.sleep(delay)
+
+    def get_source_status(self, source: str) -> Optional[Dict[str, Any]]:
+        status = self._status.get(source)
+        if status is None:
+            return None
+        return {
+            "last_ingested_at": status["last_ingested_at"],
+            "last_error": status["last_error"],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": JOB_INGESTION_ENABLED,
+            "conditional_fetch": {source: validators.get_stats() for source, validators in FEED_VALIDATORS.items()},
+            "expire_after_hours": self.expire_after.total_seconds() / 3600,
+            "retention_days": self.retention.total_seconds() / 86400,
+            "sources": {
+                source: {
+                    **status,
+                    "running": source in self._tasks and not self._tasks[source].done(),
+                }
+                for source, status in self._status.items()
+            },
+        }
+
+
+# Global job ingestion service
+job_ingestor = JobIngestionService()
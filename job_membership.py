@@ -0,0 +1,180 @@
+import hashlib
+import math
+import os
+from typing import Any, Dict, Iterable, Optional, Set
+
+from dotenv import load_dotenv
+
+from database import db_manager
+from job_dedup import fingerprint
+from ttl_cache import LRUCache
+
+# Load environment variables
+load_dotenv()
+
+# Bloom filter sizing: ~10 bits per item gives ~1% false positives with 7 hashes
+MEMBERSHIP_BITS_PER_ITEM = int(os.getenv("MEMBERSHIP_BITS_PER_ITEM", "10"))
+MEMBERSHIP_MIN_BITS = int(os.getenv("MEMBERSHIP_MIN_BITS", "2048"))
+MEMBERSHIP_MAX_BITS = int(os.getenv("MEMBERSHIP_MAX_BITS", str(64 * 1024)))  # 8KB per user at most
+MEMBERSHIP_CACHE_USERS = int(os.getenv("MEMBERSHIP_CACHE_USERS", "10000"))
+MEMBERSHIP_CACHE_MAX_BYTES = int(os.getenv("MEMBERSHIP_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "3600"))
+
+# Things a user can do to a job that remove it from their feed
+JOB_ACTIONS = ('applied', 'dismissed')
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)"""
+
+    __slots__ = ('size', 'hashes', 'capacity', 'count', 'capped', '_bits')
+
+    def __init__(self, capacity: int, bits_per_item: int = MEMBERSHIP_BITS_PER_ITEM,
+                 min_bits: int = MEMBERSHIP_MIN_BITS, max_bits: int = MEMBERSHIP_MAX_BITS):
+        self.size = min(max(capacity * bits_per_item, min_bits), max_bits)
+        # At the size cap a rebuild can't be any larger
+        self.capped = self.size >= max_bits
+        self.capacity = max(self.size // bits_per_item, 1)
+        self.hashes = max(1, round(bits_per_item * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        # Double hashing: k positions from two 64-bit hashes
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def approx_size(self) -> int:
+        return len(self._bits) + 64
+
+
+class JobMembership:
+    """Per-user "already applied or dismissed" set for feed filtering.
+
+    The user_job_exclusions table is the source of truth. Each active user
+    gets a bloom filter built lazily from it; a job that misses the filter
+    is definitely unseen (O(1), no query), and only filter hits are
+    confirmed against the table. Filters live in a byte-capped LRU so
+    memory stays bounded however many users swipe. A filter that fills up
+    at the size cap is kept but no longer trusted: that user's checks go
+    straight to the table instead of rebuilding the filter on every record.
+    """
+
+    def __init__(self):
+        self.filters = LRUCache(
+            max_entries=MEMBERSHIP_CACHE_USERS,
+            ttl=MEMBERSHIP_CACHE_TTL,
+            max_bytes=MEMBERSHIP_CACHE_MAX_BYTES,
+            sizeof=lambda bloom: bloom.approx_size(),
+            name="job_membership"
+        )
+        # user_id -> token of the filter build in flight; record() drops it so a build that
+        # raced the write is not cached (per user, so other users' builds are unaffected)
+        self._builds: Dict[int, object] = {}
+
+        self.builds = 0
+        self.checks = 0
+        self.filter_negatives = 0
+        self.db_fallbacks = 0
+        self.confirmed = 0
+        self.false_positives = 0
+
+    async def _filter(self, user_id: int) -> BloomFilter:
+        bloom = self.filters.get(user_id)
+        if bloom is not None:
+            return bloom
+
+        token = self._builds[user_id] = object()
+        try:
+            fingerprints = await db_manager.get_user_job_fingerprints(user_id)
+        finally:
+            current = self._builds.get(user_id) is token
+            if current:
+                del self._builds[user_id]
+
+        bloom = BloomFilter(capacity=max(len(fingerprints) * 2, 1))
+        for item in fingerprints:
+            bloom.add(item)
+        self.builds += 1
+        # Not cached if a record() for this user raced the load; the next call rebuilds
+        if current:
+            self.filters.set(user_id, bloom)
+        return bloom
+
+    async def seen(self, user_id: int, fingerprints: Iterable[str]) -> Set[str]:
+        """Subset of fingerprints the user has applied to or dismissed"""
+        fingerprints = [item for item in fingerprints if item]
+        if not fingerprints:
+            return set()
+
+        bloom = await self._filter(user_id)
+        self.checks += len(fingerprints)
+        if bloom.saturated:
+            # Full at the size cap: too many false positives to be worth consulting
+            candidates = fingerprints
+            self.db_fallbacks += len(fingerprints)
+        else:
+            candidates = [item for item in fingerprints if item in bloom]
+            self.filter_negatives += len(fingerprints) - len(candidates)
+        if not candidates:
+            return set()
+
+        confirmed = await db_manager.get_seen_job_fingerprints(user_id, candidates)
+        self.confirmed += len(confirmed)
+        self.false_positives += len(set(candidates) - confirmed)
+        return confirmed
+
+    async def record(self, user_id: int, action: str, job_fingerprint: str, job_id: Optional[int] = None):
+        """Persist an applied/dismissed job and add it to the user's filter"""
+        await db_manager.record_job_interaction(user_id, job_fingerprint, action, job_id)
+
+        # A build in flight may have read the table before this write
+        self._builds.pop(user_id, None)
+        bloom = self.filters.get(user_id)
+        if bloom is None:
+            return
+        if bloom.saturated and not bloom.capped:
+            # Rebuilt larger on next use
+            self.filters.invalidate(user_id)
+        else:
+            bloom.add(job_fingerprint)
+
+    async def fingerprint_for(self, job_id: Optional[int] = None, title: str = "", company: str = "",
+                              apply_url: str = "") -> Optional[str]:
+        """Fingerprint of the canonical job, or of title + company + URL when the job isn't known"""
+        if job_id is not None:
+            job_fingerprint = await db_manager.get_job_fingerprint(job_id)
+            if job_fingerprint:
+                return job_fingerprint
+        if not title:
+            return None
+        return fingerprint({'title': title, 'company': company, 'apply_url': apply_url})
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "builds": self.builds,
+            "checks": self.checks,
+            "filter_negatives": self.filter_negatives,
+            "db_fallbacks": self.db_fallbacks,
+            "confirmed": self.confirmed,
+            "false_positives": self.false_positives,
+            "filters": self.filters.get_stats(),
+        }
+
+
+# Global job membership instance
+job_membership = JobMembership()
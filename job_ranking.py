@@ -0,0 +1,327 @@
+import asyncio
+import math
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from database import db_manager
+from job_membership import job_membership
+from skills_index import normalize_skill
+
+# Load environment variables
+load_dotenv()
+
+# Ranking configuration
+RANKING_MAX_JOBS = int(os.getenv("RANKING_MAX_JOBS", "5000"))
+RANKING_INDEX_TTL = float(os.getenv("RANKING_INDEX_TTL", "300"))
+RANKING_REMOTE_WEIGHT = float(os.getenv("RANKING_REMOTE_WEIGHT", "0.15"))
+RANKING_LOCATION_WEIGHT = float(os.getenv("RANKING_LOCATION_WEIGHT", "0.1"))
+
+# Term weights per job field / profile field before TF-IDF
+JOB_FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'labels': 2.0, 'description': 1.0}
+PROFILE_FIELD_WEIGHTS = {
+    'skills': 3.0,
+    'key_technologies': 3.0,
+    'programming_languages': 2.0,
+    'frameworks_libraries': 2.0,
+    'tools_platforms': 2.0,
+    'preferred_roles': 2.0,
+    'github_languages': 1.5,
+}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we will with you your "
+    "this that their they us who what work team role job".split()
+)
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase terms with skill aliases folded (js -> javascript)"""
+    if not isinstance(text, str):
+        return []
+    return [
+        normalize_skill(token.rstrip('.'))
+        for token in _TOKEN.findall(text.lower())
+        if token.rstrip('.') and token not in _STOPWORDS
+    ]
+
+
+def _values(value: Any) -> List[str]:
+    """Flatten a profile field (comma string, JSON list or proficiency map) into strings"""
+    if isinstance(value, dict):
+        return [key for key in value if isinstance(key, str)]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    if isinstance(value, str):
+        return value.split(',')
+    return []
+
+
+def job_terms(job: Dict[str, Any]) -> Counter:
+    terms: Counter = Counter()
+    for token in tokenize(job.get('title')):
+        terms[token] += JOB_FIELD_WEIGHTS['title']
+    for tag in _values(job.get('tags')):
+        for token in tokenize(tag):
+            terms[token] += JOB_FIELD_WEIGHTS['tags']
+    for facet_labels in (job.get('labels') or {}).values():
+        for label in facet_labels:
+            terms[normalize_skill(label)] += JOB_FIELD_WEIGHTS['labels']
+    for token in tokenize(job.get('description')):
+        terms[token] += JOB_FIELD_WEIGHTS['description']
+    return terms
+
+
+def profile_terms(profile: Dict[str, Any], github_languages: Optional[Dict[str, int]] = None) -> Counter:
+    terms: Counter = Counter()
+    for field, weight in PROFILE_FIELD_WEIGHTS.items():
+        if field == 'github_languages':
+            continue
+        for value in _values(profile.get(field)):
+            for token in tokenize(value):
+                terms[token] += weight
+    if github_languages:
+        total = sum(github_languages.values()) or 1
+        for language, size in github_languages.items():
+            # Languages the user actually writes a lot of count more
+            for token in tokenize(language):
+                terms[token] += PROFILE_FIELD_WEIGHTS['github_languages'] * (0.5 + size / total)
+    return terms
+
+
+def location_tokens(value: Any) -> List[str]:
+    return [token for text in _values(value) for token in tokenize(text) if token != 'remote']
+
+
+def wants_remote(profile: Dict[str, Any]) -> bool:
+    return any('remote' in mode.lower() for mode in _values(profile.get('work_mode')))
+
+
+def is_remote_job(job: Dict[str, Any]) -> bool:
+    location = job.get('location') or ''
+    return not location or 'remote' in location.lower() or 'anywhere' in location.lower()
+
+
+class SparseRows:
+    """Minimal CSR matrix (rows of term weights) with a vectorized row-by-vector product"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape_rows = len(indptr) - 1
+        # Row number of every stored value, so products can be summed per row in one bincount
+        self._row_ids = np.repeat(np.arange(self.shape_rows, dtype=np.int64), np.diff(indptr))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[int, float]], normalize: bool = True) -> 'SparseRows':
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter((i for row in rows for i in row), dtype=np.int32, count=int(indptr[-1]))
+        data = np.fromiter((w for row in rows for w in row.values()), dtype=np.float32, count=int(indptr[-1]))
+        matrix = cls(indptr, indices, data)
+        if normalize and len(data):
+            norms = np.sqrt(np.bincount(matrix._row_ids, weights=data * data, minlength=len(rows)))
+            norms[norms == 0] = 1.0
+            matrix.data = (data / norms[matrix._row_ids]).astype(np.float32)
+        return matrix
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix @ dense vector: one score per row"""
+        products = self.data * vector[self.indices]
+        return np.bincount(self._row_ids, weights=products, minlength=self.shape_rows)
+
+    def row(self, index: int, size: int) -> np.ndarray:
+        dense = np.zeros(size, dtype=np.float32)
+        start, end = self.indptr[index], self.indptr[index + 1]
+        dense[self.indices[start:end]] = self.data[start:end]
+        return dense
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition, not a full sort)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class JobRankingIndex:
+    """TF-IDF vectors of a job batch plus the per-job features the ranking uses"""
+
+    def __init__(self, jobs: List[Dict[str, Any]]):
+        self.jobs = jobs
+        self.built_at = time.monotonic()
+
+        term_counts = [job_terms(job) for job in jobs]
+        document_frequency: Counter = Counter()
+        for terms in term_counts:
+            document_frequency.update(terms.keys())
+
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(document_frequency)}
+        # Smoothed IDF, as in scikit-learn
+        df = np.fromiter((document_frequency[term] for term in self.vocabulary), dtype=np.float64,
+                         count=len(self.vocabulary))
+        self.idf = (np.log((1 + len(jobs)) / (1 + df)) + 1).astype(np.float32)
+
+        self.matrix = SparseRows.from_rows([self._weights(terms) for terms in term_counts])
+
+        self.location_vocabulary: Dict[str, int] = {}
+        location_rows = []
+        for job in jobs:
+            row = {}
+            for token in location_tokens(job.get('location')):
+                row[self.location_vocabulary.setdefault(token, len(self.location_vocabulary))] = 1.0
+            location_rows.append(row)
+        self.locations = SparseRows.from_rows(location_rows, normalize=False)
+        self.remote = np.fromiter((is_remote_job(job) for job in jobs), dtype=bool, count=len(jobs))
+
+    def _weights(self, terms: Dict[str, float]) -> Dict[int, float]:
+        """Sublinear TF x IDF over the known vocabulary (unknown terms can't match any job)"""
+        weights = {}
+        for term, tf in terms.items():
+            index = self.vocabulary.get(term)
+            if index is not None and tf > 0:
+                weights[index] = (1 + math.log(tf)) * float(self.idf[index])
+        return weights
+
+    def profile_vector(self, terms: Dict[str, float]) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for index, weight in self._weights(terms).items():
+            vector[index] = weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def location_vector(self, tokens: Iterable[str]) -> np.ndarray:
+        vector = np.zeros(len(self.location_vocabulary), dtype=np.float32)
+        for token in tokens:
+            index = self.location_vocabulary.get(token)
+            if index is not None:
+                vector[index] = 1.0
+        return vector
+
+    def score_jobs(self, terms: Dict[str, float], remote: bool = False,
+                   locations: Iterable[str] = ()) -> np.ndarray:
+        """Score every job in the batch for one profile at once"""
+        scores = self.matrix.dot(self.profile_vector(terms))
+        if remote:
+            scores += RANKING_REMOTE_WEIGHT * self.remote
+        if len(self.location_vocabulary):
+            scores += RANKING_LOCATION_WEIGHT * (self.locations.dot(self.location_vector(locations)) > 0)
+        return scores
+
+    def profile_matrix(self, profiles: Sequence[Dict[str, float]]) -> SparseRows:
+        """L2-normalized TF-IDF rows for many profiles, in this batch's vocabulary"""
+        return SparseRows.from_rows([self._weights(terms) for terms in profiles])
+
+    def score_profiles(self, job_index: int, profiles: SparseRows,
+                       remote: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score many profiles against one job of the batch at once"""
+        scores = profiles.dot(self.matrix.row(job_index, len(self.vocabulary)))
+        if remote is not None and self.remote[job_index]:
+            scores += RANKING_REMOTE_WEIGHT * remote
+        return scores
+
+    def matched_terms(self, job_index: int, terms: Dict[str, float], limit: int = 5) -> List[str]:
+        start, end = self.matrix.indptr[job_index], self.matrix.indptr[job_index + 1]
+        job_term_ids = set(self.matrix.indices[start:end].tolist())
+        matched = [term for term in terms if self.vocabulary.get(term) in job_term_ids]
+        return sorted(matched, key=lambda term: -terms[term])[:limit]
+
+
+class JobRanker:
+    """Personalized top-k jobs per user over a periodically rebuilt ranking index"""
+
+    def __init__(self, max_jobs: int = RANKING_MAX_JOBS, index_ttl: float = RANKING_INDEX_TTL):
+        self.max_jobs = max_jobs
+        self.index_ttl = index_ttl
+        self._index: Optional[JobRankingIndex] = None
+        self._lock = asyncio.Lock()
+
+        self.index_builds = 0
+        self.last_build_seconds = 0.0
+        self.rankings = 0
+
+    async def get_index(self) -> JobRankingIndex:
+        index = self._index
+        if index is not None and time.monotonic() - index.built_at < self.index_ttl:
+            return index
+        async with self._lock:
+            index = self._index
+            if index is None or time.monotonic() - index.built_at >= self.index_ttl:
+                jobs = await db_manager.get_jobs(limit=self.max_jobs)
+                started = time.perf_counter()
+                # Tokenizing thousands of descriptions is CPU work; keep it off the event loop
+                index = await asyncio.to_thread(JobRankingIndex, jobs)
+                self.last_build_seconds = time.perf_counter() - started
+                self.index_builds += 1
+                self._index = index
+        return index
+
+    def invalidate(self):
+        self._index = None
+
+    async def recommend(self, user_id: int, k: int = 20) -> List[Dict[str, Any]]:
+        """Top-k jobs for a user, best first, each with its score and matched terms"""
+        profile = await db_manager.get_user_profile(user_id)
+        if not profile:
+            return []
+        github_languages = await db_manager.get_user_github_languages(user_id)
+        index = await self.get_index()
+
+        terms = profile_terms(profile, github_languages)
+        scores = index.score_jobs(
+            terms,
+            remote=wants_remote(profile),
+            locations=location_tokens(profile.get('preferred_locations')) + location_tokens(profile.get('location'))
+        )
+        self.rankings += 1
+
+        # Widen the top-k until it survives dropping jobs the user applied to or dismissed
+        candidates = k
+        while True:
+            ranked = list(top_k(scores, candidates))
+            seen = await job_membership.seen(user_id, [index.jobs[i]['fingerprint'] for i in ranked])
+            ranked = [i for i in ranked if index.jobs[i]['fingerprint'] not in seen]
+            if len(ranked) >= k or candidates >= len(scores):
+                break
+            candidates *= 2
+
+        return [
+            {
+                **index.jobs[i],
+                'score': round(float(scores[i]), 4),
+                'matched_terms': index.matched_terms(i, terms),
+            }
+            for i in ranked[:k]
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "index_jobs": len(index.jobs) if index else 0,
+            "vocabulary_size": len(index.vocabulary) if index else 0,
+            "index_age_seconds": round(time.monotonic() - index.built_at, 1) if index else None,
+            "index_builds": self.index_builds,
+            "last_build_seconds": round(self.last_build_seconds, 4),
+            "rankings": self.rankings,
+        }
+
+
+def rank_users_for_job(index: JobRankingIndex, job_index: int, profiles: SparseRows,
+                       remote: Optional[np.ndarray] = None, k: int = 20) -> List[Tuple[int, float]]:
+    """Top-k (profile row, score) pairs for one job"""
+    scores = index.score_profiles(job_index, profiles, remote)
+    return [(int(i), float(scores[i])) for i in top_k(scores, k)]
+
+
+# Global job ranker instance
+job_ranker = JobRanker()
@@ -0,0 +1,424 @@
+import codecs
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from gemini_gateway import gemini_gateway, strip_code_fence
+from job_classifier import job_classifier
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REMOTEOK_API_URL = "https://remoteok.com/api"
+# Listings kept per pull; they accumulate in the jobs table, so this can exceed a page
+REMOTEOK_MAX_JOBS = int(os.getenv("REMOTEOK_MAX_JOBS", "100"))
+
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as its text streams in.
+
+    Only the element being parsed is buffered, so memory stays bounded by
+    the largest element and the caller can stop reading at any point. An
+    incomplete object or array is only re-decoded once a chunk brings a
+    possible closing bracket, which keeps large elements linear to parse.
+    """
+    buffer = ''
+    position = 0
+    started = False
+    finished = False
+    decodable = True
+    chunks = chunks.__aiter__()
+
+    while True:
+        # Skip separators up to the next element
+        while position < len(buffer) and buffer[position] in _WHITESPACE + ',':
+            if buffer[position] == ',' and not started:
+                raise ValueError("Expected a JSON array")
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == ']':
+            return
+
+        element = None
+        if position < len(buffer) and decodable:
+            try:
+                element, end = _JSON_DECODER.raw_decode(buffer, position)
+                # A scalar may still be growing (e.g. "45" of "4500.0") until a delimiter follows it
+                complete = isinstance(element, (dict, list)) or finished or (
+                    end < len(buffer) and buffer[end] in _WHITESPACE + ',]'
+                )
+                if not complete:
+                    element = None
+                else:
+                    position = end
+                    yield element
+                    continue
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+
+        if finished:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            finished = True
+            decodable = True
+            continue
+        buffer = buffer[position:] + chunk
+        position = 0
+        decodable = buffer[:1] not in ('{', '[') or '}' in chunk or ']' in chunk
+
+
+class FeedNotModified(Exception):
+    """Raised by a fetcher when the upstream feed is unchanged since the last poll"""
+
+
+class FeedValidators:
+    """HTTP validators of the last successful poll of a feed, plus savings counters.
+
+    `body_hash` covers the bytes the last poll consumed (the download may
+    stop early), and `body_complete` records whether that was the whole body.
+    `prefix_hash` covers the first FEED_PREFIX_BYTES of it, so a changed feed
+    is usually recognised from a small peek.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.body_hash: Optional[str] = None
+        self.prefix_hash: Optional[str] = None
+        self.body_length = 0
+        self.body_complete = False
+        self.parse_cpu_seconds = 0.0
+
+        self.polls = 0
+        self.not_modified = 0
+        self.unchanged_body = 0
+        self.refetches = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.cpu_seconds_saved = 0.0
+
+    def request_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update(self, response: httpx.Response):
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "polls": self.polls,
+            "not_modified": self.not_modified,
+            "unchanged_body": self.unchanged_body,
+            "refetches": self.refetches,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+            "cpu_seconds_saved": round(self.cpu_seconds_saved, 4),
+            "bytes_saved_per_poll": self.bytes_saved // self.polls if self.polls else 0,
+        }
+
+
+# Leading bytes of a feed body compared before deciding to hash the rest without parsing it
+FEED_PREFIX_BYTES = 64 * 1024
+
+
+class _HashingReader:
+    """Byte stream reader that can look ahead without consuming and hashes what it consumes"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._pending: List[bytes] = []
+        self.exhausted = False
+        self.digest = hashlib.sha256()
+        self.prefix_digest = hashlib.sha256()
+        self.length = 0
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        if self._pending:
+            return self._pending.pop(0)
+        if self.exhausted:
+            return None
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.exhausted = True
+            return None
+
+    def _consume(self, chunk: bytes):
+        if self.length < FEED_PREFIX_BYTES:
+            self.prefix_digest.update(chunk[:FEED_PREFIX_BYTES - self.length])
+        self.digest.update(chunk)
+        self.length += len(chunk)
+
+    @property
+    def finished(self) -> bool:
+        """Whether every byte of the stream has been consumed"""
+        return self.exhausted and not self._pending
+
+    async def peek(self, size: int) -> bytes:
+        """Buffer at least `size` bytes (fewer if the stream ends) and return them"""
+        buffered = sum(len(chunk) for chunk in self._pending)
+        while buffered < size and not self.exhausted:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self.exhausted = True
+                break
+            self._pending.append(chunk)
+            buffered += len(chunk)
+        return b''.join(self._pending)
+
+    async def skip(self, size: int):
+        """Consume (hash) up to `size` more bytes without keeping them"""
+        while size > 0:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                return
+            if len(chunk) > size:
+                self._pending.insert(0, chunk[size:])
+                chunk = chunk[:size]
+            self._consume(chunk)
+            size -= len(chunk)
+
+    async def text(self) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                break
+            self._consume(chunk)
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+
+async def _unchanged_body(reader: _HashingReader, validators: FeedValidators) -> bool:
+    """Compare the new body with what the previous poll consumed, holding at most FEED_PREFIX_BYTES.
+
+    A differing prefix returns False with nothing consumed. A matching one means the
+    body is probably unchanged, so the rest of the previous length is hashed as it
+    streams past without being parsed; if that turns out different the reader has
+    been consumed and the caller has to fetch again.
+    """
+    if not validators.body_hash or not validators.prefix_hash:
+        return False
+    prefix_length = min(FEED_PREFIX_BYTES, validators.body_length)
+    prefix = await reader.peek(prefix_length)
+    if len(prefix) < prefix_length or hashlib.sha256(prefix[:prefix_length]).hexdigest() != validators.prefix_hash:
+        return False
+
+    await reader.skip(validators.body_length)
+    if reader.length != validators.body_length or reader.digest.hexdigest() != validators.body_hash:
+        return False
+    if validators.body_complete:
+        # The previous result depended on the whole body: it must end here too
+        await reader.peek(1)
+        return reader.finished
+    return True
+
+
+# Validators per conditional-fetch source
+FEED_VALIDATORS = {
+    "remoteok": FeedValidators("remoteok"),
+}
+
+
+async def fetch_remoteok_jobs() -> List[Dict[str, Any]]:
+    """Fetch job listings from RemoteOK API and filter for intern/junior positions.
+
+    The feed is parsed as it streams in and the download stops as soon as
+    REMOTEOK_MAX_JOBS matches are found. Raises FeedNotModified on a 304 or
+    when the body is byte-identical to what the last poll parsed.
+    """
+    validators = FEED_VALIDATORS["remoteok"]
+    validators.polls += 1
+
+    async with httpx.AsyncClient() as client:
+        # A second request is only made when the body-hash check consumed a body that changed
+        for attempt in range(2):
+            conditional = attempt == 0
+            async with client.stream(
+                "GET",
+                REMOTEOK_API_URL,
+                headers={
+                    "User-Agent": "SwipingForJobs-Backend/1.0",
+                    **(validators.request_headers() if conditional else {})
+                },
+                timeout=30.0
+            ) as response:
+                if response.status_code == 304:
+                    validators.not_modified += 1
+                    validators.bytes_saved += validators.body_length
+                    validators.cpu_seconds_saved += validators.parse_cpu_seconds
+                    raise FeedNotModified("RemoteOK feed not modified")
+                response.raise_for_status()
+
+                reader = _HashingReader(response.aiter_bytes())
+                try:
+                    if conditional:
+                        if await _unchanged_body(reader, validators):
+                            validators.unchanged_body += 1
+                            # Downloaded to compare, but never parsed: counted like a 304
+                            validators.bytes_saved += validators.body_length
+                            validators.cpu_seconds_saved += validators.parse_cpu_seconds
+                            validators.update(response)
+                            raise FeedNotModified("RemoteOK feed unchanged")
+                        if reader.length:
+                            validators.refetches += 1
+                            continue
+
+                    filtered_jobs, parsed = await _parse_remoteok(reader, validators)
+                    validators.body_hash = reader.digest.hexdigest()
+                    validators.prefix_hash = reader.prefix_digest.hexdigest()
+                    validators.body_length = reader.length
+                    validators.body_complete = reader.finished
+                    validators.update(response)
+                finally:
+                    validators.bytes_downloaded += response.num_bytes_downloaded
+
+                logger.info(
+                    f"Found {len(filtered_jobs)} intern/junior jobs from RemoteOK "
+                    f"({parsed} listings parsed, {response.num_bytes_downloaded} bytes read)"
+                )
+                return filtered_jobs
+
+
+async def _parse_remoteok(reader: _HashingReader, validators: FeedValidators) -> Tuple[List[Dict[str, Any]], int]:
+    """(intern/junior jobs, listings parsed) from a RemoteOK body stream; records the parse CPU time"""
+    # RemoteOK API returns a list where first item is metadata (it has no position)
+    filtered_jobs = []
+    parsed = 0
+    cpu_started = time.thread_time()
+    # Closed explicitly so stopping early doesn't leave the generators suspended
+    async with contextlib.aclosing(reader.text()) as text, \
+            contextlib.aclosing(iter_json_array(text)) as jobs:
+        async for job in jobs:
+            parsed += 1
+            if not isinstance(job, dict):
+                continue
+
+            if job_classifier.is_entry_level(job.get("position", "")):
+                # Structure the job data
+                structured_job = {
+                    "title": job.get("position", ""),
+                    "company": job.get("company", ""),
+                    "tags": job.get("tags", []),
+                    "location": job.get("location", "Remote"),
+                    "apply_url": job.get("apply_url") or job.get("url", ""),
+                    "description": job.get("description", ""),
+                    "salary": job.get("salary_min", ""),
+                    "date": job.get("date", ""),
+                    "source": "RemoteOK"
+                }
+                filtered_jobs.append(structured_job)
+
+                if len(filtered_jobs) >= REMOTEOK_MAX_JOBS:
+                    break
+
+    validators.parse_cpu_seconds = time.thread_time() - cpu_started
+    return filtered_jobs, parsed
+
+
+GEMINI_JOBS_MODEL = "gemini-1.5-flash"
+
+
+def _gemini_jobs_prompt() -> str:
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    week_ago = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+
+    return f"""
+        You are a job search assistant. Find 10 recent remote internships or junior developer roles 
+        (frontend, backend, ML/AI) posted between {week_ago} and {current_date}.
+        
+        Return the results as a valid JSON array with exactly this structure:
+        [
+          {{
+            "title": "Job Title",
+            "company": "Company Name",
+            "tags": ["tag1", "tag2", "tag3"],
+            "location": "Remote" or specific location,
+            "apply_url": "https://example.com/apply",
+            "description": "Brief job description (2-3 sentences)"
+          }}
+        ]
+        
+        Focus on:
+        - Remote positions only
+        - Entry-level roles (intern, junior, graduate, entry-level)
+        - Technology roles (software engineering, web development, data science, ML/AI)
+        - Recent postings (last 7 days)
+        - Real companies and realistic job descriptions
+        
+        Ensure the JSON is valid and contains exactly 10 job listings.
+        """
+
+
+async def fetch_gemini_jobs() -> List[Dict[str, Any]]:
+    """Use Gemini AI to search for recent remote internships and junior developer roles"""
+    response_text = await gemini_gateway.generate(_gemini_jobs_prompt(), model=GEMINI_JOBS_MODEL)
+    if not response_text:
+        raise ValueError("Empty response from Gemini API")
+
+    # Extract JSON from the response
+    response_text = strip_code_fence(response_text)
+
+    # Parse the JSON response
+    try:
+        jobs_data = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse Gemini response as JSON: {str(e)}")
+        logger.error(f"Response text: {response_text[:500]}...")
+        raise ValueError("Invalid JSON response from Gemini API")
+
+    # Validate the structure
+    if not isinstance(jobs_data, list):
+        raise ValueError("Gemini response is not a list")
+
+    # Ensure each job has the required fields and add source
+    structured_jobs = []
+    for job in jobs_data:
+        if isinstance(job, dict):
+            structured_job = {
+                "title": job.get("title", ""),
+                "company": job.get("company", ""),
+                "tags": job.get("tags", []),
+                "location": job.get("location", "Remote"),
+                "apply_url": job.get("apply_url", ""),
+                "description": job.get("description", ""),
+                "source": "Gemini AI"
+            }
+            structured_jobs.append(structured_job)
+
+    logger.info(f"Generated {len(structured_jobs)} jobs from Gemini AI")
+    return structured_jobs
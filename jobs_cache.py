@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+from database import db_manager
+from job_sources import FeedNotModified
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached feed is served as fresh, per source
+JOBS_CACHE_TTL = {
+    "remoteok": float(os.getenv("JOBS_CACHE_TTL_REMOTEOK", "900")),
+    "gemini": float(os.getenv("JOBS_CACHE_TTL_GEMINI", "3600")),
+}
+JOBS_CACHE_DEFAULT_TTL = float(os.getenv("JOBS_CACHE_DEFAULT_TTL", "900"))
+
+Fetcher = Callable[[], Awaitable[Any]]
+
+
+class JobsCache:
+    """Two-tier (memory + jobs_cache table) TTL snapshot of each source feed, refreshed by ingestion"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = JOBS_CACHE_DEFAULT_TTL):
+        self.ttls = ttls if ttls is not None else dict(JOBS_CACHE_TTL)
+        self.default_ttl = default_ttl
+
+        # source -> {"data", "fetched_at", "expires_at"} (epoch seconds)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.revalidations = 0
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, self.default_ttl)
+
+    async def peek(self, source: str) -> Optional[Dict[str, Any]]:
+        """Current entry for a source (fresh or not) without fetching upstream"""
+        return self._entries.get(source) or await self._load(source)
+
+    async def refresh(self, source: str, fetch: Fetcher) -> Dict[str, Any]:
+        """Force a refresh (joins one already in flight)"""
+        return await asyncio.shield(self._start_refresh(source, fetch))
+
+    def _start_refresh(self, source: str, fetch: Fetcher) -> asyncio.Task:
+        task = self._refreshes.get(source)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(source, fetch))
+            task.add_done_callback(self._log_refresh_failure)
+            self._refreshes[source] = task
+        return task
+
+    async def _refresh(self, source: str, fetch: Fetcher) -> Dict[str, Any]:
+        self.refreshes += 1
+        previous = self._entries.get(source)
+        revalidated = False
+        try:
+            data = await fetch()
+        except FeedNotModified:
+            if previous is None:
+                self.refresh_failures += 1
+                raise
+            # Upstream confirmed our copy is current: extend it without touching the data
+            self.revalidations += 1
+            data = previous["data"]
+            revalidated = True
+        except Exception:
+            self.refresh_failures += 1
+            raise
+
+        fetched_at = time.time()
+        entry = {
+            "data": data,
+            "fetched_at": fetched_at,
+            "expires_at": fetched_at + self.ttl_for(source),
+            "revalidated": revalidated,
+        }
+        self._entries[source] = entry
+
+        try:
+            if revalidated:
+                await db_manager.touch_jobs_cache(
+                    source,
+                    datetime.fromtimestamp(entry["fetched_at"]),
+                    datetime.fromtimestamp(entry["expires_at"])
+                )
+            else:
+                await db_manager.store_jobs_cache(
+                    source, data,
+                    datetime.fromtimestamp(entry["fetched_at"]),
+                    datetime.fromtimestamp(entry["expires_at"])
+                )
+        except Exception as e:
+            logger.warning(f"Failed to persist {source} jobs cache: {e}")
+
+        return entry
+
+    def _log_refresh_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Jobs cache refresh failed: {task.exception()}")
+
+    async def _load(self, source: str) -> Optional[Dict[str, Any]]:
+        """Warm the memory tier from the jobs_cache table (survives restarts)"""
+        try:
+            row = await db_manager.get_jobs_cache(source)
+        except Exception as e:
+            logger.warning(f"Failed to load {source} jobs cache: {e}")
+            return None
+        if not row:
+            return None
+
+        entry = {
+            "data": row["job_data"],
+            "fetched_at": row["created_at"].timestamp(),
+            "expires_at": row["expires_at"].timestamp(),
+        }
+        self._entries[source] = entry
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "ttls": self.ttls,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "revalidations": self.revalidations,
+            "sources": {
+                source: {
+                    "age_seconds": round(now - entry["fetched_at"], 1),
+                    "fresh": now < entry["expires_at"],
+                    "refreshing": source in self._refreshes and not self._refreshes[source].done(),
+                }
+                for source, entry in self._entries.items()
+            },
+        }
+
+
+# Global jobs cache instance
+jobs_cache = JobsCache()
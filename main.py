@@ -2,12 +2,11 @@ import os
 import logging
 import json
 import secrets
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
 
-import httpx
-from google import genai
+from google.genai import errors as genai_errors
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
@@ -18,6 +17,20 @@ from dotenv import load_dotenv
 from database import db_manager
 from file_manager import file_manager
 from github_oauth import github_oauth_service
+from skills_index import merge_skill_lists
+from search_index import SEARCH_SCOPES
+from executors import crypto_executor, ExecutorBusyError
+from text_extraction import text_extractor, TextExtractionError
+from job_sources import fetch_remoteok_jobs, fetch_gemini_jobs
+from gemini_gateway import gemini_gateway, strip_code_fence, GEMINI_MODEL
+from jobs_cache import jobs_cache
+from fanout import gather_with_deadlines
+from job_classifier import job_classifier
+from feed import feed_service, FEED_PAGE_SIZE, InvalidCursorError
+from job_ranking import job_ranker
+from job_ingestion import job_ingestor, JOB_INGESTION_ENABLED
+from job_membership import job_membership
+from resume_jobs import resume_job_queue
 
 # Load environment variables
 load_dotenv()
@@ -29,11 +42,29 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    await db_manager.open()
     await db_manager.init_database()
     logger.info("Database initialized successfully")
+    try:
+        await text_extractor.warm_up()
+    except Exception as e:
+        logger.warning(f"Text extraction pool warm-up failed: {e}")
+    job_ingestor.register("remoteok", fetch_remoteok_jobs)
+    if gemini_gateway.available:
+        job_ingestor.register("gemini", fetch_gemini_jobs)
+    if JOB_INGESTION_ENABLED:
+        job_ingestor.start()
+    resume_job_queue.register("registration", run_registration_resume_job)
+    resume_job_queue.register("reprocess", run_reprocess_resume_job)
+    resume_job_queue.start()
     yield
     # Shutdown
     logger.info("Application shutting down")
+    await resume_job_queue.stop()
+    await job_ingestor.stop()
+    await db_manager.close()
+    crypto_executor.shutdown()
+    text_extractor.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -53,18 +84,15 @@ app.add_middleware(
     allow_origin_regex=r"http://localhost:\d+",
 )
 
-# Configure Gemini AI
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-gemini_client = None
-if not GEMINI_API_KEY or GEMINI_API_KEY == "your_gemini_api_key_here":
-    logger.warning("GEMINI_API_KEY not properly configured")
-else:
-    try:
-        gemini_client = genai.Client(api_key=GEMINI_API_KEY)
-        logger.info("Gemini AI client initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Gemini client: {e}")
-        gemini_client = None
+# Bump when the resume analysis prompt changes so cached analyses are recomputed
+RESUME_PROMPT_VERSION = "1"
+
+# Deadlines (seconds) for the /jobs/all fan-out, per source and overall
+JOBS_ALL_SOURCE_DEADLINES = {
+    "remoteok": float(os.getenv("JOBS_ALL_DEADLINE_REMOTEOK", "2")),
+    "gemini": float(os.getenv("JOBS_ALL_DEADLINE_GEMINI", "2")),
+}
+JOBS_ALL_DEADLINE = float(os.getenv("JOBS_ALL_DEADLINE", "3"))
 
 # Pydantic models for request/response validation
 class UserRegistration(BaseModel):
@@ -192,61 +220,40 @@ class JobApplication(BaseModel):
     company: str
     job_source: str
     job_url: str = ""
+    job_id: Optional[int] = None
 
-async def process_resume_with_gemini(file_path: str) -> Dict[str, Any]:
-    """Process resume file using Gemini AI to extract information with graceful fallbacks"""
-    # Return empty dict if no Gemini client available
-    if not gemini_client:
-        logger.warning("Gemini client not available for resume processing - skipping AI analysis")
-        return {}
-    
+class JobDismissal(BaseModel):
+    user_id: int
+    job_id: int
+
+async def process_resume_with_gemini(file_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """Process resume file using Gemini AI to extract information with graceful fallbacks.
+
+    With the file's content hash, the extracted text and the analysis are cached per
+    (hash, prompt version, model), so an unchanged resume is never analyzed twice.
+    """
     try:
-        # Extract text from resume file based on file type
-        resume_content = ""
-        file_extension = file_path.lower().split('.')[-1]
-        
-        logger.info(f"Processing file: {file_path}, extension: {file_extension}")
+        if content_hash:
+            cached = await db_manager.get_resume_analysis(content_hash, RESUME_PROMPT_VERSION, GEMINI_MODEL)
+            if cached is not None:
+                logger.info(f"Using cached resume analysis for {content_hash[:12]}")
+                return cached
+        
+        # Return empty dict if no Gemini client available
+        if not gemini_gateway.available:
+            logger.warning("Gemini client not available for resume processing - skipping AI analysis")
+            return {}
         
-        if file_extension == 'pdf':
-            try:
-                import PyPDF2
-                logger.info("Using PyPDF2 for PDF processing")
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    logger.info(f"PDF has {len(pdf_reader.pages)} pages")
-                    for i, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        logger.info(f"Page {i+1} extracted {len(page_text)} characters")
-                        resume_content += page_text + "\n"
-            except ImportError:
-                logger.warning("PyPDF2 not installed, trying alternative PDF reading method")
-                try:
-                    import pdfplumber
-                    logger.info("Using pdfplumber for PDF processing")
-                    with pdfplumber.open(file_path) as pdf:
-                        logger.info(f"PDF has {len(pdf.pages)} pages")
-                        for i, page in enumerate(pdf.pages):
-                            text = page.extract_text()
-                            if text:
-                                logger.info(f"Page {i+1} extracted {len(text)} characters")
-                                resume_content += text + "\n"
-                except ImportError:
-                    logger.error("No PDF processing library available. Please install PyPDF2 or pdfplumber")
-                    return {}
-        elif file_extension in ['txt', 'md']:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                resume_content = file.read()
-        elif file_extension in ['doc', 'docx']:
+        resume_content = await db_manager.get_resume_text(content_hash) if content_hash else None
+        if resume_content is None:
+            # Parsed in the extraction process pool, off the event loop
             try:
-                import docx
-                doc = docx.Document(file_path)
-                resume_content = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            except ImportError:
-                logger.warning("python-docx not installed, cannot process Word documents")
+                resume_content = await text_extractor.extract(file_path)
+            except TextExtractionError as e:
+                logger.warning(f"Could not extract resume text: {e}")
                 return {}
-        else:
-            logger.warning(f"Unsupported file type: {file_extension}")
-            return {}
+            if content_hash:
+                await db_manager.store_resume_text(content_hash, resume_content)
         
         logger.info(f"Total extracted content length: {len(resume_content)} characters")
         logger.info(f"First 200 characters: {resume_content[:200]}")
@@ -302,78 +309,40 @@ async def process_resume_with_gemini(file_path: str) -> Dict[str, Any]:
         Return only the JSON object, no additional text.
         """
         
-        # Generate response from Gemini with timeout and retry logic
-        max_retries = 3
-        for attempt in range(max_retries):
+        # The gateway handles timeouts, concurrency and transient API errors;
+        # an unusable answer (empty or invalid JSON) is asked for again
+        max_attempts = 2
+        for attempt in range(max_attempts):
             try:
-                logger.info(f"Attempting Gemini API call (attempt {attempt + 1}/{max_retries})")
-                
-                response = gemini_client.models.generate_content(
-                    model="gemini-1.5-flash",
-                    contents=prompt
-                )
-                
-                if not response or not response.text:
-                    logger.warning(f"Empty response from Gemini API (attempt {attempt + 1})")
-                    if attempt < max_retries - 1:
-                        continue
-                    else:
-                        logger.error("All Gemini API attempts failed - empty response")
-                        return {}
-                
-                # Clean and parse the response
-                response_text = response.text.strip()
-                
-                # Remove markdown code blocks if present
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-                
-                response_text = response_text.strip()
-                
-                # Parse JSON
-                try:
-                    processed_data = json.loads(response_text)
-                    logger.info(f"Successfully processed resume with Gemini (attempt {attempt + 1})")
-                    return processed_data
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse Gemini response as JSON (attempt {attempt + 1}): {str(e)}")
-                    if attempt < max_retries - 1:
-                        continue
-                    else:
-                        logger.error(f"All JSON parsing attempts failed. Response: {response_text[:200]}...")
-                        return {}
-                        
-            except Exception as api_error:
-                logger.warning(f"Gemini API error (attempt {attempt + 1}): {str(api_error)}")
-                
-                # Check for specific error types
-                if "403" in str(api_error) or "PERMISSION_DENIED" in str(api_error):
-                    logger.error("Gemini API permissions error - API not enabled or quota exceeded")
-                    return {}
-                elif "401" in str(api_error) or "UNAUTHORIZED" in str(api_error):
-                    logger.error("Gemini API authentication error - invalid API key")
-                    return {}
-                elif "429" in str(api_error) or "RATE_LIMIT" in str(api_error):
-                    logger.warning("Gemini API rate limit reached - skipping AI analysis")
-                    return {}
-                elif "500" in str(api_error) or "INTERNAL_ERROR" in str(api_error):
-                    logger.warning("Gemini API internal error - retrying...")
-                    if attempt < max_retries - 1:
-                        continue
-                    else:
-                        logger.error("All Gemini API retry attempts failed")
-                        return {}
+                response_text = await gemini_gateway.generate(prompt)
+            except genai_errors.APIError as api_error:
+                if api_error.code in (401, 403):
+                    logger.error(f"Gemini API rejected the request ({api_error.code}) - check the API key and quota")
                 else:
-                    logger.warning(f"Unknown Gemini API error: {str(api_error)}")
-                    if attempt < max_retries - 1:
-                        continue
-                    else:
-                        return {}
-        
+                    logger.warning(f"Gemini API error ({api_error.code}) - skipping AI analysis")
+                return {}
+            except Exception as api_error:
+                logger.warning(f"Gemini API call failed - skipping AI analysis: {type(api_error).__name__} {api_error}")
+                return {}
+
+            if not response_text:
+                logger.warning(f"Empty response from Gemini API (attempt {attempt + 1})")
+                continue
+
+            # Clean and parse the response
+            response_text = strip_code_fence(response_text)
+            try:
+                processed_data = json.loads(response_text)
+                logger.info(f"Successfully processed resume with Gemini (attempt {attempt + 1})")
+                if content_hash and processed_data:
+                    await db_manager.store_resume_analysis(
+                        content_hash, RESUME_PROMPT_VERSION, GEMINI_MODEL, processed_data
+                    )
+                return processed_data
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse Gemini response as JSON (attempt {attempt + 1}): {str(e)}")
+                logger.debug(f"Response: {response_text[:200]}...")
+
         logger.error("All Gemini API attempts exhausted")
         return {}
             
@@ -384,9 +353,126 @@ async def process_resume_with_gemini(file_path: str) -> Dict[str, Any]:
         logger.error(f"Unexpected error processing resume with Gemini: {str(e)}")
         return {}
 
+async def run_registration_resume_job(job: Dict[str, Any], set_stage) -> Dict[str, Any]:
+    """Resume job: analyze a resume uploaded at registration and store the extracted data"""
+    profile = await db_manager.get_user_profile(job["user_id"])
+    if not profile:
+        raise ValueError("User not found")
+    if profile.get("resume_path") != job["resume_path"]:
+        # Replaced by a newer upload, which has its own job
+        return {"processed": False, "superseded": True}
+    
+    await set_stage("analyzing")
+    processed_data = await process_resume_with_gemini(job["resume_path"], profile.get("resume_hash"))
+    if processed_data:
+        await set_stage("saving")
+        await db_manager.update_user_profile(job["user_id"], resume_processed_data=json.dumps(processed_data))
+        logger.info(f"Successfully processed resume for user ID: {job['user_id']}")
+    return {"processed": bool(processed_data)}
+
+async def run_reprocess_resume_job(job: Dict[str, Any], set_stage) -> Dict[str, Any]:
+    """Resume job: re-analyze a user's resume and merge the results into their profile"""
+    user_id = job["user_id"]
+    profile = await db_manager.get_user_profile(user_id)
+    if not profile:
+        raise ValueError("User not found")
+    if profile.get("resume_path") != job["resume_path"]:
+        # Replaced by a newer upload, which has its own job
+        return {"processed": False, "superseded": True}
+    
+    # Process resume with Gemini
+    await set_stage("analyzing")
+    logger.info(f"Processing resume for user ID: {user_id}")
+    processed_data = await process_resume_with_gemini(job["resume_path"], profile.get("resume_hash"))
+    
+    if not processed_data:
+        raise ValueError("Failed to process resume")
+    
+    logger.info(f"Processed data from Gemini: {processed_data}")
+    await set_stage("saving")
+    
+    # Update user with processed data
+    update_data = {
+        "resume_processed_data": json.dumps(processed_data)
+    }
+    
+    # If resume contains better information, update profile fields
+    if processed_data.get("skills"):
+        # Merge existing skills with resume skills (deduplicated by canonical name)
+        existing_skills = (profile.get("skills") or "").split(",")
+        resume_skills = processed_data.get("skills", [])
+        all_skills = merge_skill_lists(existing_skills, resume_skills)
+        update_data["skills"] = ", ".join(all_skills)
+        logger.info(f"Updated skills: {update_data['skills']}")
+    
+    if processed_data.get("phone") and not profile.get("phone_number"):
+        update_data["phone_number"] = processed_data["phone"]
+        logger.info(f"Updated phone: {update_data['phone_number']}")
+        
+    if processed_data.get("location") and not profile.get("location"):
+        update_data["location"] = processed_data["location"]
+        logger.info(f"Updated location: {update_data['location']}")
+        
+    if processed_data.get("summary") and not profile.get("bio"):
+        update_data["bio"] = processed_data["summary"]
+        logger.info(f"Updated bio: {update_data['bio'][:100]}...")
+        
+    if processed_data.get("linkedin") and not profile.get("linkedin_url"):
+        update_data["linkedin_url"] = processed_data["linkedin"]
+        logger.info(f"Updated linkedin: {update_data['linkedin_url']}")
+        
+    if processed_data.get("github") and not profile.get("github_url"):
+        update_data["github_url"] = processed_data["github"]
+        logger.info(f"Updated github: {update_data['github_url']}")
+        
+    if processed_data.get("portfolio") and not profile.get("portfolio_url"):
+        update_data["portfolio_url"] = processed_data["portfolio"]
+        logger.info(f"Updated portfolio: {update_data['portfolio_url']}")
+    
+    logger.info(f"Final update_data: {update_data}")
+    
+    # Update the user profile
+    success = await db_manager.update_user_profile(user_id, **update_data)
+    
+    logger.info(f"Update success: {success}")
+    
+    if not success:
+        raise ValueError("Failed to update user profile")
+    
+    # Process and save projects if they exist
+    if processed_data.get("projects"):
+        logger.info(f"Processing {len(processed_data['projects'])} projects")
+        
+        # Clear existing projects for this user (to avoid duplicates on re-processing)
+        await db_manager.clear_user_projects(user_id)
+        
+        # Add new projects
+        for project in processed_data["projects"]:
+            try:
+                project_data = {
+                    'project_name': project.get('name', ''),
+                    'description': project.get('description', ''),
+                    'technologies': project.get('technologies', []),
+                    'project_url': project.get('url', ''),
+                    'github_url': project.get('github', ''),
+                    'start_date': project.get('start_date'),
+                    'end_date': project.get('end_date'),
+                    'is_current': project.get('is_current', False),
+                    'featured': False  # Can be set later by user
+                }
+                
+                await db_manager.add_project(user_id, **project_data)
+                logger.info(f"Added project: {project.get('name', '')}")
+                
+            except Exception as e:
+                logger.error(f"Error adding project {project.get('name', '')}: {str(e)}")
+                continue
+    
+    return {"processed_data": processed_data}
+
 async def extract_linkedin_github_info(linkedin_url: str = "", github_url: str = "") -> Dict[str, str]:
     """Extract additional info from LinkedIn and GitHub URLs using Gemini"""
-    if not gemini_client or (not linkedin_url and not github_url):
+    if not gemini_gateway.available or (not linkedin_url and not github_url):
         return {"linkedin_data": "", "github_data": ""}
     
     try:
@@ -439,54 +525,63 @@ async def register_user(
         # Parse preferences
         preferences_list = [p.strip() for p in preferences.split(',') if p.strip()]
         
-        # Handle resume upload if provided
+        # Handle resume upload if provided (analyzed in the background once the user exists)
         resume_filename = ""
         resume_path = ""
-        resume_processed_data = ""
+        resume_hash = None
         
         if resume and resume.filename:
             file_info = await file_manager.save_resume(resume, email)
             resume_filename = file_info["original_filename"]
             resume_path = file_info["file_path"]
-            
-            # Process resume with Gemini AI
-            logger.info(f"Processing resume with Gemini AI for user: {email}")
-            processed_data = await process_resume_with_gemini(resume_path)
-            if processed_data:
-                resume_processed_data = json.dumps(processed_data)
-                logger.info(f"Successfully processed resume for user: {email}")
+            resume_hash = file_info["content_hash"]
         
         # Extract LinkedIn/GitHub information
         social_data = await extract_linkedin_github_info(linkedin_url, github_url)
         
         # Create user in database
-        result = await db_manager.create_user(
-            name=name,
-            email=email,
-            linkedin_url=linkedin_url,
-            github_url=github_url,
-            skills=skills,
-            preferences=preferences_list,
-            resume_filename=resume_filename,
-            resume_path=resume_path,
-            linkedin_data=social_data.get("linkedin_data", ""),
-            github_data=social_data.get("github_data", ""),
-            resume_processed_data=resume_processed_data
-        )
+        try:
+            result = await db_manager.create_user(
+                name=name,
+                email=email,
+                linkedin_url=linkedin_url,
+                github_url=github_url,
+                skills=skills,
+                preferences=preferences_list,
+                resume_filename=resume_filename,
+                resume_path=resume_path,
+                resume_hash=resume_hash,
+                linkedin_data=social_data.get("linkedin_data", ""),
+                github_data=social_data.get("github_data", "")
+            )
+        except Exception:
+            # The upload's file reference belongs to the user that was never created
+            if resume_hash:
+                await file_manager.release_resume(resume_hash)
+            raise
         
         logger.info(f"User registered: {email} with login code: {result['login_code']}")
         
+        resume_job_id = None
+        if resume_path:
+            resume_job = await resume_job_queue.enqueue(result["user_id"], "registration", resume_path)
+            resume_job_id = resume_job["id"]
+        
         return {
             "message": "Registration successful! Save your login code.",
             "user_id": result["user_id"],
             "login_code": result["login_code"],
             "name": name,
             "email": email,
-            "resume_uploaded": bool(resume_filename)
+            "resume_uploaded": bool(resume_filename),
+            "resume_job_id": resume_job_id
         }
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusyError:
+        logger.warning("Registration rejected: crypto executor saturated")
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly")
     except Exception as e:
         logger.error(f"Registration error: {str(e)}")
         raise HTTPException(status_code=500, detail="Registration failed")
@@ -592,9 +687,10 @@ async def update_user_profile(
         logger.error(f"Error updating profile: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
-@app.post("/users/process-resume/{user_id}")
-async def process_user_resume(user_id: int):
-    """Process/reprocess user's resume with Gemini AI"""
+@app.post("/users/process-resume/{user_id}", status_code=202)
+async def process_user_resume(user_id: int, resume: Optional[UploadFile] = File(None)):
+    """Queue (re)processing of the user's resume with Gemini AI, replacing it first when a new file is uploaded;
+    poll /jobs/status/{job_id} for the result"""
     try:
         
         # Get user profile to find resume path
@@ -603,113 +699,98 @@ async def process_user_resume(user_id: int):
         if not profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        if not profile.get("resume_path"):
+        resume_path = profile.get("resume_path")
+        if resume and resume.filename:
+            file_info = await file_manager.save_resume(resume, profile.get("email", ""))
+            try:
+                await db_manager.update_user_profile(
+                    user_id,
+                    resume_filename=file_info["original_filename"],
+                    resume_path=file_info["file_path"],
+                    resume_hash=file_info["content_hash"]
+                )
+            except Exception:
+                await file_manager.release_resume(file_info["content_hash"])
+                raise
+            # The replaced file loses this user's reference (and is deleted if nobody else shares it)
+            if profile.get("resume_hash"):
+                await file_manager.release_resume(profile["resume_hash"])
+            resume_path = file_info["file_path"]
+        
+        if not resume_path:
             raise HTTPException(status_code=400, detail="No resume found for this user")
         
         # Check if resume file exists
-        if not os.path.exists(profile["resume_path"]):
+        if not os.path.exists(resume_path):
             raise HTTPException(status_code=404, detail="Resume file not found")
         
-        # Process resume with Gemini
-        logger.info(f"Processing resume for user ID: {user_id}")
-        processed_data = await process_resume_with_gemini(profile["resume_path"])
+        job = await resume_job_queue.enqueue(user_id, "reprocess", resume_path)
+        logger.info(f"Queued resume processing job {job['id']} for user ID: {user_id}")
         
-        if not processed_data:
-            raise HTTPException(status_code=500, detail="Failed to process resume")
-        
-        logger.info(f"Processed data from Gemini: {processed_data}")
-        
-        # Update user with processed data
-        update_data = {
-            "resume_processed_data": json.dumps(processed_data)
+        return {
+            "message": "Resume processing already in progress" if job["deduplicated"] else "Resume processing queued",
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/jobs/status/{job['id']}"
         }
         
-        # If resume contains better information, update profile fields
-        if processed_data.get("skills"):
-            # Merge existing skills with resume skills
-            existing_skills = profile.get("skills", "").split(",")
-            resume_skills = processed_data.get("skills", [])
-            all_skills = list(set([s.strip() for s in existing_skills + resume_skills if s.strip()]))
-            update_data["skills"] = ", ".join(all_skills)
-            logger.info(f"Updated skills: {update_data['skills']}")
-        
-        if processed_data.get("phone") and not profile.get("phone_number"):
-            update_data["phone_number"] = processed_data["phone"]
-            logger.info(f"Updated phone: {update_data['phone_number']}")
-            
-        if processed_data.get("location") and not profile.get("location"):
-            update_data["location"] = processed_data["location"]
-            logger.info(f"Updated location: {update_data['location']}")
-            
-        if processed_data.get("summary") and not profile.get("bio"):
-            update_data["bio"] = processed_data["summary"]
-            logger.info(f"Updated bio: {update_data['bio'][:100]}...")
-            
-        if processed_data.get("linkedin") and not profile.get("linkedin_url"):
-            update_data["linkedin_url"] = processed_data["linkedin"]
-            logger.info(f"Updated linkedin: {update_data['linkedin_url']}")
-            
-        if processed_data.get("github") and not profile.get("github_url"):
-            update_data["github_url"] = processed_data["github"]
-            logger.info(f"Updated github: {update_data['github_url']}")
-            
-        if processed_data.get("portfolio") and not profile.get("portfolio_url"):
-            update_data["portfolio_url"] = processed_data["portfolio"]
-            logger.info(f"Updated portfolio: {update_data['portfolio_url']}")
-        
-        logger.info(f"Final update_data: {update_data}")
-        
-        # Update the user profile
-        success = await db_manager.update_user_profile(user_id, **update_data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error queueing resume processing: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process resume")
+
+@app.get("/users/search")
+async def search_users(skills: str, work_mode: Optional[str] = None, limit: int = 50, offset: int = 0):
+    """Find candidates having all of the given comma-separated skills"""
+    try:
+        skill_list = [skill.strip() for skill in skills.split(",") if skill.strip()]
+        if not skill_list:
+            raise HTTPException(status_code=400, detail="At least one skill is required")
         
-        logger.info(f"Update success: {success}")
+        users = await db_manager.search_users_by_skills(
+            skill_list, work_mode=work_mode, limit=min(max(limit, 1), 200), offset=max(offset, 0)
+        )
         
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update user profile")
+        return {
+            "users": users,
+            "count": len(users)
+        }
         
-        # Process and save projects if they exist
-        if processed_data.get("projects"):
-            logger.info(f"Processing {len(processed_data['projects'])} projects")
-            
-            # Clear existing projects for this user (to avoid duplicates on re-processing)
-            await db_manager.clear_user_projects(user_id)
-            
-            # Add new projects
-            for project in processed_data["projects"]:
-                try:
-                    project_data = {
-                        'project_name': project.get('name', ''),
-                        'description': project.get('description', ''),
-                        'technologies': project.get('technologies', []),
-                        'project_url': project.get('url', ''),
-                        'github_url': project.get('github', ''),
-                        'start_date': project.get('start_date'),
-                        'end_date': project.get('end_date'),
-                        'is_current': project.get('is_current', False),
-                        'featured': False  # Can be set later by user
-                    }
-                    
-                    await db_manager.add_project(user_id, **project_data)
-                    logger.info(f"Added project: {project.get('name', '')}")
-                    
-                except Exception as e:
-                    logger.error(f"Error adding project {project.get('name', '')}: {str(e)}")
-                    continue
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"User search error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search users")
+
+@app.get("/search")
+async def search(q: str, scope: str = "all", limit: int = 20, prefix: bool = False):
+    """Full-text search over resumes and GitHub READMEs (BM25 ranked, with snippets).
+
+    Terms ending in `*` are prefix queries; `prefix=true` treats the last term as a prefix.
+    """
+    try:
+        scopes = list(SEARCH_SCOPES) if scope == "all" else [s.strip() for s in scope.split(",") if s.strip()]
+        unknown = [s for s in scopes if s not in SEARCH_SCOPES]
+        if unknown or not scopes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown search scope. Allowed: all, {', '.join(SEARCH_SCOPES)}"
+            )
         
-        # Get updated profile
-        updated_profile = await db_manager.get_user_profile(user_id)
+        results = await db_manager.full_text_search(q, scopes, limit=min(max(limit, 1), 100), prefix=prefix)
         
         return {
-            "message": "Resume processed successfully",
-            "processed_data": processed_data,
-            "user": updated_profile
+            "query": q,
+            "results": results,
+            "count": sum(len(hits) for hits in results.values())
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to process resume")
+        logger.error(f"Search error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Search failed")
 
 @app.post("/users/apply")
 async def apply_to_job(application: JobApplication):
@@ -721,10 +802,15 @@ async def apply_to_job(application: JobApplication):
             job_title=application.job_title,
             company=application.company,
             job_source=application.job_source,
-            job_url=application.job_url
+            job_url=application.job_url,
+            job_id=application.job_id
         )
         
         if success:
+            job_fingerprint = await job_membership.fingerprint_for(
+                application.job_id, application.job_title, application.company, application.job_url
+            )
+            await job_membership.record(application.user_id, 'applied', job_fingerprint, application.job_id)
             logger.info(f"Application recorded: {application.user_email} -> {application.job_title} at {application.company}")
             return {
                 "message": "Application recorded successfully",
@@ -741,6 +827,23 @@ async def apply_to_job(application: JobApplication):
         logger.error(f"Error recording application: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to record application")
 
+@app.post("/users/dismiss")
+async def dismiss_job(dismissal: JobDismissal):
+    """Swipe a job away so it no longer shows up in the user's feed"""
+    try:
+        job_fingerprint = await job_membership.fingerprint_for(dismissal.job_id)
+        if not job_fingerprint:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        await job_membership.record(dismissal.user_id, 'dismissed', job_fingerprint, dismissal.job_id)
+        return {"message": "Job dismissed", "job_id": dismissal.job_id}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error dismissing job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to dismiss job")
+
 @app.get("/users/applications/{user_id}")
 async def get_user_applications(user_id: int):
     """Get all applications for a user"""
@@ -789,196 +892,204 @@ async def debug_user_data(user_id: int):
         logger.error(f"Debug error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/debug/db")
+async def debug_db_stats():
+    """Debug endpoint exposing database connection pool metrics"""
+    return db_manager.get_stats()
+
+@app.get("/debug/executors")
+async def debug_executor_stats():
+    """Debug endpoint exposing worker pool queue-wait and compute metrics"""
+    return {"crypto": crypto_executor.get_stats(), "text_extraction": text_extractor.get_stats()}
+
+@app.get("/debug/jobs-cache")
+async def debug_jobs_cache_stats():
+    """Debug endpoint exposing jobs cache freshness and hit metrics"""
+    return jobs_cache.get_stats()
+
+@app.get("/debug/jobs-ingestion")
+async def debug_jobs_ingestion_stats():
+    """Debug endpoint exposing per-source job ingestion status"""
+    return job_ingestor.get_stats()
+
+@app.get("/debug/ranking")
+async def debug_ranking_stats():
+    """Debug endpoint exposing job ranking index metrics"""
+    return job_ranker.get_stats()
+
+@app.get("/debug/gemini")
+async def debug_gemini_stats():
+    """Debug endpoint exposing Gemini gateway concurrency, latency and retry metrics"""
+    return gemini_gateway.get_stats()
+
+@app.get("/debug/resume-jobs")
+async def debug_resume_job_stats():
+    """Debug endpoint exposing resume job queue worker metrics"""
+    return resume_job_queue.get_stats()
+
+@app.get("/debug/feed")
+async def debug_feed_stats():
+    """Debug endpoint exposing swipe feed prefetch and seen-job filter metrics"""
+    return {**feed_service.get_stats(), "membership": job_membership.get_stats()}
+
+def parse_job_filters(**facets: str) -> Dict[str, List[str]]:
+    """Parse comma-separated label query params into classifier filters"""
+    filters = {}
+    for facet, value in facets.items():
+        labels = [label.strip().lower() for label in value.split(",") if label.strip()]
+        if not labels:
+            continue
+        allowed = job_classifier.taxonomy.get(facet, {})
+        unknown = [label for label in labels if label not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown {facet} label(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+        filters[facet] = labels
+    return filters
+
+@app.get("/jobs")
+async def list_jobs(source: str = "", limit: int = 50, offset: int = 0,
+                    seniority: str = "", role: str = "", stack: str = ""):
+    """
+    List deduplicated jobs from every source, newest first.
+    Filter with comma-separated classifier labels, e.g. ?seniority=intern,junior&role=backend
+    """
+    filters = parse_job_filters(seniority=seniority, role=role, stack=stack)
+    try:
+        jobs = await db_manager.get_jobs(
+            source or None, limit=min(max(limit, 1), 200), offset=max(offset, 0), filters=filters
+        )
+        total = await db_manager.count_jobs(source or None, filters=filters)
+        return {"jobs": jobs, "count": len(jobs), "total": total, "filters": filters}
+        
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list jobs")
+
 @app.get("/jobs/remoteok")
-async def get_remoteok_jobs():
+async def get_remoteok_jobs(limit: int = 50, offset: int = 0, seniority: str = "", role: str = "", stack: str = ""):
     """
-    Fetch job listings from RemoteOK API and filter for intern/junior positions
+    List intern/junior positions ingested from the RemoteOK API.
+    Served from the local jobs table; the ingestion service keeps it up to date.
+    Filter with comma-separated classifier labels, e.g. ?seniority=intern,junior&stack=python
     """
+    filters = parse_job_filters(seniority=seniority, role=role, stack=stack)
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://remoteok.com/api",
-                headers={"User-Agent": "SwipingForJobs-Backend/1.0"},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            
-            # RemoteOK API returns a list where first item is metadata
-            jobs_data = response.json()
-            if isinstance(jobs_data, list) and len(jobs_data) > 1:
-                jobs = jobs_data[1:]  # Skip the first metadata item
-            else:
-                jobs = jobs_data if isinstance(jobs_data, list) else []
-            
-            # Filter for intern/junior positions
-            filtered_jobs = []
-            for job in jobs:
-                if not isinstance(job, dict):
-                    continue
-                    
-                position = job.get("position", "").lower()
-                if "intern" in position or "junior" in position:
-                    # Structure the job data
-                    structured_job = {
-                        "title": job.get("position", ""),
-                        "company": job.get("company", ""),
-                        "tags": job.get("tags", []),
-                        "location": job.get("location", "Remote"),
-                        "apply_url": job.get("apply_url") or job.get("url", ""),
-                        "description": job.get("description", ""),
-                        "salary": job.get("salary_min", ""),
-                        "date": job.get("date", ""),
-                        "source": "RemoteOK"
-                    }
-                    filtered_jobs.append(structured_job)
-                    
-                    if len(filtered_jobs) >= 10:
-                        break
-            
-            logger.info(f"Found {len(filtered_jobs)} intern/junior jobs from RemoteOK")
-            return {"jobs": filtered_jobs, "count": len(filtered_jobs), "source": "RemoteOK"}
-            
-    except httpx.TimeoutException:
-        logger.error("Timeout while fetching RemoteOK jobs")
-        raise HTTPException(status_code=504, detail="Timeout while fetching jobs from RemoteOK")
-    except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error while fetching RemoteOK jobs: {e.response.status_code}")
-        raise HTTPException(status_code=502, detail="Error fetching jobs from RemoteOK")
+        jobs = await db_manager.get_jobs(
+            "remoteok", limit=min(max(limit, 1), 200), offset=max(offset, 0), filters=filters
+        )
+        return {
+            "jobs": jobs,
+            "count": len(jobs),
+            "source": "RemoteOK",
+            "ingestion": job_ingestor.get_source_status("remoteok")
+        }
+        
     except Exception as e:
-        logger.error(f"Unexpected error while fetching RemoteOK jobs: {str(e)}")
+        logger.error(f"Unexpected error while reading RemoteOK jobs: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error while fetching RemoteOK jobs")
 
 @app.get("/jobs/gemini")
-async def get_gemini_jobs():
+async def get_gemini_jobs(limit: int = 50, offset: int = 0, seniority: str = "", role: str = "", stack: str = ""):
     """
-    Use Gemini AI to search for recent remote internships and junior developer roles
+    List recent remote internships and junior developer roles found by Gemini AI.
+    Served from the local jobs table; the ingestion service keeps it up to date.
+    Accepts the same label filters as /jobs/remoteok.
     """
-    if not gemini_client:
+    if not gemini_gateway.available:
         raise HTTPException(
             status_code=503, 
             detail="Gemini API not available. Please check your configuration"
         )
     
+    filters = parse_job_filters(seniority=seniority, role=role, stack=stack)
     try:
-        # Create the prompt for finding recent job listings
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        week_ago = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        prompt = f"""
-        You are a job search assistant. Find 10 recent remote internships or junior developer roles 
-        (frontend, backend, ML/AI) posted between {week_ago} and {current_date}.
-        
-        Return the results as a valid JSON array with exactly this structure:
-        [
-          {{
-            "title": "Job Title",
-            "company": "Company Name",
-            "tags": ["tag1", "tag2", "tag3"],
-            "location": "Remote" or specific location,
-            "apply_url": "https://example.com/apply",
-            "description": "Brief job description (2-3 sentences)"
-          }}
-        ]
-        
-        Focus on:
-        - Remote positions only
-        - Entry-level roles (intern, junior, graduate, entry-level)
-        - Technology roles (software engineering, web development, data science, ML/AI)
-        - Recent postings (last 7 days)
-        - Real companies and realistic job descriptions
-        
-        Ensure the JSON is valid and contains exactly 10 job listings.
-        """
-        
-        # Generate response from Gemini
-        response = gemini_client.models.generate_content(
-            model="gemini-1.5-flash",
-            contents=prompt
+        jobs = await db_manager.get_jobs(
+            "gemini", limit=min(max(limit, 1), 200), offset=max(offset, 0), filters=filters
         )
-        
-        if not response.text:
-            raise HTTPException(status_code=502, detail="Empty response from Gemini API")
-        
-        # Extract JSON from the response
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Parse the JSON response
-        try:
-            jobs_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Gemini response as JSON: {str(e)}")
-            logger.error(f"Response text: {response_text[:500]}...")
-            raise HTTPException(status_code=502, detail="Invalid JSON response from Gemini API")
-        
-        # Validate the structure
-        if not isinstance(jobs_data, list):
-            raise HTTPException(status_code=502, detail="Gemini response is not a list")
-        
-        # Ensure each job has the required fields and add source
-        structured_jobs = []
-        for job in jobs_data:
-            if isinstance(job, dict):
-                structured_job = {
-                    "title": job.get("title", ""),
-                    "company": job.get("company", ""),
-                    "tags": job.get("tags", []),
-                    "location": job.get("location", "Remote"),
-                    "apply_url": job.get("apply_url", ""),
-                    "description": job.get("description", ""),
-                    "source": "Gemini AI"
-                }
-                structured_jobs.append(structured_job)
-        
-        logger.info(f"Generated {len(structured_jobs)} jobs from Gemini AI")
-        return {"jobs": structured_jobs, "count": len(structured_jobs), "source": "Gemini AI"}
+        return {
+            "jobs": jobs,
+            "count": len(jobs),
+            "source": "Gemini AI",
+            "ingestion": job_ingestor.get_source_status("gemini")
+        }
         
     except Exception as e:
-        logger.error(f"Error with Gemini API: {str(e)}")
-        if "API key" in str(e).lower():
-            raise HTTPException(status_code=401, detail="Invalid Gemini API key")
+        logger.error(f"Unexpected error while reading Gemini jobs: {str(e)}")
         raise HTTPException(status_code=500, detail="Error generating jobs with Gemini AI")
 
-@app.get("/jobs/all")
-async def get_all_jobs():
+@app.get("/feed/{user_id}")
+async def get_job_feed(user_id: int, cursor: str = "", page_size: int = FEED_PAGE_SIZE,
+                       seniority: str = "", role: str = "", stack: str = ""):
     """
-    Fetch jobs from both RemoteOK and Gemini AI sources
+    Swipe feed: one page of deduplicated jobs, newest first.
+    Pass the returned next_cursor to get the following page; it is prefetched server-side.
     """
-    results = {
-        "remoteok": {"jobs": [], "count": 0, "error": None},
-        "gemini": {"jobs": [], "count": 0, "error": None},
-        "total_count": 0
-    }
+    if not await db_manager.user_exists(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
     
-    # Fetch from RemoteOK
+    filters = parse_job_filters(seniority=seniority, role=role, stack=stack)
     try:
-        remoteok_response = await get_remoteok_jobs()
-        results["remoteok"] = remoteok_response
-    except HTTPException as e:
-        results["remoteok"]["error"] = e.detail
+        page = await feed_service.get_page(user_id, cursor or None, page_size, filters)
+        return {
+            "jobs": page["jobs"],
+            "count": len(page["jobs"]),
+            "next_cursor": page["next_cursor"],
+            "has_more": page["next_cursor"] is not None
+        }
+        
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid feed cursor")
     except Exception as e:
-        results["remoteok"]["error"] = str(e)
+        logger.error(f"Error loading feed for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to load job feed")
+
+@app.get("/jobs/recommended/{user_id}")
+async def get_recommended_jobs(user_id: int, k: int = 20):
+    """
+    Top-k jobs for a user, ranked by TF-IDF similarity between the job text and the
+    user's skills, technologies, preferred roles and GitHub languages, with bonuses for
+    remote work and preferred locations.
+    """
+    if not await db_manager.user_exists(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
     
-    # Fetch from Gemini
     try:
-        gemini_response = await get_gemini_jobs()
-        results["gemini"] = gemini_response
-    except HTTPException as e:
-        results["gemini"]["error"] = e.detail
+        jobs = await job_ranker.recommend(user_id, k=min(max(k, 1), 100))
+        return {"jobs": jobs, "count": len(jobs)}
+        
     except Exception as e:
-        results["gemini"]["error"] = str(e)
+        logger.error(f"Error ranking jobs for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to rank jobs")
+
+@app.get("/jobs/all")
+async def get_all_jobs():
+    """
+    Fetch jobs from both RemoteOK and Gemini AI sources concurrently.
+    A source that misses its deadline is reported with status "timeout" and
+    the remaining sources are still returned (partial results).
+    """
+    outcomes = await gather_with_deadlines(
+        {"remoteok": get_remoteok_jobs, "gemini": get_gemini_jobs},
+        deadlines=JOBS_ALL_SOURCE_DEADLINES,
+        global_deadline=JOBS_ALL_DEADLINE
+    )
+    
+    results = {}
+    for source, outcome in outcomes.items():
+        response = outcome["result"] or {"jobs": [], "count": 0}
+        results[source] = {
+            **response,
+            "status": outcome["status"],
+            "error": outcome["error"],
+            "elapsed_ms": outcome["elapsed_ms"]
+        }
     
     # Calculate total count
-    results["total_count"] = results["remoteok"]["count"] + results["gemini"]["count"]
+    results["total_count"] = sum(results[source]["count"] for source in outcomes)
+    results["partial"] = any(outcome["status"] != "ok" for outcome in outcomes.values())
     
     return results
 
@@ -1101,7 +1212,7 @@ async def github_callback(code: str, state: str = None):
         
         if existing_user:
             # User exists, update token and return user info
-            encrypted_token = github_oauth_service.encrypt_token(access_token)
+            encrypted_token = await github_oauth_service.encrypt_token(access_token)
             await db_manager.update_github_token(existing_user['id'], encrypted_token)
             
             return {
@@ -1150,8 +1261,7 @@ async def link_github_account(
     """Link GitHub account to existing user"""
     try:
         # Validate that user exists
-        user = await db_manager.get_user_profile(user_id)
-        if not user:
+        if not await db_manager.user_exists(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Check if GitHub account is already linked
@@ -1160,7 +1270,7 @@ async def link_github_account(
             raise HTTPException(status_code=400, detail="GitHub account is already linked to another user")
         
         # Encrypt and store access token
-        encrypted_token = github_oauth_service.encrypt_token(access_token)
+        encrypted_token = await github_oauth_service.encrypt_token(access_token)
         
         # Link the GitHub account
         await db_manager.link_github_account(user_id, github_id, encrypted_token, github_username)
@@ -1184,8 +1294,7 @@ async def unlink_github_account(user_id: int):
     """Unlink GitHub account from user"""
     try:
         # Validate that user exists
-        user = await db_manager.get_user_profile(user_id)
-        if not user:
+        if not await db_manager.user_exists(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Unlink the GitHub account
@@ -1206,8 +1315,7 @@ async def get_github_repos(user_id: int):
     """Get user's GitHub repositories"""
     try:
         # Validate that user exists
-        user = await db_manager.get_user_profile(user_id)
-        if not user:
+        if not await db_manager.user_exists(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get GitHub repositories
@@ -1229,8 +1337,7 @@ async def refresh_github_data(user_id: int):
     """Refresh user's GitHub repository data"""
     try:
         # Validate that user exists
-        user = await db_manager.get_user_profile(user_id)
-        if not user:
+        if not await db_manager.user_exists(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get GitHub info
@@ -1240,7 +1347,7 @@ async def refresh_github_data(user_id: int):
         
         # Decrypt access token
         encrypted_token = github_info['github_access_token']
-        access_token = github_oauth_service.decrypt_token(encrypted_token)
+        access_token = await github_oauth_service.decrypt_token(encrypted_token)
         
         # Validate token
         if not await github_oauth_service.validate_token(access_token):
@@ -1252,7 +1359,8 @@ async def refresh_github_data(user_id: int):
         if result['success']:
             return {
                 "message": "GitHub data refreshed successfully",
-                "repos_count": result['repos_count']
+                "repos_count": result['repos_count'],
+                "sync_stats": result['sync_stats']
             }
         else:
             raise HTTPException(status_code=500, detail=f"Failed to refresh GitHub data: {result['error']}")
@@ -1268,8 +1376,7 @@ async def github_status(user_id: int):
     """Get GitHub integration status for user"""
     try:
         # Validate that user exists
-        user = await db_manager.get_user_profile(user_id)
-        if not user:
+        if not await db_manager.user_exists(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get GitHub info
@@ -1303,6 +1410,27 @@ async def github_status(user_id: int):
 # Background Job Endpoints (Future Extension)
 # ========================================
 
+@app.get("/jobs/status/{job_id}")
+async def get_background_job_status(job_id: int):
+    """Status, progress stage and (once finished) result of a resume processing job"""
+    job = await db_manager.get_resume_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "user_id": job["user_id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "attempts": job["attempts"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "finished_at": job["finished_at"]
+    }
+
 @app.post("/jobs/github-sync")
 async def trigger_github_sync():
     """Trigger background job to sync GitHub data for all users"""
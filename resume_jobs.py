@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from database import db_manager
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Resume job queue configuration
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+RESUME_JOB_LEASE = timedelta(seconds=float(os.getenv("RESUME_JOB_LEASE_SECONDS", "300")))
+RESUME_JOB_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "3"))
+RESUME_JOB_RETRY_DELAY = float(os.getenv("RESUME_JOB_RETRY_DELAY", "30"))
+# Idle workers re-check the table this often (picks up retries and expired leases)
+RESUME_QUEUE_POLL_INTERVAL = float(os.getenv("RESUME_QUEUE_POLL_INTERVAL", "5"))
+
+# handler(job, set_stage) -> JSON-serializable result; set_stage(stage) records progress
+StageReporter = Callable[[str], Awaitable[None]]
+ResumeJobHandler = Callable[[Dict[str, Any], StageReporter], Awaitable[Any]]
+
+
+class LeaseLostError(RuntimeError):
+    """Raised when a worker's lease on a job was taken over by another worker"""
+
+
+class ResumeJobQueue:
+    """Durable resume-processing queue in the resume_jobs table, run by in-process workers.
+
+    Jobs are claimed by leasing them; progress updates extend the lease.
+    A job whose worker died (lease expired while running) is claimed again
+    by the next free worker, and failures are retried with a delay up to
+    RESUME_JOB_MAX_ATTEMPTS. Enqueueing the same resume while a job for it
+    is queued or running returns that job instead of a new one.
+    """
+
+    def __init__(self, workers: int = RESUME_WORKERS, lease: timedelta = RESUME_JOB_LEASE,
+                 max_attempts: int = RESUME_JOB_MAX_ATTEMPTS, retry_delay: float = RESUME_JOB_RETRY_DELAY,
+                 poll_interval: float = RESUME_QUEUE_POLL_INTERVAL):
+        self.workers = workers
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+
+        self.handlers: Dict[str, ResumeJobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._owner_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self.enqueued = 0
+        self.deduplicated = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.recovered = 0
+        self.leases_lost = 0
+
+    def register(self, kind: str, handler: ResumeJobHandler):
+        """Add the handler run for jobs of a kind"""
+        self.handlers[kind] = handler
+
+    def start(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for n in range(len(self._tasks), self.workers):
+            self._tasks.append(asyncio.create_task(self._run_worker(f"{self._owner_prefix}:{n}"), name=f"resume-worker-{n}"))
+        logger.info(f"Resume job queue started with {self.workers} workers")
+
+    async def stop(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def enqueue(self, user_id: int, kind: str, resume_path: str) -> Dict[str, Any]:
+        """Queue a job (or return the in-flight one for the same resume); the result has a `deduplicated` flag"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown resume job kind: {kind}")
+
+        job, created = await db_manager.enqueue_resume_job(
+            user_id, kind, resume_path, dedup_key=f"{user_id}:{kind}:{resume_path}"
+        )
+        if created:
+            self.enqueued += 1
+            self._wakeup.set()
+        else:
+            self.deduplicated += 1
+        return {**job, "deduplicated": not created}
+
+    async def _run_worker(self, owner: str):
+        while True:
+            # Cleared before the claim so an enqueue during it still wakes this worker
+            self._wakeup.clear()
+            try:
+                job = await db_manager.claim_resume_job(owner, self.lease)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Resume worker {owner} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job, owner)
+
+    async def _process(self, job: Dict[str, Any], owner: str):
+        if job["stage"] == "recovered":
+            self.recovered += 1
+            logger.warning(f"Recovered resume job {job['id']} from an expired lease")
+        if job["attempts"] > self.max_attempts:
+            # Leased by a worker that kept dying on it
+            await db_manager.finish_resume_job(job["id"], owner, "failed", error=job["error"] or "Worker lost")
+            self.failed += 1
+            return
+
+        async def set_stage(stage: str):
+            if not await db_manager.update_resume_job_stage(job["id"], owner, stage, self.lease):
+                raise LeaseLostError(f"Lease on resume job {job['id']} lost")
+
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for resume job kind: {job['kind']}")
+            result = await handler(job, set_stage)
+        except asyncio.CancelledError:
+            # Shutdown: the lease expires and another worker picks the job up
+            raise
+        except LeaseLostError as e:
+            self.leases_lost += 1
+            logger.warning(str(e))
+            return
+        except Exception as e:
+            if job["attempts"] < self.max_attempts:
+                self.retried += 1
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.retry_delay * job["attempts"])
+                await db_manager.finish_resume_job(job["id"], owner, "queued", error=str(e), retry_at=retry_at)
+                logger.warning(f"Resume job {job['id']} failed (attempt {job['attempts']}), retrying: {e}")
+            else:
+                self.failed += 1
+                await db_manager.finish_resume_job(job["id"], owner, "failed", error=str(e))
+                logger.error(f"Resume job {job['id']} failed: {e}")
+            return
+
+        if await db_manager.finish_resume_job(job["id"], owner, "succeeded", result=result):
+            self.succeeded += 1
+        else:
+            self.leases_lost += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running_workers": sum(1 for task in self._tasks if not task.done()),
+            "kinds": list(self.handlers),
+            "enqueued": self.enqueued,
+            "deduplicated": self.deduplicated,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "recovered": self.recovered,
+            "leases_lost": self.leases_lost,
+        }
+
+
+# Global resume job queue
+resume_job_queue = ResumeJobQueue()
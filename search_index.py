@@ -0,0 +1,122 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+
+from job_dedup import VISIBLE_JOB_CONDITION
+
+SNIPPET_TOKENS = 12
+
+_TERM = re.compile(r'(\w+)(\*?)', re.UNICODE)
+
+
+def build_match_query(text: str, prefix: bool = False) -> Optional[str]:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Every term is quoted so user input can't inject FTS5 syntax. A trailing
+    `*` on a term makes it a prefix query; `prefix=True` does the same for
+    the last term (search-as-you-type).
+    """
+    terms = _TERM.findall(text or '')
+    if not terms:
+        return None
+
+    parts = []
+    for index, (word, star) in enumerate(terms):
+        is_prefix = bool(star) or (prefix and index == len(terms) - 1)
+        parts.append(f'"{word}"' + ('*' if is_prefix else ''))
+    return ' '.join(parts)
+
+
+async def search_resumes(db: aiosqlite.Connection, match: str, limit: int) -> List[Dict[str, Any]]:
+    # Column weights: name, bio, skills, resume_processed_data
+    cursor = await db.execute(f"""
+        SELECT rowid, name,
+               bm25(resume_fts, 5.0, 2.0, 3.0, 1.0) AS score,
+               snippet(resume_fts, -1, '<b>', '</b>', '…', {SNIPPET_TOKENS})
+        FROM resume_fts
+        WHERE resume_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """, (match, limit))
+    return [
+        {'user_id': row[0], 'name': row[1], 'score': -row[2], 'snippet': row[3]}
+        for row in await cursor.fetchall()
+    ]
+
+
+async def search_readmes(db: aiosqlite.Connection, match: str, limit: int) -> List[Dict[str, Any]]:
+    cursor = await db.execute(f"""
+        SELECT f.rowid, r.user_id, r.id, r.full_name, r.url,
+               bm25(readme_fts) AS score,
+               snippet(readme_fts, 0, '<b>', '</b>', '…', {SNIPPET_TOKENS})
+        FROM readme_fts f
+        JOIN github_readmes rm ON rm.id = f.rowid
+        JOIN github_repos r ON r.id = rm.repo_id
+        WHERE readme_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """, (match, limit))
+    return [
+        {
+            'readme_id': row[0],
+            'user_id': row[1],
+            'repo_id': row[2],
+            'repo_full_name': row[3],
+            'url': row[4],
+            'score': -row[5],
+            'snippet': row[6],
+        }
+        for row in await cursor.fetchall()
+    ]
+
+
+async def search_jobs(db: aiosqlite.Connection, match: str, limit: int) -> List[Dict[str, Any]]:
+    # Column weights: title, company, tags, description; expired listings and duplicates are skipped
+    now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    cursor = await db.execute(f"""
+        SELECT f.rowid, j.title, j.company, j.source, j.apply_url,
+               bm25(job_fts, 5.0, 3.0, 2.0, 1.0) AS score,
+               snippet(job_fts, -1, '<b>', '</b>', '…', {SNIPPET_TOKENS})
+        FROM job_fts f
+        JOIN jobs j ON j.id = f.rowid
+        WHERE job_fts MATCH ? AND {VISIBLE_JOB_CONDITION}
+        ORDER BY score
+        LIMIT ?
+    """, (match, now, now, limit))
+    return [
+        {
+            'job_id': row[0],
+            'title': row[1],
+            'company': row[2],
+            'source': row[3],
+            'apply_url': row[4],
+            'score': -row[5],
+            'snippet': row[6],
+        }
+        for row in await cursor.fetchall()
+    ]
+
+
+# Searchable scopes; each FTS5 table is kept in sync with its content table by triggers
+SCOPE_SEARCHERS = {
+    'resumes': search_resumes,
+    'readmes': search_readmes,
+    'jobs': search_jobs,
+}
+SEARCH_SCOPES = tuple(SCOPE_SEARCHERS)
+
+
+async def full_text_search(
+    db: aiosqlite.Connection,
+    text: str,
+    scopes: List[str],
+    limit: int = 20,
+    prefix: bool = False,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """BM25-ranked matches per scope (best first) with highlighted snippets"""
+    match = build_match_query(text, prefix=prefix)
+    if match is None:
+        return {scope: [] for scope in scopes}
+    return {scope: await SCOPE_SEARCHERS[scope](db, match, limit) for scope in scopes}
@@ -0,0 +1,150 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiosqlite
+
+from db_records import decode_user_field
+
+# users columns that contribute to a user's skill set
+SKILL_SOURCE_FIELDS = ('skills', 'key_technologies', 'programming_languages', 'frameworks_libraries', 'tools_platforms')
+
+# Common spellings folded into one canonical skill name
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'ml': 'machine learning',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill(name: str) -> str:
+    """Canonical dictionary form of a skill name ('' if unusable)"""
+    if not isinstance(name, str):
+        return ''
+    canonical = _WHITESPACE.sub(' ', name.strip().lower())
+    return SKILL_ALIASES.get(canonical, canonical)
+
+
+def extract_skills(user: Dict[str, Any]) -> List[str]:
+    """Collect canonical skills from the raw (JSON text) skill columns of a users row"""
+    names: List[str] = []
+    skills_text = user.get('skills') or ''
+    names.extend(skills_text.split(','))
+
+    for field in SKILL_SOURCE_FIELDS[1:]:
+        value = decode_user_field(field, user.get(field))
+        if isinstance(value, dict):
+            names.extend(value.keys())
+        elif isinstance(value, list):
+            names.extend(item for item in value if isinstance(item, str))
+
+    return list(dict.fromkeys(skill for skill in map(normalize_skill, names) if skill))
+
+
+def merge_skill_lists(*lists: Iterable[str]) -> List[str]:
+    """Merge skill names keeping the first spelling of each canonical skill"""
+    merged: Dict[str, str] = {}
+    for names in lists:
+        for name in names:
+            name = name.strip() if isinstance(name, str) else ''
+            canonical = normalize_skill(name)
+            if canonical and canonical not in merged:
+                merged[canonical] = name
+    return list(merged.values())
+
+
+async def _skill_ids(db: aiosqlite.Connection, names: List[str], create: bool) -> Dict[str, int]:
+    if not names:
+        return {}
+    if create:
+        await db.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+    placeholders = ', '.join('?' for _ in names)
+    cursor = await db.execute(f"SELECT name, id FROM skills WHERE name IN ({placeholders})", names)
+    return {row[0]: row[1] for row in await cursor.fetchall()}
+
+
+async def sync_user_skills(db: aiosqlite.Connection, user_id: int):
+    """Rebuild a user's user_skills rows from the users table (caller commits)"""
+    columns = ', '.join(SKILL_SOURCE_FIELDS)
+    cursor = await db.execute(f"SELECT {columns} FROM users WHERE id = ?", (user_id,))
+    row = await cursor.fetchone()
+
+    await db.execute("DELETE FROM user_skills WHERE user_id = ?", (user_id,))
+    if not row:
+        return
+
+    skill_ids = await _skill_ids(db, extract_skills(dict(zip(SKILL_SOURCE_FIELDS, row))), create=True)
+    await db.executemany(
+        "INSERT OR IGNORE INTO user_skills (skill_id, user_id) VALUES (?, ?)",
+        [(skill_id, user_id) for skill_id in skill_ids.values()]
+    )
+
+
+async def backfill_user_skills(db: aiosqlite.Connection):
+    """Migration step: index skills of every existing user"""
+    cursor = await db.execute("SELECT id FROM users")
+    for (user_id,) in await cursor.fetchall():
+        await sync_user_skills(db, user_id)
+
+
+async def find_users_with_skills(
+    db: aiosqlite.Connection,
+    skills: List[str],
+    work_mode: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Users having all of `skills`, answered by intersecting the (skill_id, user_id) index"""
+    canonical = list(dict.fromkeys(skill for skill in map(normalize_skill, skills) if skill))
+    if not canonical:
+        return []
+
+    skill_ids = await _skill_ids(db, canonical, create=False)
+    if len(skill_ids) < len(canonical):
+        # An unknown skill means nobody can have all of them
+        return []
+
+    intersection = ' INTERSECT '.join(
+        'SELECT user_id FROM user_skills WHERE skill_id = ?' for _ in skill_ids
+    )
+    params: List[Any] = list(skill_ids.values())
+
+    query = f"""
+        SELECT u.id, u.name, u.email, u.location, u.work_mode, u.job_search_status
+        FROM ({intersection}) matched
+        JOIN users u ON u.id = matched.user_id
+    """
+    if work_mode:
+        query += " WHERE EXISTS (SELECT 1 FROM json_each(CASE WHEN json_valid(u.work_mode) THEN u.work_mode ELSE '[]' END) WHERE lower(value) = ?)"
+        params.append(work_mode.strip().lower())
+    query += " ORDER BY u.id LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+
+    cursor = await db.execute(query, params)
+    return [
+        {
+            'id': row[0],
+            'name': row[1],
+            'email': row[2],
+            'location': row[3],
+            'work_mode': decode_user_field('work_mode', row[4]),
+            'job_search_status': row[5],
+            'matched_skills': canonical,
+        }
+        for row in await cursor.fetchall()
+    ]
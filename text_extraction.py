@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+from executors import BoundedExecutor
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Resume text extraction process pool configuration
+TEXT_EXTRACTION_WORKERS = int(os.getenv("TEXT_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+TEXT_EXTRACTION_QUEUE_DEPTH = int(os.getenv("TEXT_EXTRACTION_QUEUE_DEPTH", "32"))
+# Per-document limits: wall-clock seconds and pages read (the rest of a longer PDF is ignored)
+TEXT_EXTRACTION_TIMEOUT = float(os.getenv("TEXT_EXTRACTION_TIMEOUT", "20"))
+TEXT_EXTRACTION_MAX_PAGES = int(os.getenv("TEXT_EXTRACTION_MAX_PAGES", "30"))
+# PDFs with at least this many pages are split into page ranges extracted in parallel
+TEXT_EXTRACTION_PARALLEL_PAGES = int(os.getenv("TEXT_EXTRACTION_PARALLEL_PAGES", "8"))
+
+# Seconds warm-up waits for every worker process to start
+TEXT_EXTRACTION_WARM_UP_TIMEOUT = float(os.getenv("TEXT_EXTRACTION_WARM_UP_TIMEOUT", "60"))
+
+PLAIN_TEXT_EXTENSIONS = {'txt', 'md', 'tex'}
+
+
+class TextExtractionError(RuntimeError):
+    """Raised when a document can't be read (unsupported type, missing library, time limit)"""
+
+
+# Worker functions run in the pool processes, so they must stay module-level (picklable).
+# `deadline` is a time.time() value; workers stop at the next page once it passes.
+
+def _check_deadline(deadline: float):
+    if time.time() > deadline:
+        raise TextExtractionError("Text extraction time limit reached")
+
+
+def _warm_up(barrier=None, timeout: float = TEXT_EXTRACTION_WARM_UP_TIMEOUT) -> int:
+    """Import the parsing libraries once per worker process, then wait at the barrier for the others"""
+    for module in ('PyPDF2', 'pdfplumber', 'docx'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    if barrier is not None:
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+    return os.getpid()
+
+
+def _pdf_page_count(file_path: str) -> int:
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except ImportError:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int, deadline: float) -> str:
+    """Text of pages [start, end) of a PDF"""
+    texts = []
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pages = PyPDF2.PdfReader(file).pages
+            for i in range(start, min(end, len(pages))):
+                _check_deadline(deadline)
+                texts.append(pages[i].extract_text() or '')
+    except ImportError:
+        try:
+            import pdfplumber
+        except ImportError:
+            raise TextExtractionError("No PDF processing library available. Please install PyPDF2 or pdfplumber")
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages[start:end]:
+                _check_deadline(deadline)
+                texts.append(page.extract_text() or '')
+    return ''.join(text + "\n" for text in texts)
+
+
+def _extract_docx(file_path: str, deadline: float) -> str:
+    try:
+        import docx
+    except ImportError:
+        raise TextExtractionError("python-docx not installed, cannot process Word documents")
+    document = docx.Document(file_path)
+    _check_deadline(deadline)
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+def _extract_plain_text(file_path: str) -> str:
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+        return file.read()
+
+
+def page_ranges(pages: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [0, pages) into at most `parts` contiguous ranges"""
+    size = max(math.ceil(pages / max(parts, 1)), 1)
+    return [(start, min(start + size, pages)) for start in range(0, pages, size)]
+
+
+class TextExtractionService:
+    """Extracts resume text in a process pool so parsing never blocks the event loop.
+
+    Large PDFs are split into page ranges that different workers parse at
+    the same time. Each document is bounded by a page limit and a
+    wall-clock deadline that the workers check between pages, so a
+    timed-out document stops at its next page. Its pool slots stay counted
+    until the workers actually finish, so the bounded queue still limits
+    how much runaway work is admitted (a single page can't be interrupted).
+    """
+
+    def __init__(self, workers: int = TEXT_EXTRACTION_WORKERS, queue_depth: int = TEXT_EXTRACTION_QUEUE_DEPTH,
+                 timeout: float = TEXT_EXTRACTION_TIMEOUT, max_pages: int = TEXT_EXTRACTION_MAX_PAGES,
+                 parallel_pages: int = TEXT_EXTRACTION_PARALLEL_PAGES):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.parallel_pages = parallel_pages
+        # spawn, not fork: the server process has live threads (DB connections, executors)
+        self._context = multiprocessing.get_context("spawn")
+        self.executor = BoundedExecutor(
+            workers, queue_depth, name="text_extraction",
+            executor=ProcessPoolExecutor(max_workers=workers, mp_context=self._context)
+        )
+
+        self.documents = 0
+        self.pages = 0
+        self.truncated = 0
+        self.timeouts = 0
+
+    async def warm_up(self, timeout: float = TEXT_EXTRACTION_WARM_UP_TIMEOUT):
+        """Start every worker process and load the parsers before the first upload"""
+        # Each task blocks its worker at a barrier until all of them are taken, so the pool has
+        # to spawn a process per task instead of letting one idle worker run them all
+        manager = await asyncio.to_thread(self._context.Manager)
+        try:
+            barrier = await asyncio.to_thread(manager.Barrier, self.workers)
+            pids = await asyncio.gather(*(
+                self.executor.run(_warm_up, barrier, timeout) for _ in range(self.workers)
+            ))
+        finally:
+            await asyncio.to_thread(manager.shutdown)
+        logger.info(f"Text extraction pool ready ({len(set(pids))} worker processes)")
+
+    async def extract(self, file_path: str) -> str:
+        """Plain text of a PDF, Word or text file"""
+        deadline = time.time() + self.timeout
+        try:
+            return await asyncio.wait_for(self._extract(file_path, deadline), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TextExtractionError(f"Text extraction exceeded {self.timeout:g}s")
+        except TextExtractionError as e:
+            if time.time() > deadline:
+                self.timeouts += 1
+                raise TextExtractionError(f"Text extraction exceeded {self.timeout:g}s") from e
+            raise
+
+    async def _extract(self, file_path: str, deadline: float) -> str:
+        file_extension = file_path.lower().split('.')[-1]
+        self.documents += 1
+
+        if file_extension == 'pdf':
+            return await self._extract_pdf(file_path, deadline)
+        if file_extension in ('doc', 'docx'):
+            return await self.executor.run(_extract_docx, file_path, deadline)
+        if file_extension in PLAIN_TEXT_EXTENSIONS:
+            return await self.executor.run(_extract_plain_text, file_path)
+        raise TextExtractionError(f"Unsupported file type: {file_extension}")
+
+    async def _extract_pdf(self, file_path: str, deadline: float) -> str:
+        pages = await self.executor.run(_pdf_page_count, file_path)
+        if pages > self.max_pages:
+            self.truncated += 1
+            logger.warning(f"PDF has {pages} pages, extracting the first {self.max_pages}")
+            pages = self.max_pages
+        self.pages += pages
+
+        if pages < self.parallel_pages or self.workers < 2:
+            return await self.executor.run(_extract_pdf_pages, file_path, 0, pages, deadline)
+
+        parts = await asyncio.gather(*(
+            self.executor.run(_extract_pdf_pages, file_path, start, end, deadline)
+            for start, end in page_ranges(pages, self.workers)
+        ))
+        return ''.join(parts)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.executor.get_stats(),
+            "documents": self.documents,
+            "pages": self.pages,
+            "truncated": self.truncated,
+            "timeouts": self.timeouts,
+            "max_pages": self.max_pages,
+            "timeout": self.timeout,
+        }
+
+
+# Shared process pool for resume text extraction
+text_extractor = TextExtractionService()